@@ -199,6 +199,7 @@ CONST_PERISCOPE_CONTAINER_REGISTRY = "mcr.microsoft.com"
 CONST_PERISCOPE_RELEASE_TAG = "0.0.10"
 CONST_PERISCOPE_IMAGE_VERSION = "0.0.10"
 CONST_PERISCOPE_NAMESPACE = "aks-periscope"
+CONST_PERISCOPE_DIAGNOSTIC_PREFIX = "aks-periscope-diagnostic-"
 
 CONST_AZURE_KEYVAULT_NETWORK_ACCESS_PUBLIC = "Public"
 CONST_AZURE_KEYVAULT_NETWORK_ACCESS_PRIVATE = "Private"
@@ -31,6 +31,7 @@ from azext_aks_preview._consts import (
     CONST_PERISCOPE_RELEASE_TAG,
     CONST_PERISCOPE_IMAGE_VERSION,
     CONST_PERISCOPE_NAMESPACE,
+    CONST_PERISCOPE_DIAGNOSTIC_PREFIX,
 )
 
 from azext_aks_preview._helpers import which, print_or_merge_credentials
@@ -387,7 +388,7 @@ def _display_diagnostics_report(temp_kubeconfig_path):   # pylint: disable=too-m
         universal_newlines=True)
     logger.debug(nodes)
     node_lines = nodes.splitlines()
-    ready_nodes = {}
+    ready_nodes = set()
     for node_line in node_lines:
         columns = node_line.split()
         logger.debug(node_line)
@@ -395,7 +396,7 @@ def _display_diagnostics_report(temp_kubeconfig_path):   # pylint: disable=too-m
             logger.warning(
                 "Node %s is not Ready. Current state is: %s.", columns[0], columns[1])
         else:
-            ready_nodes[columns[0]] = False
+            ready_nodes.add(columns[0])
 
     logger.debug('There are %s ready nodes in the cluster',
                  str(len(ready_nodes)))
@@ -406,81 +407,95 @@ def _display_diagnostics_report(temp_kubeconfig_path):   # pylint: disable=too-m
 
     network_config_array = []
     network_status_array = []
-    apds_created = False
+    reported_nodes = set()
 
-    max_retry = 10
+    # All the diagnostic results are fetched with a single call per attempt, and the results of the nodes are
+    # displayed as soon as they are reported instead of waiting for all of them.
+    max_retry = 20
     for retry in range(0, max_retry):
-        if not apds_created:
-            apd = subprocess.check_output(
-                ["kubectl", "--kubeconfig", temp_kubeconfig_path, "get",
-                    "apd", "-n", CONST_PERISCOPE_NAMESPACE, "--no-headers"],
-                universal_newlines=True
-            )
-            apd_lines = apd.splitlines()
-            if apd_lines and 'No resources found' in apd_lines[0]:
-                apd_lines.pop(0)
-
-            print("Got {} diagnostic results for {} ready nodes{}\r".format(len(apd_lines),
-                                                                            len(ready_nodes),
-                                                                            '.' * retry), end='')
-            if len(apd_lines) < len(ready_nodes):
-                time.sleep(3)
-            else:
-                apds_created = True
-                print()
-        else:
-            for node_name in ready_nodes:
-                if ready_nodes[node_name]:
-                    continue
-                apdName = "aks-periscope-diagnostic-" + node_name
-                try:
-                    network_config = subprocess.check_output(
-                        ["kubectl", "--kubeconfig", temp_kubeconfig_path,
-                         "get", "apd", apdName, "-n",
-                         CONST_PERISCOPE_NAMESPACE, "-o=jsonpath={.spec.networkconfig}"],
-                        universal_newlines=True)
-                    logger.debug('Dns status for node %s is %s',
-                                 node_name, network_config)
-                    network_status = subprocess.check_output(
-                        ["kubectl", "--kubeconfig", temp_kubeconfig_path,
-                         "get", "apd", apdName, "-n",
-                         CONST_PERISCOPE_NAMESPACE, "-o=jsonpath={.spec.networkoutbound}"],
-                        universal_newlines=True)
-                    logger.debug('Network status for node %s is %s',
-                                 node_name, network_status)
-
-                    if not network_config or not network_status:
-                        print("The diagnostics information for node {} is not ready yet. "
-                              "Will try again in 10 seconds.".format(node_name))
-                        time.sleep(10)
-                        break
-
-                    network_config_array += json.loads(
-                        '[' + network_config + ']')
-                    network_status_object = json.loads(network_status)
-                    network_status_array += _format_diag_status(
-                        network_status_object)
-                    ready_nodes[node_name] = True
-                except subprocess.CalledProcessError as err:
-                    raise CLIError(err.output)
+        try:
+            apds = _list_periscope_diagnostics(temp_kubeconfig_path)
+        except subprocess.CalledProcessError as err:
+            raise CLIError(err.output)
+
+        diagnostics = _parse_periscope_diagnostics(apds, ready_nodes - reported_nodes)
+        if diagnostics:
+            print()
+            node_config_array = []
+            node_status_array = []
+            for node_name in sorted(diagnostics):
+                network_config, network_status = diagnostics[node_name]
+                node_config_array += network_config
+                node_status_array += _format_diag_status(network_status)
+            reported_nodes.update(diagnostics)
+            _print_diagnostics_tables(node_config_array, node_status_array)
+            network_config_array += node_config_array
+            network_status_array += node_status_array
+
+        print("Got diagnostic results for {} of {} ready nodes{}\r".format(len(reported_nodes),
+                                                                           len(ready_nodes),
+                                                                           '.' * retry), end='')
+        if reported_nodes >= ready_nodes:
+            break
+        time.sleep(3)
 
     print()
-    if network_config_array:
-        print("Below are the network configuration for each node: ")
-        print()
-        print(tabulate(network_config_array, headers="keys", tablefmt='simple'))
-        print()
-    else:
+    if not network_config_array:
         logger.warning("Could not get network config. "
                        "Please run 'az aks kanalyze' command later to get the analysis results.")
-
-    if network_status_array:
-        print("Below are the network connectivity results for each node:")
-        print()
-        print(tabulate(network_status_array, headers="keys", tablefmt='simple'))
-    else:
+    if not network_status_array:
         logger.warning("Could not get networking status. "
                        "Please run 'az aks kanalyze' command later to get the analysis results.")
+    missing_nodes = ready_nodes - reported_nodes
+    if network_config_array and missing_nodes:
+        logger.warning("The diagnostics information is not ready yet for nodes: %s. "
+                       "Please run 'az aks kanalyze' command later to get their analysis results.",
+                       ', '.join(sorted(missing_nodes)))
+
+
+def _list_periscope_diagnostics(temp_kubeconfig_path):
+    apds = subprocess.check_output(
+        ["kubectl", "--kubeconfig", temp_kubeconfig_path, "get",
+            "apd", "-n", CONST_PERISCOPE_NAMESPACE, "-o", "json"],
+        universal_newlines=True)
+    return json.loads(apds).get("items", [])
+
+
+def _parse_periscope_diagnostics(apds, node_names):
+    """Return the network config and status of the given nodes which have reported both, by node name."""
+    diagnostics = {}
+    for apd in apds:
+        apd_name = (apd.get("metadata") or {}).get("name", "")
+        node_name = apd_name[len(CONST_PERISCOPE_DIAGNOSTIC_PREFIX):]
+        if not apd_name.startswith(CONST_PERISCOPE_DIAGNOSTIC_PREFIX) or node_name not in node_names:
+            continue
+        spec = apd.get("spec") or {}
+        network_config = spec.get("networkconfig")
+        network_status = spec.get("networkoutbound")
+        logger.debug('Dns status for node %s is %s', node_name, network_config)
+        logger.debug('Network status for node %s is %s', node_name, network_status)
+        if not network_config or not network_status:
+            continue
+
+        if isinstance(network_config, str):
+            network_config = json.loads('[' + network_config + ']')
+        elif isinstance(network_config, dict):
+            network_config = [network_config]
+        if isinstance(network_status, str):
+            network_status = json.loads(network_status)
+        diagnostics[node_name] = (network_config, network_status)
+    return diagnostics
+
+
+def _print_diagnostics_tables(network_config_array, network_status_array):
+    print("Below are the network configuration for each node: ")
+    print()
+    print(tabulate(network_config_array, headers="keys", tablefmt='simple'))
+    print()
+    print("Below are the network connectivity results for each node:")
+    print()
+    print(tabulate(network_status_array, headers="keys", tablefmt='simple'))
+    print()
 
 
 def _cloud_storage_account_service_factory(cli_ctx, kwargs):
@@ -3,7 +3,10 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import json
 import unittest
+from unittest import mock
+
 import azext_aks_preview.aks_diagnostics as commands
 
 
@@ -27,5 +30,55 @@ class TestGenerateContainerName(unittest.TestCase):
         self.assertEqual(expected_container_name, trim_container_name)
 
 
+def _get_apd(node_name, network_config=None, network_status=None):
+    return {
+        "metadata": {"name": "aks-periscope-diagnostic-" + node_name},
+        "spec": {"networkconfig": network_config, "networkoutbound": network_status},
+    }
+
+
+class TestDisplayDiagnosticsReport(unittest.TestCase):
+    def test_parse_periscope_diagnostics(self):
+        apds = [
+            _get_apd("node1", '{"HostName": "node1"}', '[{"Type": "DNS", "Status": "Heartbeat"}]'),
+            _get_apd("node2", {"HostName": "node2"}, [{"Type": "DNS", "Status": "Error: timeout"}]),
+            # not reported yet
+            _get_apd("node3", "", ""),
+            # not a ready node
+            _get_apd("node4", '{"HostName": "node4"}', '[]'),
+        ]
+        diagnostics = commands._parse_periscope_diagnostics(apds, {"node1", "node2", "node3"})
+        self.assertEqual(set(diagnostics), {"node1", "node2"})
+        self.assertEqual(diagnostics["node1"], ([{"HostName": "node1"}], [{"Type": "DNS", "Status": "Heartbeat"}]))
+        self.assertEqual(diagnostics["node2"][0], [{"HostName": "node2"}])
+
+    def test_display_diagnostics_report_single_list_call_per_attempt(self):
+        polls = [
+            [_get_apd("node1", '{"HostName": "node1"}', '[{"Type": "DNS", "Status": "Heartbeat"}]')],
+            [_get_apd("node1", '{"HostName": "node1"}', '[{"Type": "DNS", "Status": "Heartbeat"}]'),
+             _get_apd("node2", '{"HostName": "node2"}', '[{"Type": "DNS", "Status": "Heartbeat"}]')],
+        ]
+        calls = []
+
+        def check_output(args, **_):
+            calls.append(args)
+            if "node" in args:
+                return "node1   Ready    agent   1d   v1.25.5\nnode2   Ready    agent   1d   v1.25.5\n"
+            return json.dumps({"items": polls[len(calls) - 2]})
+
+        with mock.patch.object(commands, "which", return_value="kubectl"), \
+                mock.patch.object(commands.subprocess, "check_output", side_effect=check_output), \
+                mock.patch.object(commands.time, "sleep") as sleep, \
+                mock.patch.object(commands, "_print_diagnostics_tables") as print_tables:
+            commands._display_diagnostics_report("kubeconfig")
+
+        # one call for the nodes and one call to list all the diagnostics of each attempt
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(sleep.call_count, 1)
+        # the results of each node are displayed as soon as they are reported
+        self.assertEqual([call.args[0] for call in print_tables.call_args_list],
+                         [[{"HostName": "node1"}], [{"HostName": "node2"}]])
+
+
 if __name__ == "__main__":
     unittest.main()
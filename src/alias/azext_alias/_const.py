@@ -11,6 +11,8 @@ GLOBAL_CONFIG_DIR = get_config_dir()
 ALIAS_FILE_NAME = 'alias'
 ALIAS_HASH_FILE_NAME = 'alias.sha1'
 COLLIDED_ALIAS_FILE_NAME = 'collided_alias'
+ALIAS_INDEX_FILE_NAME = 'alias.index'
+ALIAS_INDEX_VERSION = 1
 ALIAS_TAB_COMP_TABLE_FILE_NAME = 'alias_tab_completion'
 GLOBAL_ALIAS_TAB_COMP_TABLE_PATH = os.path.join(GLOBAL_CONFIG_DIR, ALIAS_TAB_COMP_TABLE_FILE_NAME)
 COLLISION_CHECK_LEVEL_DEPTH = 5
@@ -4,31 +4,34 @@
 # --------------------------------------------------------------------------------------------
 
 import os
-import re
 import json
 import shlex
+import pickle
 import hashlib
 from collections import defaultdict
 
 from knack.log import get_logger
+from knack.util import CLIError
 
-import azext_alias
 from azext_alias import telemetry
 from azext_alias._const import (
     GLOBAL_CONFIG_DIR,
     ALIAS_FILE_NAME,
     ALIAS_HASH_FILE_NAME,
     COLLIDED_ALIAS_FILE_NAME,
+    ALIAS_INDEX_FILE_NAME,
+    ALIAS_INDEX_VERSION,
     CONFIG_PARSING_ERROR,
     DEBUG_MSG,
     COLLISION_CHECK_LEVEL_DEPTH,
     POS_ARG_DEBUG_MSG
 )
-from azext_alias.argument import build_pos_args_table, render_template
+from azext_alias.argument import build_pos_args_table, render_template, get_placeholders
 from azext_alias.util import (
     is_alias_command,
     cache_reserved_commands,
     get_config_parser,
+    get_reserved_command_trie,
     build_tab_completion_table
 )
 
@@ -36,6 +39,7 @@ from azext_alias.util import (
 GLOBAL_ALIAS_PATH = os.path.join(GLOBAL_CONFIG_DIR, ALIAS_FILE_NAME)
 GLOBAL_ALIAS_HASH_PATH = os.path.join(GLOBAL_CONFIG_DIR, ALIAS_HASH_FILE_NAME)
 GLOBAL_COLLIDED_ALIAS_PATH = os.path.join(GLOBAL_CONFIG_DIR, COLLIDED_ALIAS_FILE_NAME)
+GLOBAL_ALIAS_INDEX_PATH = os.path.join(GLOBAL_CONFIG_DIR, ALIAS_INDEX_FILE_NAME)
 
 logger = get_logger(__name__)
 
@@ -46,6 +50,8 @@ class AliasManager(object):
         self.alias_table = get_config_parser()
         self.kwargs = kwargs
         self.collided_alias = defaultdict(list)
+        self.alias_index = None
+        self.alias_index_changed = False
         self.alias_config_str = ''
         self.alias_config_hash = ''
         self.load_alias_table()
@@ -89,6 +95,24 @@ class AliasManager(object):
             except Exception:  # pylint: disable=broad-except
                 self.collided_alias = {}
 
+    def load_alias_index(self):
+        """
+        Load the alias index and the collided aliases persisted by the previous run.
+
+        Returns:
+            True if the alias index exists and was built from the current alias configuration. Otherwise, False.
+        """
+        try:
+            with open(GLOBAL_ALIAS_INDEX_PATH, 'rb') as alias_index_file:
+                content = pickle.load(alias_index_file)
+            if content.get('version') != ALIAS_INDEX_VERSION or content.get('hash') != self.alias_config_hash:
+                return False
+            self.alias_index = content['index']
+            self.collided_alias = content['collided_alias']
+            return True
+        except Exception:  # pylint: disable=broad-except
+            return False
+
     def detect_alias_config_change(self):
         """
         Change if the alias configuration has changed since the last run.
@@ -128,8 +152,12 @@ class AliasManager(object):
             self.load_full_command_table()
             self.collided_alias = AliasManager.build_collision_table(self.alias_table.sections())
             build_tab_completion_table(self.alias_table)
-        else:
+            self.alias_index = AliasManager.build_alias_index(self.alias_table)
+            self.alias_index_changed = True
+        elif not self.load_alias_index():
             self.load_collided_alias()
+            self.alias_index = AliasManager.build_alias_index(self.alias_table)
+            self.alias_index_changed = True
 
         transformed_commands = []
         alias_iter = enumerate(args, 1)
@@ -144,15 +172,19 @@ class AliasManager(object):
                 transformed_commands.append(alias)
                 continue
 
-            full_alias = self.get_full_alias(alias)
-
-            if self.alias_table.has_option(full_alias, 'command'):
-                cmd_derived_from_alias = self.alias_table.get(full_alias, 'command')
-                telemetry.set_alias_hit(full_alias)
-            else:
+            index_entry = self.get_alias_index().get(alias)
+            if not index_entry:
                 transformed_commands.append(alias)
                 continue
 
+            full_alias, cmd_derived_from_alias, num_placeholders, split_command = index_entry
+            telemetry.set_alias_hit(full_alias)
+
+            if num_placeholders == 0 and split_command is not None:
+                logger.debug(DEBUG_MSG, full_alias, cmd_derived_from_alias)
+                transformed_commands += split_command
+                continue
+
             pos_args_table = build_pos_args_table(full_alias, args, alias_index)
             if pos_args_table:
                 logger.debug(POS_ARG_DEBUG_MSG, full_alias, cmd_derived_from_alias, pos_args_table)
@@ -177,10 +209,16 @@ class AliasManager(object):
         Returns:
             The full alias (with the placeholders, if any).
         """
-        if query in self.alias_table.sections():
-            return query
+        index_entry = self.get_alias_index().get(query)
+        return index_entry[0] if index_entry else ''
 
-        return next((section for section in self.alias_table.sections() if section.split()[0] == query), '')
+    def get_alias_index(self):
+        """
+        Get the alias index, building it from the alias table if it has not been loaded.
+        """
+        if self.alias_index is None:
+            self.alias_index = AliasManager.build_alias_index(self.alias_table)
+        return self.alias_index
 
     def load_full_command_table(self):
         """
@@ -210,6 +248,9 @@ class AliasManager(object):
 
         AliasManager.write_alias_config_hash(self.alias_config_hash)
         AliasManager.write_collided_alias(self.collided_alias)
+        if self.alias_index_changed:
+            AliasManager.write_alias_index(self.alias_config_hash, self.alias_index, self.collided_alias)
+            self.alias_index_changed = False
 
         return post_transform_commands
 
@@ -245,20 +286,78 @@ class AliasManager(object):
         Args:
             levels: the amount of levels we tranverse through the command table tree.
         """
+        reserved_command_trie = get_reserved_command_trie()
         collided_alias = defaultdict(list)
         for alias in aliases:
             # Only care about the first word in the alias because alias
             # cannot have spaces (unless they have positional arguments)
             word = alias.split()[0]
-            for level in range(1, levels + 1):
-                collision_regex = r'^{}{}($|\s)'.format(r'([a-z\-]*\s)' * (level - 1), word.lower())
-                if list(filter(re.compile(collision_regex).match, azext_alias.cached_reserved_commands)) \
-                        and level not in collided_alias[word]:
+            for level in reserved_command_trie.get_levels(word.lower(), max_level=levels):
+                if level not in collided_alias[word]:
                     collided_alias[word].append(level)
 
         telemetry.set_collided_aliases(list(collided_alias.keys()))
         return collided_alias
 
+    @staticmethod
+    def build_alias_index(alias_table):
+        """
+        Build the alias index, so that resolving an alias does not scan the alias table.
+
+        The index is structured as:
+        {
+            'first word of the alias': (full alias, alias command, number of placeholders, split alias command)
+        }
+        The number of placeholders and the split alias command are None if they cannot be precomputed
+        (e.g. malformed placeholders or quotes), in which case they are computed when the alias is used
+        so that the usual error is reported.
+
+        Args:
+            alias_table: The alias table.
+
+        Returns:
+            The alias index.
+        """
+        # An alias which is exactly the query takes precedence over the first alias starting with the query
+        full_aliases = {}
+        for full_alias in alias_table.sections():
+            first_word = full_alias.split()[0]
+            if first_word not in full_aliases or first_word == full_alias:
+                full_aliases[first_word] = full_alias
+
+        alias_index = {}
+        for first_word, full_alias in full_aliases.items():
+            if not alias_table.has_option(full_alias, 'command'):
+                continue
+
+            alias_command = alias_table.get(full_alias, 'command')
+            try:
+                num_placeholders = len(get_placeholders(full_alias))
+            except CLIError:
+                num_placeholders = None
+            try:
+                split_command = shlex.split(alias_command)
+            except ValueError:
+                split_command = None
+            alias_index[first_word] = (full_alias, alias_command, num_placeholders, split_command)
+
+        return alias_index
+
+    @staticmethod
+    def write_alias_index(alias_config_hash, alias_index, collided_alias):
+        """
+        Persist the alias index and the collided aliases along with the hash of the alias configuration
+        they were built from.
+        """
+        content = {
+            'version': ALIAS_INDEX_VERSION,
+            'hash': alias_config_hash,
+            'index': alias_index,
+            'collided_alias': dict(collided_alias)
+        }
+        with open(GLOBAL_ALIAS_INDEX_PATH, 'wb') as alias_index_file:
+            pickle.dump(content, alias_index_file)
+
     @staticmethod
     def write_alias_config_hash(alias_config_hash='', empty_hash=False):
         """
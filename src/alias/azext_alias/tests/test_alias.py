@@ -22,6 +22,8 @@ from azext_alias.tests._const import (DEFAULT_MOCK_ALIAS_STRING,
                                       DUP_OPTION_MOCK_ALIAS_STRING,
                                       MALFORMED_MOCK_ALIAS_STRING)
 
+ORIGINAL_WRITE_ALIAS_INDEX = azext_alias.alias.AliasManager.write_alias_index
+
 # Various test types
 TEST_TRANSFORM_ALIAS = 'test_transform_alias'
 TEST_TRANSFORM_COLLIDED_ALIAS = 'test_transform_collided_alias'
@@ -150,6 +152,7 @@ class TestAlias(unittest.TestCase):
     def setUp(self):
         azext_alias.alias.AliasManager.write_alias_config_hash = Mock()
         azext_alias.alias.AliasManager.write_collided_alias = Mock()
+        azext_alias.alias.AliasManager.write_alias_index = Mock()
         self.patcher = patch('azext_alias.cached_reserved_commands', TEST_RESERVED_COMMANDS)
         self.patcher.start()
 
@@ -166,6 +169,42 @@ class TestAlias(unittest.TestCase):
         test_case = azext_alias.alias.AliasManager.build_collision_table(alias_manager.alias_table.sections(), levels=2)
         self.assertDictEqual({'account': [1, 2], 'dns': [2], 'list-locations': [2]}, test_case)
 
+    def test_build_alias_index(self):
+        alias_manager = self.get_alias_manager()
+        alias_index = azext_alias.alias.AliasManager.build_alias_index(alias_manager.alias_table)
+        self.assertEqual(('ac', 'account', 0, ['account']), alias_index['ac'])
+        self.assertEqual('cp {{ arg_1 }} {{ arg_2 }}', alias_index['cp'][0])
+        self.assertEqual(2, alias_index['cp'][2])
+        self.assertEqual(alias_manager.get_full_alias('cp'), 'cp {{ arg_1 }} {{ arg_2 }}')
+        self.assertEqual(alias_manager.get_full_alias('non-existing'), '')
+
+    def test_build_alias_index_exact_alias_precedence(self):
+        alias_table = configparser.ConfigParser(interpolation=None)
+        alias_table.read_string('[ac {{ arg_1 }}]\ncommand = account {{ arg_1 }}\n[ac]\ncommand = account\n'
+                                '[mn {{ arg_1 }}]\ncommand = monitor {{ arg_1 }}\n[mn {{ arg_2 }}]\ncommand = network\n')
+        alias_index = azext_alias.alias.AliasManager.build_alias_index(alias_table)
+        self.assertEqual('ac', alias_index['ac'][0])
+        self.assertEqual('mn {{ arg_1 }}', alias_index['mn'][0])
+
+    def test_load_alias_index(self):
+        import tempfile
+        import shutil
+        mock_config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, mock_config_dir)
+        alias_manager = self.get_alias_manager()
+        alias_index = azext_alias.alias.AliasManager.build_alias_index(alias_manager.alias_table)
+        load_alias_index = azext_alias.alias.AliasManager.load_alias_index
+        with patch('azext_alias.alias.GLOBAL_ALIAS_INDEX_PATH', os.path.join(mock_config_dir, 'alias.index')):
+            self.assertFalse(load_alias_index(alias_manager))
+            ORIGINAL_WRITE_ALIAS_INDEX(alias_manager.alias_config_hash, alias_index, {'account': [1]})
+            self.assertTrue(load_alias_index(alias_manager))
+            self.assertEqual(alias_index, alias_manager.alias_index)
+            self.assertEqual({'account': [1]}, alias_manager.collided_alias)
+
+            # the index is ignored once the alias configuration changes
+            alias_manager.alias_config_hash = 'new hash'
+            self.assertFalse(load_alias_index(alias_manager))
+
     def test_non_parse_error(self):
         alias_manager = self.get_alias_manager()
         self.assertFalse(alias_manager.parse_error())
@@ -220,6 +259,9 @@ class MockAliasManager(azext_alias.alias.AliasManager):
     def load_collided_alias(self):
         pass
 
+    def load_alias_index(self):
+        return False
+
 
 # Inject data-driven tests into TestAlias class
 for test_type, test_cases in TEST_DATA.items():
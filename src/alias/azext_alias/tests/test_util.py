@@ -6,12 +6,17 @@
 # pylint: disable=line-too-long
 
 import os
+import re
 import shutil
 import tempfile
+import timeit
 import unittest
+from collections import defaultdict
 from unittest import mock
 
-from azext_alias.util import remove_pos_arg_placeholders, build_tab_completion_table, get_config_parser
+import azext_alias
+from azext_alias.alias import AliasManager
+from azext_alias.util import remove_pos_arg_placeholders, build_tab_completion_table, get_config_parser, CommandTrie
 from azext_alias._const import ALIAS_TAB_COMP_TABLE_FILE_NAME
 from azext_alias.tests._const import TEST_RESERVED_COMMANDS
 
@@ -61,6 +66,108 @@ class TestUtil(unittest.TestCase):
             'account list-locations': ['']
         }, tab_completion_table)
 
+    def test_command_trie(self):
+        trie = CommandTrie(TEST_RESERVED_COMMANDS)
+        self.assertEqual([1, 2], trie.get_levels('account'))
+        self.assertEqual([1], trie.get_levels('account', max_level=1))
+        self.assertEqual([], trie.get_levels('non-existing'))
+        self.assertEqual(['', 'storage'], trie.get_parent_commands('account'))
+        self.assertEqual(['storage'], trie.get_parent_commands('account create'))
+        self.assertEqual([], trie.get_parent_commands('account delete'))
+        self.assertEqual([], trie.get_parent_commands(''))
+
+
+def _legacy_build_collision_table(aliases, levels):
+    collided_alias = defaultdict(list)
+    for alias in aliases:
+        word = alias.split()[0]
+        for level in range(1, levels + 1):
+            collision_regex = r'^{}{}($|\s)'.format(r'([a-z\-]*\s)' * (level - 1), word.lower())
+            if list(filter(re.compile(collision_regex).match, azext_alias.cached_reserved_commands)) \
+                    and level not in collided_alias[word]:
+                collided_alias[word].append(level)
+    return collided_alias
+
+
+def _legacy_build_tab_completion_table(alias_commands):
+    tab_completion_table = defaultdict(list)
+    for alias_command in alias_commands:
+        for reserved_command in azext_alias.cached_reserved_commands:
+            if reserved_command == alias_command or reserved_command.startswith(alias_command + ' ') \
+                    and '' not in tab_completion_table[alias_command]:
+                tab_completion_table[alias_command].append('')
+            elif ' {} '.format(alias_command) in reserved_command or reserved_command.endswith(' ' + alias_command):
+                index = reserved_command.index(alias_command)
+                parent_command = reserved_command[:index - 1]
+                if parent_command not in tab_completion_table[alias_command]:
+                    tab_completion_table[alias_command].append(parent_command)
+    return tab_completion_table
+
+
+@unittest.skipUnless(os.environ.get('AZURE_CLI_RUN_BENCHMARKS'), 'set AZURE_CLI_RUN_BENCHMARKS to run the benchmarks')
+class TestCommandTrieBenchmark(unittest.TestCase):
+    """
+    Compare the trie based collision and tab completion table builders with the previous implementation
+    on a synthetic command table of 10k commands and 300 aliases.
+    """
+
+    def setUp(self):
+        groups = ['group{}'.format(i) for i in range(100)]
+        reserved_commands = []
+        for i, group in enumerate(groups):
+            for j in range(25):
+                reserved_commands.append('{} sub{} create'.format(group, j))
+                reserved_commands.append('{} sub{} delete'.format(group, j))
+                reserved_commands.append('{} sub{} list'.format(group, j))
+                reserved_commands.append('{} {} sub{} show'.format(group, groups[(i + 1) % len(groups)], j))
+        self.reserved_commands = reserved_commands
+
+        self.mock_config_dir = tempfile.mkdtemp()
+        self.patchers = [
+            mock.patch('azext_alias.util.GLOBAL_ALIAS_TAB_COMP_TABLE_PATH',
+                       os.path.join(self.mock_config_dir, ALIAS_TAB_COMP_TABLE_FILE_NAME)),
+            mock.patch('azext_alias.cached_reserved_commands', reserved_commands),
+            mock.patch('azext_alias.telemetry.set_collided_aliases')
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+        self.alias_table = get_config_parser()
+        for i in range(300):
+            alias = 'sub{}'.format(i) if i % 3 == 0 else 'alias{}'.format(i)
+            self.alias_table.add_section(alias)
+            self.alias_table.set(alias, 'command', '{} sub{}'.format(groups[i % len(groups)], i % 25))
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.mock_config_dir)
+
+    def test_benchmark_collision_table(self):
+        self.assertEqual(10000, len(self.reserved_commands))
+        aliases = self.alias_table.sections()
+        start_time = timeit.default_timer()
+        expected = _legacy_build_collision_table(aliases, 5)
+        legacy_time = timeit.default_timer() - start_time
+
+        start_time = timeit.default_timer()
+        self.assertDictEqual(expected, AliasManager.build_collision_table(aliases))
+        trie_time = timeit.default_timer() - start_time
+        print('\ncollision table: legacy {:.3f}s, trie {:.3f}s'.format(legacy_time, trie_time))
+        self.assertLess(trie_time, legacy_time)
+
+    def test_benchmark_tab_completion_table(self):
+        alias_commands = [self.alias_table.get(alias, 'command') for alias in self.alias_table.sections()]
+        start_time = timeit.default_timer()
+        expected = _legacy_build_tab_completion_table(alias_commands)
+        legacy_time = timeit.default_timer() - start_time
+
+        start_time = timeit.default_timer()
+        self.assertDictEqual(expected, build_tab_completion_table(self.alias_table))
+        trie_time = timeit.default_timer() - start_time
+        print('\ntab completion table: legacy {:.3f}s, trie {:.3f}s'.format(legacy_time, trie_time))
+        self.assertLess(trie_time, legacy_time)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -134,20 +134,12 @@ def build_tab_completion_table(alias_table):
     Returns:
         The tab completion table.
     """
-    alias_commands = [t[1] for t in filter_aliases(alias_table)]
+    reserved_command_trie = get_reserved_command_trie()
     tab_completion_table = defaultdict(list)
-    for alias_command in alias_commands:
-        for reserved_command in azext_alias.cached_reserved_commands:
-            # Check if alias_command has no parent command
-            if reserved_command == alias_command or reserved_command.startswith(alias_command + ' ') \
-                    and '' not in tab_completion_table[alias_command]:
-                tab_completion_table[alias_command].append('')
-            elif ' {} '.format(alias_command) in reserved_command or reserved_command.endswith(' ' + alias_command):
-                # Extract parent commands
-                index = reserved_command.index(alias_command)
-                parent_command = reserved_command[:index - 1]
-                if parent_command not in tab_completion_table[alias_command]:
-                    tab_completion_table[alias_command].append(parent_command)
+    for _, alias_command in filter_aliases(alias_table):
+        for parent_command in reserved_command_trie.get_parent_commands(alias_command):
+            if parent_command not in tab_completion_table[alias_command]:
+                tab_completion_table[alias_command].append(parent_command)
 
     with open(GLOBAL_ALIAS_TAB_COMP_TABLE_PATH, 'w') as f:
         f.write(json.dumps(tab_completion_table))
@@ -155,6 +147,88 @@ def build_tab_completion_table(alias_table):
     return tab_completion_table
 
 
+class CommandTrie(object):
+    """
+    A word-level trie of commands. Besides the trie itself, every node is indexed by its word so that finding
+    where a word (or a sequence of words) appears in the command tree does not scan every command.
+    """
+
+    def __init__(self, commands=None):
+        self.root = {}
+        # word -> [(the words leading to the node, node)], in the order the nodes were inserted
+        self.word_nodes = defaultdict(list)
+        for command in commands or []:
+            self.insert(command)
+
+    def insert(self, command):
+        node, path = self.root, []
+        for word in command.split():
+            if word not in node:
+                node[word] = {}
+                self.word_nodes[word].append((tuple(path), node[word]))
+            node = node[word]
+            path.append(word)
+
+    def get_levels(self, word, max_level=COLLISION_CHECK_LEVEL_DEPTH):
+        """
+        Get the command levels at which the word is a command, e.g. [1, 2] for 'account' because of
+        (az account ...) and (az storage account ...).
+
+        Args:
+            word: The word to look for.
+            max_level: The deepest command level to consider.
+
+        Returns:
+            A sorted list of levels.
+        """
+        return sorted({len(path) + 1 for path, _ in self.word_nodes.get(word, [])
+                       if len(path) < max_level and all(_COMMAND_WORD_REGEX.match(w) for w in path)})
+
+    def get_parent_commands(self, command):
+        """
+        Get the parent commands under which the command exists, e.g. ['', 'storage'] for 'account' because of
+        (az account ...) and (az storage account ...).
+
+        Args:
+            command: The space-delimited command to look for.
+
+        Returns:
+            A list of parent commands, '' being the root of the command tree.
+        """
+        words = command.split()
+        if not words:
+            return []
+
+        parent_commands = []
+        for path, node in self.word_nodes.get(words[0], []):
+            for word in words[1:]:
+                node = node.get(word)
+                if node is None:
+                    break
+            else:
+                parent_commands.append(' '.join(path))
+        return parent_commands
+
+
+_COMMAND_WORD_REGEX = re.compile(r'^[a-z\-]*$')
+_reserved_command_trie_cache = {}
+
+
+def get_reserved_command_trie():
+    """
+    Get the word-level trie of azext_alias.cached_reserved_commands. The trie is built once and rebuilt only when
+    the cached reserved commands are replaced.
+
+    Returns:
+        The CommandTrie of the reserved commands.
+    """
+    reserved_commands = azext_alias.cached_reserved_commands
+    if _reserved_command_trie_cache.get('commands') is not reserved_commands:
+        _reserved_command_trie_cache['commands'] = reserved_commands
+        _reserved_command_trie_cache['trie'] = CommandTrie(reserved_commands)
+    return _reserved_command_trie_cache['trie']
+
+
 def is_url(s):
     """
     Check if the argument is an URL.
@@ -217,6 +217,9 @@ helps['monitor app-insights query'] = """
       - name: Execute a simple query over past 1 hour and 30 minutes.
         text: |
           az monitor app-insights query --app e292531c-eb03-4079-9bb0-fe6b56b99f8b --analytics-query 'requests | summarize count() by bin(timestamp, 1h)' --offset 1h30m
+      - name: Get the requests of the past week by querying each day concurrently.
+        text: |
+          az monitor app-insights query --app e292531c-eb03-4079-9bb0-fe6b56b99f8b --analytics-query 'requests | project timestamp, name, duration' --offset 7d --time-slices 7
 """
 
 helps['monitor app-insights metrics show'] = """
@@ -87,6 +87,7 @@ def load_arguments(self, _):
     with self.argument_context('monitor app-insights query') as c:
         c.argument('application', validator=validate_applications, options_list=['--apps', '-a'], nargs='+', id_part='name', help='GUID, app name, or fully-qualified Azure resource name of Application Insights component. The application GUID may be acquired from the API Access menu item on any Application Insights resource in the Azure portal. If using an application name, please specify resource group.')
         c.argument('analytics_query', help='Query to execute over Application Insights data.')
+        c.argument('time_slices', type=int, help='Split the time range into this number of consecutive intervals which are queried concurrently, the rows are returned in time order. Use it for queries returning rows over long time ranges, the aggregations are computed for each interval.')
         c.argument('start_time', arg_type=get_datetime_type(help='Start-time of time range for which to retrieve data.'))
         c.argument('end_time', arg_type=get_datetime_type(help='End of time range for current operation. Defaults to the current time.'))
         c.argument('offset', help='Filter results based on UTC hour offset.', type=get_period_type(as_timedelta=True))
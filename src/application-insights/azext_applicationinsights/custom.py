@@ -8,6 +8,7 @@
 # pylint: disable=too-many-statements, too-many-locals, too-many-branches
 
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 import isodate
 from knack.util import CLIError
 from knack.log import get_logger
@@ -16,25 +17,44 @@ from azure.cli.core.azclierror import InvalidArgumentValueError
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
 from azure.cli.core.profiles import ResourceType
 from azext_applicationinsights.vendored_sdks.applicationinsights.models import ErrorResponseException
-from .util import get_id_from_azure_resource, get_query_targets, get_timespan, get_linked_properties
+from .util import get_id_from_azure_resource, get_query_targets, get_timespan, get_linked_properties, split_timespan
 
 logger = get_logger(__name__)
+MAX_CONCURRENT_TIME_SLICES = 8
 HELP_MESSAGE = " Please use `az feature register --name AIWorkspacePreview --namespace microsoft.insights` to register the feature"
 
 
-def execute_query(cmd, client, application, analytics_query, start_time=None, end_time=None, offset='1h', resource_group_name=None):
+def execute_query(cmd, client, application, analytics_query, start_time=None, end_time=None, offset='1h', resource_group_name=None, time_slices=None):
     """Executes a query against the provided Application Insights application."""
     from .vendored_sdks.applicationinsights.models import QueryBody
+    if time_slices is not None and time_slices < 1:
+        raise InvalidArgumentValueError('Value of --time-slices has to be at least 1.')
     targets = get_query_targets(cmd.cli_ctx, application, resource_group_name)
     if not isinstance(offset, datetime.timedelta):
         offset = isodate.parse_duration(offset)
+    timespan = get_timespan(cmd.cli_ctx, start_time, end_time, offset)
+
+    def _execute(slice_timespan):
+        return client.query.execute(targets[0], QueryBody(query=analytics_query, timespan=slice_timespan, applications=targets[1:]))
+
     try:
-        return client.query.execute(targets[0], QueryBody(query=analytics_query, timespan=get_timespan(cmd.cli_ctx, start_time, end_time, offset), applications=targets[1:]))
+        if not time_slices or time_slices == 1:
+            return _execute(timespan)
+        timespans = split_timespan(timespan, time_slices)
+        with ThreadPoolExecutor(max_workers=min(len(timespans), MAX_CONCURRENT_TIME_SLICES)) as executor:
+            results = list(executor.map(_execute, timespans))
     except ErrorResponseException as ex:
         if "PathNotFoundError" in ex.message:
             raise ValueError("The Application Insight is not found. Please check the app id again.")
         raise ex
 
+    # the rows of each slice are appended in time order
+    merged = results[0]
+    for result in results[1:]:
+        for merged_table, table in zip(merged.tables, result.tables):
+            merged_table.rows.extend(table.rows)
+    return merged
+
 
 def get_events(cmd, client, application, event_type, event=None, start_time=None, end_time=None, offset='1h', resource_group_name=None):
     timespan = get_timespan(cmd.cli_ctx, start_time, end_time, offset)
@@ -0,0 +1,57 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# pylint: disable=line-too-long
+import threading
+import time
+import unittest
+from unittest import mock
+
+from azext_applicationinsights.custom import execute_query
+from azext_applicationinsights.util import split_timespan
+from azext_applicationinsights.vendored_sdks.applicationinsights.models import Column, QueryResults, Table
+
+QUERY_LATENCY = 0.1
+
+
+class FakeQueryOperations:
+    """Returns a row with the start of the timespan of the query, the later slices answer first."""
+
+    def __init__(self):
+        self.timespans = []
+        self._lock = threading.Lock()
+
+    def execute(self, app_id, body):
+        with self._lock:
+            self.timespans.append(body.timespan)
+            latency = QUERY_LATENCY / len(self.timespans)
+        time.sleep(latency)
+        return QueryResults(tables=[Table(name='PrimaryResult', columns=[Column(name='timestamp', type='datetime')],
+                                          rows=[[body.timespan.split('/')[0]]])])
+
+
+class ApplicationInsightsTimeSlicesTest(unittest.TestCase):
+
+    def test_split_timespan(self):
+        self.assertEqual(split_timespan('2020-01-01T00:00:00/2020-01-01T12:00:00', 3),
+                         ['2020-01-01T00:00:00/2020-01-01T04:00:00',
+                          '2020-01-01T04:00:00/2020-01-01T08:00:00',
+                          '2020-01-01T08:00:00/2020-01-01T12:00:00'])
+
+    def test_execute_query_time_slices(self):
+        client = mock.MagicMock()
+        client.query = FakeQueryOperations()
+        start = time.time()
+        result = execute_query(mock.MagicMock(), client, 'e292531c-eb03-4079-9bb0-fe6b56b99f8b', 'requests',
+                               start_time='2020-01-01T00:00:00', offset='P4D', time_slices=4)
+        self.assertLess(time.time() - start, 2 * QUERY_LATENCY)
+        self.assertEqual(len(client.query.timespans), 4)
+        # the rows are in time order whatever the order the slices completed in
+        self.assertEqual([row[0] for row in result.tables[0].rows],
+                         ['2020-01-0{}T00:00:00'.format(day) for day in range(1, 5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -47,6 +47,16 @@ def get_timespan(_, start_time=None, end_time=None, offset=None):
     return timespan
 
 
+def split_timespan(timespan, slices):
+    """Splits a start/end timespan into consecutive timespans of the same length, the earliest first."""
+    start_time, end_time = (dateutil.parser.parse(value) for value in timespan.split('/'))
+    if end_time <= start_time:
+        return [timespan]
+    step = (end_time - start_time) / slices
+    bounds = [start_time + step * i for i in range(slices)] + [end_time]
+    return [f'{bounds[i].isoformat()}/{bounds[i + 1].isoformat()}' for i in range(slices)]
+
+
 def get_linked_properties(cli_ctx, app, resource_group, read_properties=None, write_properties=None):
     """Maps user-facing role names to strings used to identify them on resources."""
     roles = {
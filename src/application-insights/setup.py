@@ -8,7 +8,7 @@
 from codecs import open
 from setuptools import setup, find_packages
 
-VERSION = "0.1.18"
+VERSION = "0.1.19"
 
 CLASSIFIERS = [
     'Development Status :: 4 - Beta',
@@ -95,3 +95,28 @@ helps[
         - name: Input an ARM Template file and use a tar file as the image source instead of the Docker daemon
           text: az confcom acipolicygen --template-file "./template.json" --tar "./image.tar"
 """
+
+helps[
+    "confcom cache"
+] = """
+    type: group
+    short-summary: Commands to manage the cache of image layer hashes used when generating security policies.
+"""
+
+helps[
+    "confcom cache clear"
+] = """
+    type: command
+    short-summary: Remove images from the cache of image layer hashes, so that they are hashed again the next time a security policy is generated.
+
+    parameters:
+        - name: --image
+          type: string
+          short-summary: 'Image name or digest to remove from the cache. All the images are removed when not specified'
+
+    examples:
+        - name: Remove all the images from the cache
+          text: az confcom cache clear
+        - name: Remove an image from the cache
+          text: az confcom cache clear --image "python:3.6.14-slim-buster"
+"""
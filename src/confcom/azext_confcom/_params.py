@@ -127,3 +127,11 @@ def load_arguments(self, _):
             required=False,
             help="Print the generated policy in the terminal",
         )
+
+    with self.argument_context("confcom cache clear") as c:
+        c.argument(
+            "image_name",
+            options_list=("--image",),
+            required=False,
+            help="Image name or digest to remove from the cache. All the images are removed when not specified",
+        )
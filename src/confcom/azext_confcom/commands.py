@@ -9,5 +9,8 @@ def load_command_table(self, _):
     with self.command_group("confcom") as g:
         g.custom_command("acipolicygen", "acipolicygen_confcom")
 
+    with self.command_group("confcom cache") as g:
+        g.custom_command("clear", "clear_cache_confcom")
+
     with self.command_group("confcom", is_preview=True):
         pass
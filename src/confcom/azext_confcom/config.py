@@ -93,6 +93,13 @@ POLICY_FIELD_CONTAINERS_ELEMENTS_REGO_FRAGMENTS_ISS = "iss"
 POLICY_FIELD_CONTAINERS_ELEMENTS_REGO_FRAGMENTS_MINIMUM_SVN = "minimum_svn"
 POLICY_FIELD_CONTAINERS_ELEMENTS_REGO_FRAGMENTS_INCLUDES = "includes"
 
+# maximum number of images pulled and hashed at the same time
+MAX_CONCURRENT_IMAGES = 8
+# persistent cache of the layer hashes and config of images, under the azure cli config directory
+IMAGE_CACHE_DIR = "confcom"
+IMAGE_CACHE_FILE = "image_cache.json"
+IMAGE_CACHE_MAX_ENTRIES = 256
+
 CONFIG_FILE = "./data/internal_config.json"
 
 script_directory = os.path.dirname(os.path.realpath(__file__))
@@ -14,6 +14,7 @@ from azext_confcom.template_util import pretty_print_func, print_func
 from azext_confcom.init_checks import run_initial_docker_checks
 from azext_confcom.template_util import inject_policy_into_template, print_existing_policy_from_arm_template
 from azext_confcom import security_policy
+from azext_confcom.image_cache import ImageCache
 
 
 logger = get_logger(__name__)
@@ -137,6 +138,13 @@ def acipolicygen_confcom(
     sys.exit(exit_code)
 
 
+def clear_cache_confcom(image_name: str = None):
+    image_cache = ImageCache()
+    count = image_cache.invalidate(image_name)
+    image_cache.save()
+    logger.warning("Removed %d image(s) from the image cache", count)
+
+
 def update_confcom(cmd, instance, tags=None):
     with cmd.update_context(instance) as c:
         c.set_param("tags", tags)
@@ -0,0 +1,148 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from knack.log import get_logger
+from azext_confcom import config
+
+logger = get_logger(__name__)
+
+IMAGE_CACHE_VERSION = 1
+
+
+def get_image_cache_path() -> str:
+    from azure.cli.core._environment import get_config_dir
+
+    return os.path.join(get_config_dir(), config.IMAGE_CACHE_DIR, config.IMAGE_CACHE_FILE)
+
+
+class ImageCache:
+    """On-disk cache of the layer root hashes and config of images, keyed by image digest.
+
+    An image can be known by several digests (image id, repo digests, config digest in a tarball), all of them
+    lead to the same entry. The least recently used entries are evicted when there are more than max_entries,
+    and all the layer hashes are dropped when the dmverity-vhd tool that computed them changes."""
+
+    def __init__(self, path: str = None, tool_hash: str = None, max_entries: int = None) -> None:
+        self.path = path or get_image_cache_path()
+        self.tool_hash = tool_hash
+        self.max_entries = max_entries or config.IMAGE_CACHE_MAX_ENTRIES
+        self._lock = threading.Lock()
+        self._removed = set()
+        # the entries used or updated by this run, only those are written back to the file
+        self._touched = set()
+        # the tool hash of the file, kept when this cache is saved without knowing the tool (e.g. to clear it)
+        self._stored_tool_hash = None
+        self._entries = self._read()
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if content.get("version") != IMAGE_CACHE_VERSION:
+            return {}
+        self._stored_tool_hash = content.get("tool_hash")
+        entries = content.get("entries", {})
+        if self.tool_hash and content.get("tool_hash") != self.tool_hash:
+            # the layers were hashed by another version of dmverity-vhd
+            for entry in entries.values():
+                entry.pop("layers", None)
+        return entries
+
+    def _find(self, digests: List[str]) -> Optional[str]:
+        digests = set(digests or [])
+        for key, entry in self._entries.items():
+            if digests.intersection(entry["digests"]):
+                return key
+        return None
+
+    def _get(self, digests: List[str], field: str) -> Any:
+        with self._lock:
+            key = self._find(digests)
+            if key is None or self._entries[key].get(field) is None:
+                return None
+            self._entries[key]["last_used"] = time.time()
+            self._touched.add(key)
+            return self._entries[key][field]
+
+    def get_layers(self, digests: List[str]) -> Optional[List[str]]:
+        layers = self._get(digests, "layers")
+        return list(layers) if layers is not None else None
+
+    def get_image_info(self, digests: List[str]) -> Optional[Dict[str, Any]]:
+        image_info = self._get(digests, "image_info")
+        return dict(image_info) if image_info is not None else None
+
+    def put(
+        self, digests: List[str], image_name: str = None, image_info: Dict[str, Any] = None, layers: List[str] = None
+    ) -> None:
+        if not digests:
+            return
+        with self._lock:
+            key = self._find(digests) or digests[0]
+            entry = self._entries.setdefault(key, {"digests": [], "images": []})
+            entry["digests"] = sorted(set(entry["digests"]).union(digests))
+            if image_name and image_name not in entry["images"]:
+                entry["images"].append(image_name)
+            if image_info is not None:
+                entry["image_info"] = image_info
+            if layers is not None:
+                entry["layers"] = list(layers)
+            entry["last_used"] = time.time()
+            self._removed.discard(key)
+            self._touched.add(key)
+
+    def invalidate(self, image_name: str = None) -> int:
+        """Remove the entries of the image, or all the entries, returning how many were removed"""
+        with self._lock:
+            # entries written by other runs since this cache was loaded are removed too
+            for key, entry in self._read().items():
+                self._entries.setdefault(key, entry)
+            keys = [
+                key for key, entry in self._entries.items()
+                if not image_name or image_name in entry["images"] or image_name in entry["digests"]
+            ]
+            for key in keys:
+                del self._entries[key]
+            self._removed.update(keys)
+            self._touched.difference_update(keys)
+            return len(keys)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._touched and not self._removed:
+                return
+            # keep what other runs added or removed in the meantime
+            entries = self._read()
+            for key in self._removed:
+                entries.pop(key, None)
+            for key in self._touched:
+                entries[key] = self._entries[key]
+            if len(entries) > self.max_entries:
+                keep = sorted(entries, key=lambda key: entries[key].get("last_used", 0))[-self.max_entries:]
+                entries = {key: entries[key] for key in keep}
+
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": IMAGE_CACHE_VERSION,
+                        "tool_hash": self.tool_hash or self._stored_tool_hash,
+                        "entries": entries,
+                    },
+                    f,
+                )
+            os.replace(temp_path, self.path)
+            self._entries = entries
+            self._touched = set()
+            self._removed = set()
+        logger.debug("Saved %d images to the image cache at %s", len(entries), self.path)
@@ -7,7 +7,10 @@ import base64
 import binascii
 import json
 import os
+import tarfile
+import threading
 from tarfile import TarFile
+from typing import Any
 from azext_confcom.errors import (
     eprint,
 )
@@ -87,47 +90,77 @@ def load_tar_mapping_from_file(path: str) -> dict:
     return raw_json
 
 
-def map_image_from_tar(image_name: str, tar: TarFile, tar_location: str):
-    tar_dir = os.path.dirname(tar_location)
-    # grab all files in the folder and only take the one that's named with hex values and a json extension
-    members = tar.getmembers()
-    info_file_name = [
-        file
-        for file in members
-        if file.name.endswith(".json") and not file.name.startswith("manifest")
-    ]
-    info_file = None
-    # if there's more than one image in the tarball, we need to do some more logic
-    if len(info_file_name) > 0:
-        # extract just the manifest file and see if any of the RepoTags match the image_name we're searching for
-        # the manifest.json should have a list of all the image tags
-        # and what json files they map to to get env vars, startup cmd, etc.
-        tar.extract("manifest.json", path=tar_dir)
-        manifest_path = os.path.join(tar_dir, "manifest.json")
-        manifest = load_json_from_file(manifest_path)
-        # if we match a RepoTag to the image, stop searching
-        for image in manifest:
-            if image_name in image.get("RepoTags"):
-                info_file = [
-                    item for item in info_file_name if item.name == image.get("Config")
-                ][0]
-                break
-        # remove the extracted manifest file to clean up
-        os.remove(manifest_path)
-    else:
+class TarIndex:
+    """Images of a tarball made by "docker save", read with a single scan of the archive.
+
+    The manifest and the config of every image are kept in memory, so any number of images can be served
+    without opening the tarball again."""
+
+    def __init__(self, tar_location: str) -> None:
+        self.tar_location = tar_location
+        # image tag -> (config digest, config json)
+        self.images = {}
+        with tarfile.open(tar_location) as tar:
+            # a single pass over the archive to find where the members are
+            members = {member.name: member for member in tar}
+            manifest = self._read_json(tar, members.get("manifest.json")) or []
+            for image in manifest:
+                config_name = image.get("Config", "")
+                image_config = self._read_json(tar, members.get(config_name))
+                if image_config is None:
+                    continue
+                # the config file of an image is named after its digest, e.g. <hex>.json or blobs/sha256/<hex>
+                digest = os.path.basename(config_name)
+                if digest.endswith(".json"):
+                    digest = digest[:-len(".json")]
+                for repo_tag in image.get("RepoTags") or []:
+                    self.images[repo_tag] = (f"sha256:{digest}", image_config)
+
+    @staticmethod
+    def _read_json(tar: TarFile, member: tarfile.TarInfo) -> Any:
+        if member is None or not member.isfile():
+            return None
+        with tar.extractfile(member) as f:
+            return json.load(f)
+
+    def get_image_info(self, image_name: str) -> dict:
+        image = self.images.get(image_name)
+        if not image:
+            return None
+        image_info = dict(image[1].get("config") or {})
+        # importing the constant from config.py gives a circular dependency error
+        image_info["Architecture"] = image[1].get("architecture")
+        return image_info
+
+    def get_image_digest(self, image_name: str) -> str:
+        image = self.images.get(image_name)
+        return image[0] if image else None
+
+
+_tar_indexes = {}
+_tar_indexes_lock = threading.Lock()
+
+
+def get_tar_index(tar_location: str) -> TarIndex:
+    """Index of the tarball, cached until the file changes"""
+    stat = os.stat(tar_location)
+    key = (os.path.abspath(tar_location), stat.st_mtime, stat.st_size)
+    with _tar_indexes_lock:
+        entry = _tar_indexes.get(key)
+        if not entry:
+            # forget the previous versions of the tarball
+            for stale_key in [k for k in _tar_indexes if k[0] == key[0]]:
+                del _tar_indexes[stale_key]
+            # the lock of the tarball lets other tarballs be indexed at the same time
+            entry = _tar_indexes[key] = {"lock": threading.Lock(), "index": None}
+    with entry["lock"]:
+        if entry["index"] is None:
+            entry["index"] = TarIndex(tar_location)
+        return entry["index"]
+
+
+def map_image_from_tar(image_name: str, tar_location: str):
+    tar_index = get_tar_index(tar_location)
+    if not tar_index.images:
         eprint(f"Tarball at {tar_location} contains no images")
-
-    if not info_file:
-        return None
-    tar.extract(info_file.name, path=tar_dir)
-
-    # get the path of the json file and read it in
-    image_info_file_path = os.path.join(tar_dir, info_file.name)
-    image_info_raw = load_json_from_file(image_info_file_path)
-    # delete the extracted json file to clean up
-    os.remove(image_info_file_path)
-    image_info = image_info_raw.get("config")
-    # importing the constant from config.py gives a circular dependency error
-    image_info["Architecture"] = image_info_raw.get("architecture")
-
-    return image_info
+    return tar_index.get_image_info(image_name)
@@ -3,6 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import hashlib
 import subprocess
 from typing import List
 import os
@@ -46,6 +47,14 @@ class SecurityPolicyProxy:  # pylint: disable=too-few-public-methods
             st = os.stat(self.policy_bin)
             os.chmod(self.policy_bin, st.st_mode | stat.S_IXUSR)
 
+    def get_tool_hash(self) -> str:
+        """Hash of the dmverity-vhd binary, the layer hashes it computed are only reused with the same binary"""
+        sha256 = hashlib.sha256()
+        with open(self.policy_bin, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
     def get_policy_image_layers(
         self, image: str, tag: str, tar_location: str = ""
     ) -> List[str]:
@@ -6,6 +6,9 @@
 import json
 import warnings
 import copy
+import concurrent.futures
+import functools
+import threading
 from typing import Any, List, Dict, Tuple
 from enum import Enum, auto
 import docker
@@ -34,6 +37,7 @@ from azext_confcom.template_util import (
     get_tar_location_from_mapping
 )
 from azext_confcom.rootfs_proxy import SecurityPolicyProxy
+from azext_confcom.image_cache import ImageCache
 
 logger = get_logger()
 
@@ -389,23 +393,27 @@ class AciPolicy:  # pylint: disable=too-many-instance-attributes
         return print_func(policy)
 
     def populate_policy_content_for_all_images(
-        self, individual_image=False, tar_mapping=None
+        self, individual_image=False, tar_mapping=None, max_workers=config.MAX_CONCURRENT_IMAGES, image_cache=None
     ) -> None:
         # suppress warning which will break the progress bar
         warnings.filterwarnings(
             action="ignore", message="unclosed", category=ResourceWarning
         )
 
-        tar_location = ""
-        layer_cache = {}
-        if isinstance(tar_mapping, str):
-            tar_location = tar_mapping
         proxy = self._get_rootfs_proxy()
+        if image_cache is None:
+            image_cache = ImageCache(tool_hash=proxy.get_tool_hash())
         container_images = self.get_images()
 
+        # containers running the same image only need it pulled and hashed once
+        unique_images = {}
+        for image in container_images:
+            image.parse_all_parameters_and_variables(AciPolicy.all_params, AciPolicy.all_vars)
+            unique_images.setdefault(f"{image.base}:{image.tag}", image)
+
         # total tasks to complete is number of images to pull and get layers
         # (i.e. total images * 2 tasks)
-        _TOTAL = 2 * len(container_images)
+        _TOTAL = 2 * len(unique_images)
 
         with tqdm(
             total=_TOTAL,
@@ -417,11 +425,25 @@ class AciPolicy:  # pylint: disable=too-many-instance-attributes
             # make a message queue so we don't interrupt the printing of the
             # progress bar
             message_queue = []
+            try:
+                image_results = _process_images_concurrently(
+                    list(unique_images.values()),
+                    functools.partial(
+                        _get_image_info_and_layers, proxy, image_cache, _LockedProgress(progress), tar_mapping
+                    ),
+                    max_workers,
+                )
+            finally:
+                try:
+                    image_cache.save()
+                except OSError as e:
+                    logger.debug("Could not save the image cache: %s", e)
+
             # populate regular container images(s)
             for image in container_images:
-                image.parse_all_parameters_and_variables(AciPolicy.all_params, AciPolicy.all_vars)
-                image_name = f"{image.base}:{image.tag}"
-                image_info, tar = get_image_info(progress, message_queue, tar_mapping, image)
+                image_info, layers, messages = image_results[f"{image.base}:{image.tag}"]
+                if unique_images[f"{image.base}:{image.tag}"] is image:
+                    message_queue.extend(messages)
 
                 # verify and populate the working directory property
                 if not image.get_working_dir() and image_info:
@@ -471,18 +493,8 @@ class AciPolicy:  # pylint: disable=too-many-instance-attributes
                                 }
                             )
 
-                # populate tar location
-                if isinstance(tar_mapping, dict):
-                    tar_location = get_tar_location_from_mapping(tar_mapping, image_name)
                 # populate layer info
-                if layer_cache.get(image_name):
-                    image.set_layers(layer_cache.get(image_name))
-                else:
-                    image.set_layers(proxy.get_policy_image_layers(
-                        image.base, image.tag, tar_location=tar_location if tar else ""
-                    ))
-                    layer_cache[image_name] = image.get_layers()
-                progress.update()
+                image.set_layers(list(layers))
             progress.close()
             self.close()
 
@@ -498,6 +510,67 @@ class AciPolicy:  # pylint: disable=too-many-instance-attributes
         return client.images.pull(image.base, image.tag)
 
 
+class _LockedProgress:
+    """Progress bar shared by the threads processing the images"""
+
+    def __init__(self, progress) -> None:
+        self._progress = progress
+        self._lock = threading.Lock()
+
+    def update(self, *args, **kwargs) -> None:
+        with self._lock:
+            self._progress.update(*args, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            self._progress.close()
+
+
+def _get_image_info_and_layers(
+    proxy: SecurityPolicyProxy,
+    image_cache: ImageCache,
+    progress: _LockedProgress,
+    tar_mapping: Any,
+    image: ContainerImage,
+) -> Tuple[Any, List[str], List[str]]:
+    # each image gets its own message queue so the messages can be printed in the order of the images
+    message_queue = []
+    image_name = f"{image.base}:{image.tag}"
+    image_info, tar, digests = get_image_info(progress, message_queue, tar_mapping, image, image_cache)
+
+    # hashing the layers is skipped for the images already processed
+    layers = image_cache.get_layers(digests)
+    if layers is None:
+        tar_location = get_tar_location_from_mapping(tar_mapping, image_name) if tar else ""
+        layers = proxy.get_policy_image_layers(image.base, image.tag, tar_location=tar_location)
+        # no layers means dmverity-vhd failed, which is not cached
+        if layers:
+            image_cache.put(digests, image_name=image_name, layers=layers)
+    progress.update()
+    return image_info, layers, message_queue
+
+
+def _process_images_concurrently(
+    images: List[ContainerImage], func: Any, max_workers: int
+) -> Dict[str, Any]:
+    """Run func on each image with at most max_workers images in flight, returning the results by image name.
+    An error processing an image is raised for the first failing image in order, like a sequential run would"""
+    max_workers = max(1, min(max_workers or 1, len(images)))
+    if max_workers == 1:
+        return {f"{image.base}:{image.tag}": func(image) for image in images}
+
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(image, executor.submit(func, image)) for image in images]
+        try:
+            for image, future in futures:
+                results[f"{image.base}:{image.tag}"] = future.result()
+        finally:
+            for _, future in futures:
+                future.cancel()
+    return results
+
+
 def load_policy_from_arm_template_str(
     template_data: str,
     parameter_data: str,
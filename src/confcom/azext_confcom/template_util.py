@@ -6,7 +6,6 @@
 import re
 import json
 import copy
-import tarfile
 from typing import Any, Tuple, Dict, List
 import deepdiff
 import yaml
@@ -52,10 +51,19 @@ def case_insensitive_dict_get(dictionary, search_key) -> Any:
     return None
 
 
-def get_image_info(progress, message_queue, tar_mapping, image):
+def get_docker_image_digests(raw_image) -> List[str]:
+    # an image is known by its id, the digest of its config, and by the digests of the manifests it was pulled from
+    digests = [raw_image.id] if raw_image.id else []
+    digests += [repo_digest.split("@", 1)[1] for repo_digest in raw_image.attrs.get("RepoDigests") or []
+                if "@" in repo_digest]
+    return digests
+
+
+def get_image_info(progress, message_queue, tar_mapping, image, image_cache=None):
     image_info = None
     raw_image = None
     tar = False
+    digests = []
     if not image.base:
         eprint("Image name cannot be empty")
     image_name = f"{image.base}:{image.tag}"
@@ -69,14 +77,13 @@ def get_image_info(progress, message_queue, tar_mapping, image):
         tar_location = get_tar_location_from_mapping(tar_mapping, image_name)
         # if we have a tar location, we can try to get the image info
         if tar_location:
-            with tarfile.open(tar_location) as tar:
-                # get all the info out of the tarfile
-                image_info = os_util.map_image_from_tar(
-                    image_name, tar, tar_location
-                )
-                if image_info is not None:
-                    tar = True
-                    message_queue.append(f"{image_name} read from local tar file")
+            # get all the info out of the tarfile
+            image_info = os_util.map_image_from_tar(image_name, tar_location)
+            if image_info is not None:
+                digest = os_util.get_tar_index(tar_location).get_image_digest(image_name)
+                digests = [digest] if digest else []
+                tar = True
+                message_queue.append(f"{image_name} read from local tar file")
 
     # see if we have the image locally so we can have a
     # 'clean-room'
@@ -92,6 +99,10 @@ def get_image_info(progress, message_queue, tar_mapping, image):
             message_queue.append(
                 f"{image_name} is not found locally. Attempting to pull from remote..."
             )
+            # the image does not need to be pulled if it was already processed
+            image_info, digests = get_cached_image_info(client, image_cache, image_name)
+            if image_info:
+                message_queue.append(f"{image_name} read from the image cache")
         except docker.errors.DockerException:
             progress.close()
             eprint(
@@ -138,7 +149,30 @@ def get_image_info(progress, message_queue, tar_mapping, image):
             + f"Only {config.ACI_FIELD_CONTAINERS_ARCHITECTURE_VALUE} is supported by Confidential ACI"
         )
 
-    return image_info, tar
+    if raw_image:
+        digests = get_docker_image_digests(raw_image)
+    if image_cache and image_info:
+        cached_info = dict(image_info)
+        if raw_image:
+            cached_info[config.ACI_FIELD_CONTAINERS_ARCHITECTURE_KEY] = raw_image.attrs.get(
+                config.ACI_FIELD_CONTAINERS_ARCHITECTURE_KEY
+            )
+        image_cache.put(digests, image_name=image_name, image_info=cached_info)
+
+    return image_info, tar, digests
+
+
+def get_cached_image_info(client, image_cache, image_name: str) -> Tuple[Any, List[str]]:
+    if not image_cache:
+        return None, []
+    try:
+        digest = client.images.get_registry_data(image_name).id
+    except docker.errors.DockerException:
+        return None, []
+    # only skip the pull when the layers are cached too
+    if image_cache.get_layers([digest]) is None:
+        return None, []
+    return image_cache.get_image_info([digest]), [digest]
 
 
 def get_tar_location_from_mapping(tar_mapping: Any, image_name: str) -> str:
@@ -127,3 +127,57 @@ class PolicyGeneratingImageCleanRoom(unittest.TestCase):
             deepdiff.DeepDiff(regular_image_json, clean_room_json, ignore_order=True),
             {},
         )
+
+
+class PolicyGeneratingImageConcurrent(unittest.TestCase):
+    custom_json = """
+        {
+            "version": "1.0",
+            "containers": [
+                {"containerImage": "python:3.6.14-slim-buster", "command": ["python3"], "environmentVariables": []},
+                {"containerImage": "nginx:1.22", "command": [], "environmentVariables": []},
+                {"containerImage": "python:3.6.14-slim-buster", "command": ["app"], "environmentVariables": []}
+            ]
+        }
+    """
+
+    def test_images_processed_once_concurrently(self):
+        from unittest import mock
+        import tempfile
+        import azext_confcom.security_policy as security_policy
+        from azext_confcom.image_cache import ImageCache
+
+        image_info_calls = []
+
+        def get_image_info(progress, message_queue, tar_mapping, image, image_cache=None):
+            image_info_calls.append(f"{image.base}:{image.tag}")
+            message_queue.append(f"{image.base}:{image.tag} inspected")
+            progress.update()
+            image_info = {"WorkingDir": "/" + image.base, "Cmd": [], "Env": [f"IMAGE={image.base}"]}
+            return image_info, False, ["sha256:" + image.base]
+
+        proxy = mock.MagicMock()
+        proxy.get_policy_image_layers.side_effect = lambda image, tag, tar_location="": [image + ":" + tag]
+
+        aci_policy = security_policy.load_policy_from_str(self.custom_json)
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                mock.patch.object(security_policy, "get_image_info", get_image_info), \
+                mock.patch.object(security_policy.AciPolicy, "_get_rootfs_proxy", return_value=proxy), \
+                mock.patch.object(security_policy.logger, "warning") as warning:
+            aci_policy.populate_policy_content_for_all_images(
+                max_workers=4, image_cache=ImageCache(path=os.path.join(cache_dir, "cache.json"))
+            )
+
+        images = aci_policy.get_images()
+        image_names = [f"{image.base}:{image.tag}" for image in images]
+        # each distinct image is inspected and hashed once
+        self.assertEqual(sorted(image_info_calls), sorted(set(image_names)))
+        self.assertEqual(proxy.get_policy_image_layers.call_count, len(set(image_names)))
+        for image in images:
+            self.assertEqual(image.get_layers(), [f"{image.base}:{image.tag}"])
+            self.assertEqual(image.get_working_dir(), "/" + image.base)
+        # messages are reported in the order of the containers
+        self.assertEqual(
+            [call[0][0] for call in warning.call_args_list],
+            [f"{name} inspected" for name in dict.fromkeys(image_names)],
+        )
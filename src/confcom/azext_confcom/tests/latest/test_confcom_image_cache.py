@@ -0,0 +1,124 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import azext_confcom.security_policy as security_policy
+from azext_confcom.image_cache import ImageCache
+
+
+class ImageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.cache_dir, "confcom", "image_cache.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_cache_persisted_by_digest(self):
+        cache = ImageCache(path=self.cache_path, tool_hash="tool")
+        cache.put(["sha256:id", "sha256:manifest"], image_name="python:3.9", image_info={"Cmd": ["python3"]})
+        cache.put(["sha256:id"], image_name="python:3.9", layers=["layer1", "layer2"])
+        cache.save()
+
+        cache = ImageCache(path=self.cache_path, tool_hash="tool")
+        # any of the digests of the image finds it
+        self.assertEqual(cache.get_layers(["sha256:manifest"]), ["layer1", "layer2"])
+        self.assertEqual(cache.get_image_info(["sha256:id"]), {"Cmd": ["python3"]})
+        self.assertIsNone(cache.get_layers(["sha256:other"]))
+        self.assertIsNone(cache.get_layers([]))
+
+    def test_cache_dropped_with_new_tool(self):
+        cache = ImageCache(path=self.cache_path, tool_hash="tool")
+        cache.put(["sha256:id"], layers=["layer1"], image_info={})
+        cache.save()
+
+        cache = ImageCache(path=self.cache_path, tool_hash="new tool")
+        self.assertIsNone(cache.get_layers(["sha256:id"]))
+        self.assertEqual(cache.get_image_info(["sha256:id"]), {})
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = ImageCache(path=self.cache_path, max_entries=2)
+        for digest in ["sha256:1", "sha256:2", "sha256:3"]:
+            cache.put([digest], layers=[digest])
+            cache.save()
+            # reading an image makes it the most recently used
+            cache.get_layers(["sha256:1"])
+        cache.save()
+
+        cache = ImageCache(path=self.cache_path, max_entries=2)
+        self.assertEqual(cache.get_layers(["sha256:1"]), ["sha256:1"])
+        self.assertIsNone(cache.get_layers(["sha256:2"]))
+        self.assertEqual(cache.get_layers(["sha256:3"]), ["sha256:3"])
+
+    def test_cache_invalidate(self):
+        cache = ImageCache(path=self.cache_path)
+        cache.put(["sha256:1"], image_name="python:3.9", layers=["a"])
+        cache.put(["sha256:2"], image_name="nginx:1.22", layers=["b"])
+        cache.save()
+
+        other_run = ImageCache(path=self.cache_path)
+        self.assertEqual(other_run.invalidate("python:3.9"), 1)
+        other_run.save()
+        # a run which loaded the cache before the invalidation does not bring the image back
+        cache.get_layers(["sha256:2"])
+        cache.save()
+
+        cache = ImageCache(path=self.cache_path)
+        self.assertIsNone(cache.get_layers(["sha256:1"]))
+        self.assertEqual(cache.get_layers(["sha256:2"]), ["b"])
+        self.assertEqual(cache.invalidate(), 1)
+        cache.save()
+        self.assertIsNone(ImageCache(path=self.cache_path).get_layers(["sha256:2"]))
+
+    def test_cache_clear_keeps_tool_hash(self):
+        cache = ImageCache(path=self.cache_path, tool_hash="tool")
+        cache.put(["sha256:1"], image_name="python:3.9", layers=["a"])
+        cache.put(["sha256:2"], image_name="nginx:1.22", layers=["b"])
+        cache.save()
+
+        # clearing an image does not know the tool which hashed the layers
+        cache = ImageCache(path=self.cache_path)
+        self.assertEqual(cache.invalidate("python:3.9"), 1)
+        cache.save()
+
+        # the layers of the other images are still used by the next policy generation
+        cache = ImageCache(path=self.cache_path, tool_hash="tool")
+        self.assertIsNone(cache.get_layers(["sha256:1"]))
+        self.assertEqual(cache.get_layers(["sha256:2"]), ["b"])
+
+    def test_cached_layers_skip_hashing(self):
+        custom_json = """
+            {
+                "version": "1.0",
+                "containers": [{"containerImage": "python:3.9", "command": [], "environmentVariables": []}]
+            }
+        """
+        cache = ImageCache(path=self.cache_path)
+        cache.put(["sha256:python"], image_name="python:3.9", layers=["cached-layer"])
+        proxy = mock.MagicMock()
+        proxy.get_policy_image_layers.return_value = ["new-layer"]
+
+        def get_image_info(progress, message_queue, tar_mapping, image, image_cache=None):
+            progress.update()
+            digests = ["sha256:python"] if image.base == "python" else ["sha256:" + image.base]
+            return {"WorkingDir": "/", "Cmd": [], "Env": []}, False, digests
+
+        aci_policy = security_policy.load_policy_from_str(custom_json)
+        with mock.patch.object(security_policy, "get_image_info", get_image_info), \
+                mock.patch.object(security_policy.AciPolicy, "_get_rootfs_proxy", return_value=proxy):
+            aci_policy.populate_policy_content_for_all_images(image_cache=cache)
+
+        images = {f"{image.base}:{image.tag}": image for image in aci_policy.get_images()}
+        self.assertEqual(images["python:3.9"].get_layers(), ["cached-layer"])
+        # the other images were hashed and saved
+        self.assertEqual(proxy.get_policy_image_layers.call_count, len(images) - 1)
+        cache = ImageCache(path=self.cache_path)
+        for name, image in images.items():
+            self.assertEqual(cache.get_layers(["sha256:" + image.base]), image.get_layers(), name)
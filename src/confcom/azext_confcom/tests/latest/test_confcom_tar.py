@@ -724,3 +724,59 @@ class PolicyGeneratingArmParametersCleanRoomTarFile(unittest.TestCase):
             raise AccContainerError("getting image should fail")
         except FileNotFoundError:
             pass
+
+
+class TarIndexTest(unittest.TestCase):
+    def _write_tar(self, path, images):
+        import io
+        import tarfile
+
+        def add_file(tar, name, content):
+            data = json.dumps(content).encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+        manifest = []
+        with tarfile.open(path, "w") as tar:
+            for config_name, repo_tags, cmd in images:
+                add_file(tar, config_name, {"architecture": "amd64", "config": {"Cmd": cmd}})
+                add_file(tar, config_name.replace(".json", "") + "/layer.tar", {})
+                manifest.append({"Config": config_name, "RepoTags": repo_tags, "Layers": []})
+            add_file(tar, "manifest.json", manifest)
+
+    def test_tar_index(self):
+        import tarfile
+        import tempfile
+        from unittest import mock
+        from azext_confcom import os_util
+
+        with tempfile.TemporaryDirectory() as tar_dir:
+            tar_path = os.path.join(tar_dir, "images.tar")
+            self._write_tar(tar_path, [
+                ("abc.json", ["nginx:1.22"], ["nginx"]),
+                ("blobs/sha256/def", ["python:3.9", "python:latest"], ["python3"]),
+            ])
+
+            with mock.patch.object(os_util.tarfile, "open", wraps=tarfile.open) as tar_open:
+                for image_name in ["nginx:1.22", "python:3.9", "python:latest", "rust:1.0"]:
+                    os_util.map_image_from_tar(image_name, tar_path)
+                # the tarball is only read once for all the images
+                self.assertEqual(tar_open.call_count, 1)
+
+            tar_index = os_util.get_tar_index(tar_path)
+            self.assertEqual(
+                tar_index.get_image_info("nginx:1.22"), {"Cmd": ["nginx"], "Architecture": "amd64"}
+            )
+            self.assertEqual(tar_index.get_image_info("python:latest")["Cmd"], ["python3"])
+            self.assertIsNone(tar_index.get_image_info("rust:1.0"))
+            self.assertEqual(tar_index.get_image_digest("nginx:1.22"), "sha256:abc")
+            self.assertEqual(tar_index.get_image_digest("python:3.9"), "sha256:def")
+            # no files are extracted next to the tarball
+            self.assertEqual(os.listdir(tar_dir), ["images.tar"])
+
+            # the tarball changed, it is indexed again
+            self._write_tar(tar_path, [("ghi.json", ["nginx:1.22"], ["nginx", "-g"])])
+            os.utime(tar_path, (0, 0))
+            self.assertEqual(os_util.map_image_from_tar("nginx:1.22", tar_path)["Cmd"], ["nginx", "-g"])
+            self.assertIsNone(os_util.map_image_from_tar("python:3.9", tar_path))
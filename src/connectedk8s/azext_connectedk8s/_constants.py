@@ -188,6 +188,11 @@ DNS_Check = "dns_check.txt"
 K8s_Cluster_Info = "k8s_cluster_info.txt"
 Outbound_Network_Connectivity_Check = "outbound_network_connectivity_check.txt"
 Events_of_Incomplete_Diagnoser_Job = "diagnoser_failure_events.txt"
+Arc_Diagnostic_Collection_Timings = "collection_timings.txt"
+# Limits of the troubleshoot logs collection
+Troubleshoot_Max_Concurrent_Requests = 8
+Troubleshoot_Container_Log_Max_Bytes = 100 * 1024 * 1024
+Troubleshoot_Log_Stream_Chunk_Size = 64 * 1024
 # Connect Precheck Diagnoser constants
 Cluster_Diagnostic_Checks_Job_Registry_Path = "mcr.microsoft.com/azurearck8s/helmchart/stable/clusterdiagnosticchecks:0.1.1"
 Cluster_Diagnostic_Checks_Helm_Install_Failed_Fault_Type = "Error while installing cluster diagnostic checks helm release"
@@ -11,6 +11,10 @@ import os
 import yaml
 import json
 import datetime
+import gzip
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from subprocess import Popen, PIPE, run, STDOUT, call, DEVNULL
 import shutil
 from knack.log import get_logger
@@ -115,22 +119,85 @@ def fetch_connected_cluster_resource(filepath_with_timestamp, connected_cluster,
     return consts.Diagnostic_Check_Failed, storage_space_available
 
 
-def retrieve_arc_agents_logs(corev1_api_instance, filepath_with_timestamp, storage_space_available):
+class DiagnosticCollector:
+    """
+    Collects the diagnostic artifacts concurrently with a bounded pool of threads and records the time taken by each of them.
+    """
+
+    def __init__(self, max_workers=consts.Troubleshoot_Max_Concurrent_Requests):
+        self.max_workers = max_workers
+        self.timings = []
+        self._lock = threading.Lock()
+
+    def timed(self, artifact, func, *args):
+        start_time = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.timings.append((artifact, time.perf_counter() - start_time))
+
+    def run_concurrently(self, tasks):
+        # Tasks are tuples of artifact name, function and arguments. The results are returned in the same order,
+        # the error of the first failed task is raised once all of them are done.
+        # Each call has its own pool so a task can run tasks concurrently as well.
+        if not tasks:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+            futures = [executor.submit(self.timed, artifact, func, *args) for artifact, func, args in tasks]
+        return [future.result() for future in futures]
+
+    def save_timings(self, filepath_with_timestamp, storage_space_available):
+        if not storage_space_available or not self.timings:
+            return
+        try:
+            timings_path = os.path.join(filepath_with_timestamp, consts.Arc_Diagnostic_Collection_Timings)
+            with open(timings_path, 'w+') as timings_file:
+                for artifact, elapsed in sorted(self.timings, key=lambda timing: timing[1], reverse=True):
+                    timings_file.write("{:8.2f}s {}\n".format(elapsed, artifact))
+        except OSError as e:
+            logger.debug("Unable to save the collection timings. Exception: {}".format(str(e)))
+
+
+def stream_container_log(corev1_api_instance, pod_name, container_name, log_path, max_bytes=consts.Troubleshoot_Container_Log_Max_Bytes):
+
+    # The log is written to the compressed file while it is downloaded instead of being loaded in memory first.
+    # One more byte than kept is asked for, to tell a log of exactly max_bytes from a truncated one
+    response = corev1_api_instance.read_namespaced_pod_log(name=pod_name, container=container_name, namespace="azure-arc", limit_bytes=max_bytes + 1, _preload_content=False)
+    bytes_written = 0
+    try:
+        with gzip.open(log_path, 'wb') as container_file:
+            for chunk in response.stream(consts.Troubleshoot_Log_Stream_Chunk_Size):
+                if bytes_written + len(chunk) > max_bytes:
+                    container_file.write(chunk[:max_bytes - bytes_written])
+                    bytes_written = max_bytes
+                    container_file.write("\n[Log truncated after {} bytes]\n".format(max_bytes).encode())
+                    break
+                container_file.write(chunk)
+                bytes_written += len(chunk)
+    finally:
+        response.release_conn()
+    return bytes_written
+
+
+def retrieve_arc_agents_logs(corev1_api_instance, filepath_with_timestamp, storage_space_available, collector=None):
 
     global diagnoser_output
+    collector = collector or DiagnosticCollector()
     try:
         if storage_space_available:
             # To retrieve all of the arc agents pods that are present in the Cluster
             arc_agents_pod_list = corev1_api_instance.list_namespaced_pod(namespace="azure-arc")
+            arc_agent_logs_path = os.path.join(filepath_with_timestamp, consts.Arc_Agents_Logs)
+            try:
+                os.mkdir(arc_agent_logs_path)
+            except FileExistsError:
+                pass
+            container_log_tasks = []
             # Traversing through all agents
             for each_agent_pod in arc_agents_pod_list.items:
                 # Fetching the current Pod name and creating a folder with that name inside the timestamp folder
                 agent_name = each_agent_pod.metadata.name
-                arc_agent_logs_path = os.path.join(filepath_with_timestamp, consts.Arc_Agents_Logs)
-                try:
-                    os.mkdir(arc_agent_logs_path)
-                except FileExistsError:
-                    pass
                 agent_name_logs_path = os.path.join(arc_agent_logs_path, agent_name)
                 try:
                     os.mkdir(agent_name_logs_path)
@@ -143,12 +210,13 @@ def retrieve_arc_agents_logs(corev1_api_instance, filepath_with_timestamp, stora
                 for each_container in each_agent_pod.spec.containers:
                     # Fetching the Container name
                     container_name = each_container.name
-                    # Creating a text file with the name of the container and adding that containers logs in it
-                    container_log = corev1_api_instance.read_namespaced_pod_log(name=agent_name, container=container_name, namespace="azure-arc")
-                    # Path to add the arc agents container logs.
-                    arc_agent_container_logs_path = os.path.join(agent_name_logs_path, container_name + ".txt")
-                    with open(arc_agent_container_logs_path, 'w+') as container_file:
-                        container_file.write(str(container_log))
+                    # Path to add the arc agents container logs, a compressed text file with the name of the container
+                    arc_agent_container_logs_path = os.path.join(agent_name_logs_path, container_name + ".txt.gz")
+                    container_log_tasks.append(("{}/{}/{}".format(consts.Arc_Agents_Logs, agent_name, container_name), stream_container_log,
+                                                (corev1_api_instance, agent_name, container_name, arc_agent_container_logs_path)))
+
+            # Downloading the logs of all the containers at the same time
+            collector.run_concurrently(container_log_tasks)
 
         return consts.Diagnostic_Check_Passed, storage_space_available
 
@@ -157,7 +225,8 @@ def retrieve_arc_agents_logs(corev1_api_instance, filepath_with_timestamp, stora
         if "[Errno 28]" in str(e):
             storage_space_available = False
             telemetry.set_exception(exception=e, fault_type=consts.No_Storage_Space_Available_Fault_Type, summary="No space left on device")
-            shutil.rmtree(filepath_with_timestamp, ignore_errors=False, onerror=None)
+            # The logs, events and deployments are collected at the same time, the folder may already be removed
+            shutil.rmtree(filepath_with_timestamp, ignore_errors=True)
         else:
             logger.warning("An exception has occured while trying to fetch the azure arc agents logs from the cluster. Exception: {}".format(str(e)) + "\n")
             telemetry.set_exception(exception=e, fault_type=consts.Fetch_Arc_Agent_Logs_Failed_Fault_Type, summary="Error occured in arc agents logger")
@@ -211,7 +280,8 @@ def retrieve_arc_agents_event_logs(filepath_with_timestamp, storage_space_availa
         if "[Errno 28]" in str(e):
             storage_space_available = False
             telemetry.set_exception(exception=e, fault_type=consts.No_Storage_Space_Available_Fault_Type, summary="No space left on device")
-            shutil.rmtree(filepath_with_timestamp, ignore_errors=False, onerror=None)
+            # The logs, events and deployments are collected at the same time, the folder may already be removed
+            shutil.rmtree(filepath_with_timestamp, ignore_errors=True)
         else:
             logger.warning("An exception has occured while trying to fetch the events occured in azure-arc namespace from the cluster. Exception: {}".format(str(e)) + "\n")
             telemetry.set_exception(exception=e, fault_type=consts.Fetch_Arc_Agents_Events_Logs_Failed_Fault_Type, summary="Error occured in arc agents events logger")
@@ -255,7 +325,8 @@ def retrieve_deployments_logs(appv1_api_instance, filepath_with_timestamp, stora
         if "[Errno 28]" in str(e):
             storage_space_available = False
             telemetry.set_exception(exception=e, fault_type=consts.No_Storage_Space_Available_Fault_Type, summary="No space left on device")
-            shutil.rmtree(filepath_with_timestamp, ignore_errors=False, onerror=None)
+            # The logs, events and deployments are collected at the same time, the folder may already be removed
+            shutil.rmtree(filepath_with_timestamp, ignore_errors=True)
         else:
             logger.warning("An exception has occured while trying to fetch the azure arc deployment logs from the cluster. Exception: {}".format(str(e)) + "\n")
             telemetry.set_exception(exception=e, fault_type=consts.Fetch_Arc_Deployment_Logs_Failed_Fault_Type, summary="Error occured in deployments logger")
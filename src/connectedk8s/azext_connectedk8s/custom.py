@@ -2215,11 +2215,14 @@ def troubleshoot(cmd, client, resource_group_name, cluster_name, kube_config=Non
         if(diagnostic_folder_status is not True):
             storage_space_available = False
 
+        # Records the time taken to collect each of the diagnostic artifacts
+        collector = troubleshootutils.DiagnosticCollector()
+
         # To store the cluster-info of the cluster in current-context
-        diagnostic_checks[consts.Fetch_Kubectl_Cluster_Info], storage_space_available = troubleshootutils.fetch_kubectl_cluster_info(filepath_with_timestamp, storage_space_available, kubectl_client_location, kube_config, kube_context)
+        diagnostic_checks[consts.Fetch_Kubectl_Cluster_Info], storage_space_available = collector.timed(consts.Fetch_Kubectl_Cluster_Info, troubleshootutils.fetch_kubectl_cluster_info, filepath_with_timestamp, storage_space_available, kubectl_client_location, kube_config, kube_context)
 
         # To store the connected cluster resource logs in the diagnostic folder
-        diagnostic_checks[consts.Fetch_Connected_Cluster_Resource], storage_space_available = troubleshootutils.fetch_connected_cluster_resource(filepath_with_timestamp, connected_cluster, storage_space_available)
+        diagnostic_checks[consts.Fetch_Connected_Cluster_Resource], storage_space_available = collector.timed(consts.Fetch_Connected_Cluster_Resource, troubleshootutils.fetch_connected_cluster_resource, filepath_with_timestamp, connected_cluster, storage_space_available)
         corev1_api_instance = kube_client.CoreV1Api()
 
         # Check if agents have been added to the cluster
@@ -2228,18 +2231,19 @@ def troubleshoot(cmd, client, resource_group_name, cluster_name, kube_config=Non
         # To verify if arc agents have been added to the cluster
         if arc_agents_pod_list.items:
 
-            # For storing all the agent logs using the CoreV1Api
-            diagnostic_checks[consts.Retrieve_Arc_Agents_Logs], storage_space_available = troubleshootutils.retrieve_arc_agents_logs(corev1_api_instance, filepath_with_timestamp, storage_space_available)
-
-            # For storing all arc agents events logs
-            diagnostic_checks[consts.Retrieve_Arc_Agents_Event_Logs], storage_space_available = troubleshootutils.retrieve_arc_agents_event_logs(filepath_with_timestamp, storage_space_available, kubectl_client_location, kube_config, kube_context)
-
-            # For storing all the deployments logs using the AppsV1Api
+            # Storing all the agent logs using the CoreV1Api, the arc agents events logs and the deployments logs using the AppsV1Api at the same time
             appv1_api_instance = kube_client.AppsV1Api()
-            diagnostic_checks[consts.Retrieve_Deployments_Logs], storage_space_available = troubleshootutils.retrieve_deployments_logs(appv1_api_instance, filepath_with_timestamp, storage_space_available)
+            collected_logs = collector.run_concurrently([
+                (consts.Retrieve_Arc_Agents_Logs, troubleshootutils.retrieve_arc_agents_logs, (corev1_api_instance, filepath_with_timestamp, storage_space_available, collector)),
+                (consts.Retrieve_Arc_Agents_Event_Logs, troubleshootutils.retrieve_arc_agents_event_logs, (filepath_with_timestamp, storage_space_available, kubectl_client_location, kube_config, kube_context)),
+                (consts.Retrieve_Deployments_Logs, troubleshootutils.retrieve_deployments_logs, (appv1_api_instance, filepath_with_timestamp, storage_space_available))
+            ])
+            for check_name, (check_result, check_storage_space_available) in zip([consts.Retrieve_Arc_Agents_Logs, consts.Retrieve_Arc_Agents_Event_Logs, consts.Retrieve_Deployments_Logs], collected_logs):
+                diagnostic_checks[check_name] = check_result
+                storage_space_available = storage_space_available and check_storage_space_available
 
             # Check for the azure arc agent states
-            diagnostic_checks[consts.Arc_Agent_State_Check], storage_space_available, all_agents_stuck, probable_sufficient_resource_for_agents = troubleshootutils.check_agent_state(corev1_api_instance, filepath_with_timestamp, storage_space_available)
+            diagnostic_checks[consts.Arc_Agent_State_Check], storage_space_available, all_agents_stuck, probable_sufficient_resource_for_agents = collector.timed(consts.Arc_Agent_State_Check, troubleshootutils.check_agent_state, corev1_api_instance, filepath_with_timestamp, storage_space_available)
 
             # Check for msi certificate
             if all_agents_stuck is False:
@@ -2287,9 +2291,10 @@ def troubleshoot(cmd, client, resource_group_name, cluster_name, kube_config=Non
 
         batchv1_api_instance = kube_client.BatchV1Api()
         # Performing diagnoser container check
-        diagnostic_checks[consts.Diagnoser_Check], storage_space_available = troubleshootutils.check_diagnoser_container(corev1_api_instance, batchv1_api_instance, filepath_with_timestamp, storage_space_available, absolute_path, probable_sufficient_resource_for_agents, helm_client_location, kubectl_client_location, release_namespace, diagnostic_checks[consts.KAP_Security_Policy_Check], kube_config, kube_context)
+        diagnostic_checks[consts.Diagnoser_Check], storage_space_available = collector.timed(consts.Diagnoser_Check, troubleshootutils.check_diagnoser_container, corev1_api_instance, batchv1_api_instance, filepath_with_timestamp, storage_space_available, absolute_path, probable_sufficient_resource_for_agents, helm_client_location, kubectl_client_location, release_namespace, diagnostic_checks[consts.KAP_Security_Policy_Check], kube_config, kube_context)
 
-        # Adding cli output to the logs
+        # Adding the collection timings and the cli output to the logs
+        collector.save_timings(filepath_with_timestamp, storage_space_available)
         diagnostic_checks[consts.Storing_Diagnoser_Results_Logs] = utils.fetching_cli_output_logs(filepath_with_timestamp, storage_space_available, 1)
 
         # If all the checks passed then display no error found
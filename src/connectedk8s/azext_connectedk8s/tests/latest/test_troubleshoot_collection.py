@@ -0,0 +1,112 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+
+import azext_connectedk8s._constants as consts
+import azext_connectedk8s._troubleshootutils as troubleshootutils
+
+
+class FakeLogResponse:
+
+    def __init__(self, content, barrier=None):
+        self.content = content
+        self.barrier = barrier
+        self.released = False
+
+    def stream(self, amt):
+        if self.barrier:
+            # fails unless all the logs are downloaded at the same time
+            self.barrier.wait()
+        # the kubernetes client returns the log in chunks when the content is not preloaded
+        for start in range(0, len(self.content), amt):
+            yield self.content[start:start + amt]
+
+    def release_conn(self):
+        self.released = True
+
+
+class FakeCoreV1Api:
+
+    def __init__(self, pods, log_line_count=1000):
+        self.pods = pods
+        self.log_line_count = log_line_count
+        running_containers = sum(len(containers) for _, phase, containers in pods if phase == 'Running')
+        self.barrier = threading.Barrier(running_containers, timeout=5) if running_containers > 1 else None
+        self.responses = []
+
+    def list_namespaced_pod(self, namespace):
+        items = [SimpleNamespace(metadata=SimpleNamespace(name=name), status=SimpleNamespace(phase=phase),
+                                 spec=SimpleNamespace(containers=[SimpleNamespace(name=container) for container in containers]))
+                 for name, phase, containers in self.pods]
+        return SimpleNamespace(items=items)
+
+    def read_namespaced_pod_log(self, name, container, namespace, limit_bytes=None, _preload_content=True):
+        assert not _preload_content
+        content = "{}/{} log line\n".format(name, container).encode() * self.log_line_count
+        response = FakeLogResponse(content[:limit_bytes], self.barrier)
+        self.responses.append(response)
+        return response
+
+
+class TroubleshootCollectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_retrieve_arc_agents_logs(self):
+        api = FakeCoreV1Api([('clusterconnect-agent', 'Running', ['proxy', 'agent']),
+                             ('config-agent', 'Running', ['config-agent', 'fluent-bit']),
+                             ('metrics-agent', 'Pending', ['metrics-agent'])])
+        collector = troubleshootutils.DiagnosticCollector()
+
+        # the four container logs are downloaded at the same time
+        result, storage_space_available = troubleshootutils.retrieve_arc_agents_logs(api, self.folder, True, collector)
+
+        self.assertEqual(result, consts.Diagnostic_Check_Passed)
+        self.assertTrue(storage_space_available)
+        self.assertTrue(all(response.released for response in api.responses))
+        log_path = os.path.join(self.folder, consts.Arc_Agents_Logs, 'config-agent', 'fluent-bit.txt.gz')
+        with gzip.open(log_path, 'rb') as log_file:
+            self.assertEqual(log_file.read(), b'config-agent/fluent-bit log line\n' * 1000)
+        # no logs for the agents which are not running
+        self.assertEqual(os.listdir(os.path.join(self.folder, consts.Arc_Agents_Logs, 'metrics-agent')), [])
+        self.assertEqual(len(collector.timings), 4)
+
+        collector.save_timings(self.folder, storage_space_available)
+        with open(os.path.join(self.folder, consts.Arc_Diagnostic_Collection_Timings)) as timings_file:
+            self.assertIn('{}/config-agent/fluent-bit'.format(consts.Arc_Agents_Logs), timings_file.read())
+
+    def test_stream_container_log_truncated(self):
+        api = FakeCoreV1Api([])
+        log_path = os.path.join(self.folder, 'agent.txt.gz')
+        bytes_written = troubleshootutils.stream_container_log(api, 'config-agent', 'agent', log_path, max_bytes=100)
+        self.assertEqual(bytes_written, 100)
+        with gzip.open(log_path, 'rb') as log_file:
+            content = log_file.read()
+        self.assertTrue(content.startswith(b'config-agent/agent log line\n'))
+        self.assertTrue(content.endswith(b'[Log truncated after 100 bytes]\n'))
+
+    def test_stream_container_log_of_max_bytes(self):
+        api = FakeCoreV1Api([], log_line_count=4)
+        log_path = os.path.join(self.folder, 'agent.txt.gz')
+        max_bytes = len(b'config-agent/agent log line\n') * 4
+        bytes_written = troubleshootutils.stream_container_log(api, 'config-agent', 'agent', log_path, max_bytes=max_bytes)
+        self.assertEqual(bytes_written, max_bytes)
+        with gzip.open(log_path, 'rb') as log_file:
+            self.assertEqual(log_file.read(), b'config-agent/agent log line\n' * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,12 @@
 import tarfile
 import os
 import re
+import stat
 import codecs
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from io import open
 import requests
 from knack.log import get_logger
@@ -19,6 +24,10 @@ from azure.cli.command_modules.acr._constants import TASK_VALID_VSTS_URLS
 
 logger = get_logger(__name__)
 
+GZIP_COMPRESS_LEVEL = 9
+GZIP_BLOCK_SIZE = 1024 * 1024
+MAX_COMPRESSION_WORKERS = 4
+
 
 def upload_source_code(cmd, client,
                        registry_name,
@@ -30,7 +39,8 @@ def upload_source_code(cmd, client,
     _pack_source_code(source_location,
                       tar_file_path,
                       docker_file_path,
-                      docker_file_in_tar)
+                      docker_file_in_tar,
+                      compression_workers=get_compression_workers(cmd.cli_ctx))
 
     size = os.path.getsize(tar_file_path)
     unit = 'GiB'
@@ -69,17 +79,30 @@ def upload_source_code(cmd, client,
     return relative_path
 
 
-def _pack_source_code(source_location, tar_file_path, docker_file_path, docker_file_in_tar):
+def get_compression_workers(cli_ctx):
+    """
+    Number of threads compressing the packed source, 1 unless set with 'az config set containerapp.compression_workers=<n>'
+    or AZURE_CONTAINERAPP_COMPRESSION_WORKERS.
+    """
+    try:
+        return max(1, cli_ctx.config.getint('containerapp', 'compression_workers', fallback=1))
+    except ValueError:
+        logger.warning("Ignoring the invalid containerapp.compression_workers setting, it must be a number.")
+        return 1
+
+
+def _pack_source_code(source_location, tar_file_path, docker_file_path, docker_file_in_tar, compression_workers=1):
     logger.info("Packing source code into tar to upload...")
 
     original_docker_file_name = os.path.basename(docker_file_path.replace("\\", os.sep))
     ignore_list, ignore_list_size = _load_dockerignore_file(source_location, original_docker_file_name)
+    ignore_matcher = IgnoreMatcher(ignore_list)
     common_vcs_ignore_list = {'.git', '.gitignore', '.bzr', 'bzrignore', '.hg', '.hgignore', '.svn'}
 
-    def _ignore_check(tarinfo, parent_ignored, parent_matching_rule_index):
+    def _ignore_check(name, parent_ignored, parent_matching_rule_index):
         # ignore common vcs dir or file
-        if tarinfo.name in common_vcs_ignore_list:
-            logger.info("Excluding '%s' based on default ignore rules", tarinfo.name)
+        if name in common_vcs_ignore_list:
+            logger.info("Excluding '%s' based on default ignore rules", name)
             return True, parent_matching_rule_index
 
         if ignore_list is None:
@@ -87,29 +110,28 @@ def _pack_source_code(source_location, tar_file_path, docker_file_path, docker_f
             # eg, it will ignore the files under .git folder.
             return parent_ignored, parent_matching_rule_index
 
-        for index, item in enumerate(ignore_list):
-            # stop checking the remaining rules whose priorities are lower than the parent matching rule
-            # at this point, current item should just inherit from parent
-            if index >= parent_matching_rule_index:
-                break
-            if re.match(item.pattern, tarinfo.name):
-                logger.debug(".dockerignore: rule '%s' matches '%s'.",
-                             item.rule, tarinfo.name)
-                return item.ignore, index
+        # stop checking the remaining rules whose priorities are lower than the parent matching rule
+        # at this point, current item should just inherit from parent
+        index = ignore_matcher.match(name, parent_matching_rule_index)
+        if index is not None:
+            logger.debug(".dockerignore: rule '%s' matches '%s'.",
+                         ignore_list[index].rule, name)
+            return ignore_list[index].ignore, index
 
         logger.debug(".dockerignore: no rule for '%s'. parent ignore '%s'",
-                     tarinfo.name, parent_ignored)
+                     name, parent_ignored)
         # inherit from parent
         return parent_ignored, parent_matching_rule_index
 
-    with tarfile.open(tar_file_path, "w:gz") as tar:
+    with _open_tar_gz(tar_file_path, compression_workers) as tar:
         # need to set arcname to empty string as the archive root path
         _archive_file_recursively(tar,
                                   source_location,
                                   arcname="",
                                   parent_ignored=False,
                                   parent_matching_rule_index=ignore_list_size,
-                                  ignore_check=_ignore_check)
+                                  ignore_check=_ignore_check,
+                                  can_include_under=ignore_matcher.can_include_under)
 
         # Add the Dockerfile if it's specified.
         # In the case of run, there will be no Dockerfile.
@@ -137,6 +159,7 @@ class IgnoreRule:  # pylint: disable=too-few-public-methods
         self.pattern = "^"
         tokens = rule.split('/')
         token_length = len(tokens)
+        self.tokens = tokens
         for index, token in enumerate(tokens, 1):
             # ** matches any number of directories
             if token == "**":
@@ -188,18 +211,78 @@ def _load_dockerignore_file(source_location, original_docker_file_name):
     return ignore_list, len(ignore_list)
 
 
-def _archive_file_recursively(tar, name, arcname, parent_ignored, parent_matching_rule_index, ignore_check):
-    # create a TarInfo object from the file
-    tarinfo = tar.gettarinfo(name, arcname)
-
-    if tarinfo is None:
-        raise CLIInternalError("tarfile: unsupported type {}".format(name))
-
+class IgnoreMatcher:
+    """
+    The ignore rules compiled into a single regular expression. The rules are ordered by priority and the first one
+    matching a path is the one which applies, as when checking them one by one.
+    """
+
+    def __init__(self, ignore_list):
+        self.ignore_list = ignore_list or []
+        self._regex = None
+        if self.ignore_list:
+            try:
+                self._regex = re.compile('|'.join('(?P<rule{}>{})'.format(index, item.pattern)
+                                                  for index, item in enumerate(self.ignore_list)))
+            except re.error:
+                # the rules which are not valid expressions on their own are reported when checking them one by one
+                logger.debug("Unable to combine the ignore rules, checking them one by one.")
+        # the rules making exceptions to exclusions, with the path segments they match
+        self._include_rules = [(index, item.tokens) for index, item in enumerate(self.ignore_list) if not item.ignore]
+
+    def match(self, name, max_index):
+        """Index of the rule of highest priority matching the path among the rules before max_index, or None"""
+        if self._regex is not None:
+            result = self._regex.match(name)
+            if result is None:
+                return None
+            index = int(result.lastgroup[len('rule'):])
+            return index if index < max_index else None
+        for index, item in enumerate(self.ignore_list[:max_index]):
+            if re.match(item.pattern, name):
+                return index
+        return None
+
+    def can_include_under(self, name, max_index):
+        """Whether a rule before max_index could include back a path under the ignored directory"""
+        segments = name.split('/')
+        for index, tokens in self._include_rules:
+            if index >= max_index:
+                break
+            if _tokens_can_match_under(tokens, segments):
+                return True
+        return False
+
+
+def _tokens_can_match_under(tokens, segments):
+    for position, segment in enumerate(segments):
+        if position >= len(tokens) - 1:
+            # the rule only matches paths as deep as the directory itself
+            return tokens[position:] == ['**'] if position < len(tokens) else False
+        if tokens[position] == '**':
+            return True
+        token_pattern = tokens[position].replace("*", "[^/]*").replace("?", "[^/]").replace(".", "\\.")
+        try:
+            if not re.match(token_pattern + "$", segment):
+                return False
+        except re.error:
+            return True
+    return True
+
+
+def _archive_file_recursively(tar, name, arcname, parent_ignored, parent_matching_rule_index, ignore_check,
+                              can_include_under=None, is_dir=None):
     # check if the file/dir is ignored
     ignored, matching_rule_index = ignore_check(
-        tarinfo, parent_ignored, parent_matching_rule_index)
+        arcname, parent_ignored, parent_matching_rule_index)
 
     if not ignored:
+        # create a TarInfo object from the file
+        tarinfo = tar.gettarinfo(name, arcname)
+
+        if tarinfo is None:
+            raise CLIInternalError("tarfile: unsupported type {}".format(name))
+
         # append the tar header and data to the archive
         if tarinfo.isreg():
             with open(name, "rb") as f:
@@ -207,12 +290,77 @@ def _archive_file_recursively(tar, name, arcname, parent_ignored, parent_matchin
         else:
             tar.addfile(tarinfo)
 
+    if is_dir is None:
+        is_dir = stat.S_ISDIR(os.lstat(name).st_mode)
+    if not is_dir:
+        return
+
     # even the dir is ignored, its child items can still be included, so continue to scan
-    if tarinfo.isdir():
-        for f in os.listdir(name):
-            _archive_file_recursively(tar, os.path.join(name, f), os.path.join(arcname, f),
+    # unless no rule can include them back
+    if ignored and can_include_under and not can_include_under(arcname, matching_rule_index):
+        logger.debug("Excluding the content of '%s'", arcname)
+        return
+    with os.scandir(name) as entries:
+        for entry in entries:
+            _archive_file_recursively(tar, entry.path, arcname + "/" + entry.name if arcname else entry.name,
                                       parent_ignored=ignored, parent_matching_rule_index=matching_rule_index,
-                                      ignore_check=ignore_check)
+                                      ignore_check=ignore_check, can_include_under=can_include_under,
+                                      is_dir=entry.is_dir(follow_symlinks=False))
+
+
+def _gzip_block(block):
+    compressor = zlib.compressobj(GZIP_COMPRESS_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(block) + compressor.flush()
+
+
+class ParallelGzipWriter:
+    """
+    Write-only file object compressing the data in blocks on several threads. Each block is written as a member of
+    the gzip file, which gzip readers read as a single stream.
+    """
+
+    def __init__(self, fileobj, workers, block_size=GZIP_BLOCK_SIZE):
+        self._fileobj = fileobj
+        self._block_size = block_size
+        self._buffer = bytearray()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        # the compressed blocks are written in order, at most two blocks per worker are kept in memory
+        self._pending = deque()
+        self._max_pending = 2 * workers
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            self._submit(bytes(self._buffer[:self._block_size]))
+            del self._buffer[:self._block_size]
+        return len(data)
+
+    def _submit(self, block):
+        self._pending.append(self._executor.submit(_gzip_block, block))
+        while len(self._pending) > self._max_pending:
+            self._fileobj.write(self._pending.popleft().result())
+
+    def close(self):
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self._fileobj.write(self._pending.popleft().result())
+        self._executor.shutdown()
+
+
+@contextmanager
+def _open_tar_gz(tar_file_path, compression_workers):
+    # a single gzip stream by default, the parallel compression is opt-in
+    if compression_workers <= 1:
+        with tarfile.open(tar_file_path, "w:gz", compresslevel=GZIP_COMPRESS_LEVEL) as tar:
+            yield tar
+        return
+    with open(tar_file_path, "wb") as f:
+        writer = ParallelGzipWriter(f, min(compression_workers, MAX_COMPRESSION_WORKERS))
+        with tarfile.open(fileobj=writer, mode="w|") as tar:
+            yield tar
+        writer.close()
 
 
 def check_remote_source_code(source_location):
@@ -7,10 +7,14 @@
 import json
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from urllib.parse import quote
 
 from azure.cli.core.util import send_raw_request
 from azure.cli.core.commands.client_factory import get_subscription_id
 from knack.log import get_logger
+from msrestazure.tools import parse_resource_id
 
 logger = get_logger(__name__)
 
@@ -20,6 +24,55 @@ POLLING_TIMEOUT = 600  # how many seconds before exiting
 POLLING_SECONDS = 2  # how many seconds between requests
 POLLING_TIMEOUT_FOR_MANAGED_CERTIFICATE = 1500  # how many seconds before exiting
 POLLING_INTERVAL_FOR_MANAGED_CERTIFICATE = 4  # how many seconds between requests
+RESOURCES_API_VERSION = "2021-04-01"
+MAX_CONCURRENT_LIST_REQUESTS = 8
+
+
+def _get_page(cmd, request_url):
+    r = send_raw_request(cmd.cli_ctx, "GET", request_url)
+    return r.json()
+
+
+def _iter_pages(cmd, request_url, formatter=lambda x: x):
+    """Yield the items of a list operation as its pages arrive, the next page being requested while the
+    items of the current one are consumed."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_page = executor.submit(_get_page, cmd, request_url)
+        while next_page is not None:
+            j = next_page.result()
+            next_page = executor.submit(_get_page, cmd, j["nextLink"]) if j.get("nextLink") else None
+            for item in j["value"]:
+                yield formatter(item)
+
+
+def _iter_pages_concurrently(cmd, request_urls, formatter=lambda x: x, max_workers=MAX_CONCURRENT_LIST_REQUESTS):
+    """Yield the items of several list operations in the order their pages arrive, the list operations
+    following their nextLink concurrently."""
+    if not request_urls:
+        return
+    pages = Queue()
+
+    def _list(request_url):
+        try:
+            while request_url:
+                j = _get_page(cmd, request_url)
+                pages.put(j["value"])
+                request_url = j.get("nextLink")
+        finally:
+            pages.put(None)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(request_urls))) as executor:
+        futures = [executor.submit(_list, request_url) for request_url in request_urls]
+        remaining = len(futures)
+        while remaining:
+            items = pages.get()
+            if items is None:
+                remaining -= 1
+                continue
+            for item in items:
+                yield formatter(item)
+        for future in futures:
+            future.result()
 
 
 class PollingAnimation():
@@ -183,8 +236,10 @@ class ContainerAppClient():
 
     @classmethod
     def list_by_subscription(cls, cmd, formatter=lambda x: x):
-        app_list = []
+        return list(cls.iter_by_subscription(cmd, formatter))
 
+    @classmethod
+    def iter_by_subscription(cls, cmd, formatter=lambda x: x):
         management_hostname = cmd.cli_ctx.cloud.endpoints.resource_manager
         api_version = CURRENT_API_VERSION
         sub_id = get_subscription_id(cmd.cli_ctx)
@@ -195,50 +250,58 @@ class ContainerAppClient():
 
         r = send_raw_request(cmd.cli_ctx, "GET", request_url)
         j = r.json()
+        listed_app_ids = set()
         for app in j["value"]:
-            formatted = formatter(app)
-            app_list.append(formatted)
-
-        while j.get("nextLink") is not None:
-            request_url = j["nextLink"]
-            r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-            j = r.json()
-            for app in j["value"]:
-                formatted = formatter(app)
-                app_list.append(formatted)
-
-        return app_list
+            listed_app_ids.add(app["id"].lower())
+            yield formatter(app)
+
+        if j.get("nextLink") is None:
+            return
+
+        # the apps don't fit in a single page: instead of following the nextLink of the subscription one page
+        # at a time, list the apps of the resource groups containing some concurrently. The resource groups come
+        # from the generic resources list, which needs the read permission on the subscription's resources and
+        # whose index can lag behind, so the resource groups of the first page are listed too and the nextLink
+        # is followed as before when the resources can't be listed.
+        request_url = "{}/subscriptions/{}/resources?$filter={}&$top=1000&api-version={}".format(
+            management_hostname.strip('/'),
+            sub_id,
+            quote("resourceType eq 'Microsoft.App/containerApps'"),
+            RESOURCES_API_VERSION)
+        try:
+            resource_ids = [resource["id"] for resource in _iter_pages(cmd, request_url)]
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Failed to list the container app resources, following the nextLink instead: %s", e)
+            yield from _iter_pages(cmd, j["nextLink"], formatter)
+            return
+        resource_group_names = sorted({parse_resource_id(resource_id)["resource_group"].lower()
+                                       for resource_id in resource_ids + [app["id"] for app in j["value"]]})
+        request_urls = [cls._get_list_by_resource_group_url(cmd, resource_group_name)
+                        for resource_group_name in resource_group_names]
+        for app in _iter_pages_concurrently(cmd, request_urls):
+            if app["id"].lower() not in listed_app_ids:
+                yield formatter(app)
 
     @classmethod
     def list_by_resource_group(cls, cmd, resource_group_name, formatter=lambda x: x):
-        app_list = []
+        return list(cls.iter_by_resource_group(cmd, resource_group_name, formatter))
+
+    @classmethod
+    def iter_by_resource_group(cls, cmd, resource_group_name, formatter=lambda x: x):
+        return _iter_pages(cmd, cls._get_list_by_resource_group_url(cmd, resource_group_name), formatter)
 
+    @classmethod
+    def _get_list_by_resource_group_url(cls, cmd, resource_group_name):
         management_hostname = cmd.cli_ctx.cloud.endpoints.resource_manager
         api_version = CURRENT_API_VERSION
         sub_id = get_subscription_id(cmd.cli_ctx)
         url_fmt = "{}/subscriptions/{}/resourceGroups/{}/providers/Microsoft.App/containerApps?api-version={}"
-        request_url = url_fmt.format(
+        return url_fmt.format(
             management_hostname.strip('/'),
             sub_id,
             resource_group_name,
             api_version)
 
-        r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-        j = r.json()
-        for app in j["value"]:
-            formatted = formatter(app)
-            app_list.append(formatted)
-
-        while j.get("nextLink") is not None:
-            request_url = j["nextLink"]
-            r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-            j = r.json()
-            for app in j["value"]:
-                formatted = formatter(app)
-                app_list.append(formatted)
-
-        return app_list
-
     @classmethod
     def list_secrets(cls, cmd, resource_group_name, name):
 
@@ -259,8 +322,6 @@ class ContainerAppClient():
     @classmethod
     def list_revisions(cls, cmd, resource_group_name, name, formatter=lambda x: x):
 
-        revisions_list = []
-
         management_hostname = cmd.cli_ctx.cloud.endpoints.resource_manager
         api_version = CURRENT_API_VERSION
         sub_id = get_subscription_id(cmd.cli_ctx)
@@ -272,21 +333,7 @@ class ContainerAppClient():
             name,
             api_version)
 
-        r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-        j = r.json()
-        for app in j["value"]:
-            formatted = formatter(app)
-            revisions_list.append(formatted)
-
-        while j.get("nextLink") is not None:
-            request_url = j["nextLink"]
-            r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-            j = r.json()
-            for app in j["value"]:
-                formatted = formatter(app)
-                revisions_list.append(formatted)
-
-        return revisions_list
+        return list(_iter_pages(cmd, request_url, formatter))
 
     @classmethod
     def show_revision(cls, cmd, resource_group_name, container_app_name, name):
@@ -358,8 +405,6 @@ class ContainerAppClient():
 
     @classmethod
     def list_replicas(cls, cmd, resource_group_name, container_app_name, revision_name):
-        replica_list = []
-
         management_hostname = cmd.cli_ctx.cloud.endpoints.resource_manager
         sub_id = get_subscription_id(cmd.cli_ctx)
         url_fmt = "{}/subscriptions/{}/resourceGroups/{}/providers/Microsoft.App/containerApps/{}/revisions/{}/replicas?api-version={}"
@@ -371,19 +416,7 @@ class ContainerAppClient():
             revision_name,
             CURRENT_API_VERSION)
 
-        r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-        j = r.json()
-        for replica in j["value"]:
-            replica_list.append(replica)
-
-        while j.get("nextLink") is not None:
-            request_url = j["nextLink"]
-            r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-            j = r.json()
-            for replica in j["value"]:
-                replica_list.append(replica)
-
-        return replica_list
+        return list(_iter_pages(cmd, request_url))
 
     @classmethod
     def get_replica(cls, cmd, resource_group_name, container_app_name, revision_name, replica_name):
@@ -546,8 +579,6 @@ class ManagedEnvironmentClient():
 
     @classmethod
     def list_by_subscription(cls, cmd, formatter=lambda x: x):
-        env_list = []
-
         management_hostname = cmd.cli_ctx.cloud.endpoints.resource_manager
         api_version = CURRENT_API_VERSION
         sub_id = get_subscription_id(cmd.cli_ctx)
@@ -556,26 +587,10 @@ class ManagedEnvironmentClient():
             sub_id,
             api_version)
 
-        r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-        j = r.json()
-        for env in j["value"]:
-            formatted = formatter(env)
-            env_list.append(formatted)
-
-        while j.get("nextLink") is not None:
-            request_url = j["nextLink"]
-            r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-            j = r.json()
-            for env in j["value"]:
-                formatted = formatter(env)
-                env_list.append(formatted)
-
-        return env_list
+        return list(_iter_pages(cmd, request_url, formatter))
 
     @classmethod
     def list_by_resource_group(cls, cmd, resource_group_name, formatter=lambda x: x):
-        env_list = []
-
         management_hostname = cmd.cli_ctx.cloud.endpoints.resource_manager
         api_version = CURRENT_API_VERSION
         sub_id = get_subscription_id(cmd.cli_ctx)
@@ -586,21 +601,7 @@ class ManagedEnvironmentClient():
             resource_group_name,
             api_version)
 
-        r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-        j = r.json()
-        for env in j["value"]:
-            formatted = formatter(env)
-            env_list.append(formatted)
-
-        while j.get("nextLink") is not None:
-            request_url = j["nextLink"]
-            r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-            j = r.json()
-            for env in j["value"]:
-                formatted = formatter(env)
-                env_list.append(formatted)
-
-        return env_list
+        return list(_iter_pages(cmd, request_url, formatter))
 
     @classmethod
     def show_certificate(cls, cmd, resource_group_name, name, certificate_name):
@@ -977,8 +978,6 @@ class DaprComponentClient():
 
     @classmethod
     def list(cls, cmd, resource_group_name, environment_name, formatter=lambda x: x):
-        app_list = []
-
         management_hostname = cmd.cli_ctx.cloud.endpoints.resource_manager
         api_version = CURRENT_API_VERSION
         sub_id = get_subscription_id(cmd.cli_ctx)
@@ -989,21 +988,7 @@ class DaprComponentClient():
             environment_name,
             api_version)
 
-        r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-        j = r.json()
-        for app in j["value"]:
-            formatted = formatter(app)
-            app_list.append(formatted)
-
-        while j.get("nextLink") is not None:
-            request_url = j["nextLink"]
-            r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-            j = r.json()
-            for app in j["value"]:
-                formatted = formatter(app)
-                app_list.append(formatted)
-
-        return app_list
+        return list(_iter_pages(cmd, request_url, formatter))
 
 
 class StorageClient():
@@ -1093,8 +1078,6 @@ class StorageClient():
 
     @classmethod
     def list(cls, cmd, resource_group_name, env_name, formatter=lambda x: x):
-        env_list = []
-
         management_hostname = cmd.cli_ctx.cloud.endpoints.resource_manager
         api_version = CURRENT_API_VERSION
         sub_id = get_subscription_id(cmd.cli_ctx)
@@ -1106,21 +1089,7 @@ class StorageClient():
             env_name,
             api_version)
 
-        r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-        j = r.json()
-        for env in j["value"]:
-            formatted = formatter(env)
-            env_list.append(formatted)
-
-        while j.get("nextLink") is not None:
-            request_url = j["nextLink"]
-            r = send_raw_request(cmd.cli_ctx, "GET", request_url)
-            j = r.json()
-            for env in j["value"]:
-                formatted = formatter(env)
-                env_list.append(formatted)
-
-        return env_list
+        return list(_iter_pages(cmd, request_url, formatter))
 
 
 class AuthClient():
@@ -37,6 +37,8 @@ NAME_ALREADY_EXISTS = "AlreadyExists"
 
 LOG_TYPE_CONSOLE = "console"
 LOG_TYPE_SYSTEM = "system"
+LOG_STREAM_BUFFER_LINES = 1000
+MAX_CONCURRENT_REPLICA_LISTS = 8
 
 ACR_TASK_TEMPLATE = """version: v1.1.0
 steps:
@@ -179,7 +179,7 @@ helps['containerapp logs'] = """
 
 helps['containerapp logs show'] = """
     type: command
-    short-summary: Show past logs and/or print logs in real time (with the --follow parameter). Note that the logs are only taken from one revision, replica, and container (for non-system logs).
+    short-summary: Show past logs and/or print logs in real time (with the --follow parameter). Note that the logs are only taken from one revision, replica, and container (for non-system logs) unless --all-replicas is used.
     examples:
     - name: Fetch the past 20 lines of logs from an app and return
       text: |
@@ -193,6 +193,9 @@ helps['containerapp logs show'] = """
     - name: Fetch logs for a particular revision, replica, and container
       text: |
           az containerapp logs show -n MyContainerapp -g MyResourceGroup --replica MyReplica --revision MyRevision --container MyContainer
+    - name: Print the logs of all the replicas of the active revisions as they come in
+      text: |
+          az containerapp logs show -n MyContainerapp -g MyResourceGroup --all-replicas --follow --format text
 """
 
 # Replica Commands
@@ -50,6 +50,7 @@ def load_arguments(self, _):
         c.argument('name', name_type, id_part=None, help="The name of the Containerapp.")
         c.argument('resource_group_name', arg_type=resource_group_name_type, id_part=None)
         c.argument('kind', options_list=["--type", "-t"], help="Type of logs to stream", arg_type=get_enum_type([LOG_TYPE_CONSOLE, LOG_TYPE_SYSTEM]), default=LOG_TYPE_CONSOLE)
+        c.argument('all_replicas', help="Stream the logs of all the replicas and their containers at the same time, each line prefixed by its replica and container. Defaults to the replicas of the active revisions.", arg_type=get_three_state_flag())
 
     with self.argument_context('containerapp env logs show') as c:
         c.argument('follow', help="Print logs in real time if present.", arg_type=get_three_state_flag())
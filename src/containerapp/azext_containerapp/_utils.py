@@ -1621,3 +1621,16 @@ def certificate_thumbprint_matches(certificate_object, thumbprint=None):
 
 def certificate_matches(certificate_object, location=None, thumbprint=None):
     return certificate_location_matches(certificate_object, location) and certificate_thumbprint_matches(certificate_object, thumbprint)
+
+
+# the logstream API returns some unicode special characters escaped (may need to add more in the future)
+LOG_LINE_ESCAPES = (("\\u0022", "\u0022"), ("\\u001B", "\u001B"), ("\\u002B", "\u002B"), ("\\u0027", "\u0027"))
+
+
+def unescape_log_line(line):
+    # needed to display color/quotations properly, most lines have nothing to unescape
+    if "\\u" not in line:
+        return line
+    for escape, character in LOG_LINE_ESCAPES:
+        line = line.replace(escape, character)
+    return line
@@ -196,7 +196,11 @@ def _validate_container_exists(cmd, namespace):
 
 # also used to validate logstream
 def validate_ssh(cmd, namespace):
-    if not hasattr(namespace, "kind") or (namespace.kind and namespace.kind.lower() != LOG_TYPE_SYSTEM):
+    if getattr(namespace, "all_replicas", False):
+        # the replicas and their containers are discovered when streaming the logs
+        if namespace.revision:
+            _validate_revision_exists(cmd, namespace)
+    elif not hasattr(namespace, "kind") or (namespace.kind and namespace.kind.lower() != LOG_TYPE_SYSTEM):
         _set_ssh_defaults(cmd, namespace)
         _validate_revision_exists(cmd, namespace)
         _validate_replica_exists(cmd, namespace)
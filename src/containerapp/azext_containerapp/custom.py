@@ -7,6 +7,9 @@
 import threading
 import sys
 import time
+import json
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty
 from urllib.parse import urlparse
 import requests
 
@@ -70,14 +73,14 @@ from ._utils import (_validate_subscription_registered, _ensure_location_allowed
                      create_acrpull_role_assignment, is_registry_msi_system, clean_null_values, _populate_secret_values,
                      validate_environment_location, safe_set, parse_metadata_flags, parse_auth_flags, _azure_monitor_quickstart,
                      set_ip_restrictions, certificate_location_matches, certificate_matches, generate_randomized_managed_cert_name,
-                     check_managed_cert_name_availability, prepare_managed_certificate_envelop)
+                     check_managed_cert_name_availability, prepare_managed_certificate_envelop, unescape_log_line)
 from ._validators import validate_create, validate_revision_suffix
 from ._ssh_utils import (SSH_DEFAULT_ENCODING, WebSocketConnection, read_ssh, get_stdin_writer, SSH_CTRL_C_MSG,
                          SSH_BACKUP_ENCODING)
 from ._constants import (MAXIMUM_SECRET_LENGTH, MICROSOFT_SECRET_SETTING_NAME, FACEBOOK_SECRET_SETTING_NAME, GITHUB_SECRET_SETTING_NAME,
                          GOOGLE_SECRET_SETTING_NAME, TWITTER_SECRET_SETTING_NAME, APPLE_SECRET_SETTING_NAME, CONTAINER_APPS_RP,
                          NAME_INVALID, NAME_ALREADY_EXISTS, ACR_IMAGE_SUFFIX, HELLO_WORLD_IMAGE, LOG_TYPE_SYSTEM, LOG_TYPE_CONSOLE,
-                         MANAGED_CERTIFICATE_RT, PRIVATE_CERTIFICATE_RT, PENDING_STATUS, SUCCEEDED_STATUS)
+                         LOG_STREAM_BUFFER_LINES, MAX_CONCURRENT_REPLICA_LISTS, MANAGED_CERTIFICATE_RT, PRIVATE_CERTIFICATE_RT, PENDING_STATUS, SUCCEEDED_STATUS)
 
 logger = get_logger(__name__)
 
@@ -964,21 +967,21 @@ def list_containerapp(cmd, resource_group_name=None, managed_env=None):
     _validate_subscription_registered(cmd, CONTAINER_APPS_RP)
 
     try:
-        containerapps = []
         if resource_group_name is None:
-            containerapps = ContainerAppClient.list_by_subscription(cmd=cmd)
+            containerapps = ContainerAppClient.iter_by_subscription(cmd=cmd)
         else:
-            containerapps = ContainerAppClient.list_by_resource_group(cmd=cmd, resource_group_name=resource_group_name)
+            containerapps = ContainerAppClient.iter_by_resource_group(cmd=cmd, resource_group_name=resource_group_name)
 
+        # the apps are filtered as their pages arrive rather than after listing all of them
         if managed_env:
             env_name = parse_resource_id(managed_env)["name"].lower()
             if "resource_group" in parse_resource_id(managed_env):
                 ManagedEnvironmentClient.show(cmd, parse_resource_id(managed_env)["resource_group"], parse_resource_id(managed_env)["name"])
-                containerapps = [c for c in containerapps if c["properties"]["managedEnvironmentId"].lower() == managed_env.lower()]
+                containerapps = (c for c in containerapps if c["properties"]["managedEnvironmentId"].lower() == managed_env.lower())
             else:
-                containerapps = [c for c in containerapps if parse_resource_id(c["properties"]["managedEnvironmentId"])["name"].lower() == env_name]
+                containerapps = (c for c in containerapps if parse_resource_id(c["properties"]["managedEnvironmentId"])["name"].lower() == env_name)
 
-        return containerapps
+        return list(containerapps)
     except CLIError as e:
         handle_raw_exception(e)
 
@@ -2544,15 +2547,17 @@ def containerapp_ssh(cmd, resource_group_name, name, container=None, revision=No
 
 
 def stream_containerapp_logs(cmd, resource_group_name, name, container=None, revision=None, replica=None, follow=False,
-                             tail=None, output_format=None, kind=None):
+                             tail=None, output_format=None, kind=None, all_replicas=False):
     if tail:
         if tail < 0 or tail > 300:
             raise ValidationError("--tail must be between 0 and 300.")
     if kind == LOG_TYPE_SYSTEM:
-        if container or replica or revision:
-            raise MutuallyExclusiveArgumentError("--type: --container, --replica, and --revision not supported for system logs")
+        if container or replica or revision or all_replicas:
+            raise MutuallyExclusiveArgumentError("--type: --container, --replica, --revision and --all-replicas not supported for system logs")
         if output_format and output_format != "json":
             raise MutuallyExclusiveArgumentError("--type: only json logs supported for system logs")
+    if all_replicas and replica:
+        raise MutuallyExclusiveArgumentError("--all-replicas cannot be used with --replica")
 
     sub = get_subscription_id(cmd.cli_ctx)
     token_response = ContainerAppClient.get_auth_token(cmd, resource_group_name, name)
@@ -2561,6 +2566,21 @@ def stream_containerapp_logs(cmd, resource_group_name, name, container=None, rev
     base_url = ContainerAppClient.show(cmd, resource_group_name, name)["properties"]["eventStreamEndpoint"]
     base_url = base_url[:base_url.index("/subscriptions/")]
 
+    request_params = {"follow": str(follow).lower(),
+                      "output": output_format,
+                      "tailLines": tail}
+    headers = {"Authorization": f"Bearer {token}"}
+
+    if all_replicas:
+        streams = [(replica_name, container_name,
+                    f"{base_url}/subscriptions/{sub}/resourceGroups/{resource_group_name}/containerApps/{name}"
+                    f"/revisions/{revision_name}/replicas/{replica_name}/containers/{container_name}/logstream")
+                   for revision_name, replica_name, container_name in _get_replica_containers(cmd, resource_group_name, name, revision, container)]
+        if not streams:
+            raise ResourceNotFoundError("Could not find a replica for this app")
+        _stream_replica_logs(streams, request_params, headers, output_format)
+        return
+
     if kind == LOG_TYPE_CONSOLE:
         url = (f"{base_url}/subscriptions/{sub}/resourceGroups/{resource_group_name}/containerApps/{name}"
                f"/revisions/{revision}/replicas/{replica}/containers/{container}/logstream")
@@ -2568,10 +2588,6 @@ def stream_containerapp_logs(cmd, resource_group_name, name, container=None, rev
         url = f"{base_url}/subscriptions/{sub}/resourceGroups/{resource_group_name}/containerApps/{name}/eventstream"
 
     logger.info("connecting to : %s", url)
-    request_params = {"follow": str(follow).lower(),
-                      "output": output_format,
-                      "tailLines": tail}
-    headers = {"Authorization": f"Bearer {token}"}
     resp = requests.get(url,
                         timeout=None,
                         stream=True,
@@ -2584,9 +2600,81 @@ def stream_containerapp_logs(cmd, resource_group_name, name, container=None, rev
     for line in resp.iter_lines():
         if line:
             logger.info("received raw log line: %s", line)
-            # these .replaces are needed to display color/quotations properly
-            # for some reason the API returns garbled unicode special characters (may need to add more in the future)
-            print(line.decode("utf-8").replace("\\u0022", "\u0022").replace("\\u001B", "\u001B").replace("\\u002B", "\u002B").replace("\\u0027", "\u0027"))
+            print(unescape_log_line(line.decode("utf-8")))
+
+
+def _get_replica_containers(cmd, resource_group_name, name, revision=None, container=None):
+    # without --revision, stream the logs of the replicas of all the active revisions
+    if revision:
+        revisions = [revision]
+    else:
+        revisions = [r["name"] for r in ContainerAppClient.list_revisions(cmd=cmd, resource_group_name=resource_group_name, name=name)
+                     if safe_get(r, "properties", "active")]
+    if not revisions:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(len(revisions), MAX_CONCURRENT_REPLICA_LISTS)) as executor:
+        revision_replicas = list(executor.map(lambda revision_name: ContainerAppClient.list_replicas(cmd=cmd,
+                                                                                                     resource_group_name=resource_group_name,
+                                                                                                     container_app_name=name,
+                                                                                                     revision_name=revision_name),
+                                              revisions))
+    return [(revision_name, replica["name"], c["name"])
+            for revision_name, replicas in zip(revisions, revision_replicas)
+            for replica in replicas
+            for c in safe_get(replica, "properties", "containers", default=[])
+            if not container or c["name"] == container]
+
+
+def _format_replica_log_line(replica, container, line, output_format):
+    if output_format == "json":
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            entry = None
+        if isinstance(entry, dict):
+            return json.dumps({"Replica": replica, "Container": container, **entry}, ensure_ascii=False)
+    return f"[{replica}/{container}] {unescape_log_line(line)}"
+
+
+def _stream_replica_logs(streams, request_params, headers, output_format):
+    # a reader thread per replica container, the lines are printed by this thread in the order they arrive
+    # so that the lines of the different replicas don't get mixed up
+    lines = Queue(maxsize=LOG_STREAM_BUFFER_LINES)
+
+    def _read_replica_logs(replica, container, url):
+        try:
+            logger.info("connecting to : %s", url)
+            resp = requests.get(url,
+                                timeout=None,
+                                stream=True,
+                                params=request_params,
+                                headers=headers)
+            if not resp.ok:
+                logger.warning("Failed to stream the logs of replica '%s' container '%s': got bad status from the logstream API: %s",
+                               replica, container, resp.status_code)
+                return
+            for line in resp.iter_lines():
+                if line:
+                    lines.put(_format_replica_log_line(replica, container, line.decode("utf-8"), output_format))
+        except requests.exceptions.RequestException as e:
+            logger.warning("Failed to stream the logs of replica '%s' container '%s': %s", replica, container, e)
+        finally:
+            lines.put(None)
+
+    for stream in streams:
+        threading.Thread(target=_read_replica_logs, args=stream, daemon=True).start()
+    remaining = len(streams)
+    while remaining:
+        try:
+            # wait with a timeout so that Ctrl+C is handled while the streams are idle
+            line = lines.get(timeout=1)
+        except Empty:
+            continue
+        if line is None:
+            remaining -= 1
+        else:
+            print(line)
 
 
 def stream_environment_logs(cmd, resource_group_name, name, follow=False, tail=None):
@@ -2619,9 +2707,7 @@ def stream_environment_logs(cmd, resource_group_name, name, follow=False, tail=N
     for line in resp.iter_lines():
         if line:
             logger.info("received raw log line: %s", line)
-            # these .replaces are needed to display color/quotations properly
-            # for some reason the API returns garbled unicode special characters (may need to add more in the future)
-            print(line.decode("utf-8").replace("\\u0022", "\u0022").replace("\\u001B", "\u001B").replace("\\u002B", "\u002B").replace("\\u0027", "\u0027"))
+            print(unescape_log_line(line.decode("utf-8")))
 
 
 def open_containerapp_in_browser(cmd, name, resource_group_name):
@@ -0,0 +1,83 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+from azext_containerapp._archive_utils import IgnoreMatcher, IgnoreRule, get_compression_workers, _pack_source_code
+
+
+def _write_files(root, files, content=b'content'):
+    for path in files:
+        path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+
+
+class ContainerappArchiveUtilsTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.source = os.path.join(self.folder, 'source')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_ignore_matcher(self):
+        # the rule at the end of .dockerignore has the highest priority
+        rules = ['node_modules', '*.log', 'build/**', '!build/keep.txt', '!important.log']
+        ignore_list = [IgnoreRule(rule) for rule in reversed(rules)]
+        matcher = IgnoreMatcher(ignore_list)
+        names = ['node_modules', 'a.log', 'important.log', 'build', 'build/out.js', 'build/keep.txt', 'src/main.py']
+        for name in names:
+            for max_index in range(len(ignore_list) + 1):
+                expected = next((index for index, item in enumerate(ignore_list[:max_index])
+                                 if re.match(item.pattern, name)), None)
+                self.assertEqual(matcher.match(name, max_index), expected, (name, max_index))
+
+        self.assertFalse(matcher.can_include_under('node_modules', len(ignore_list)))
+        self.assertTrue(matcher.can_include_under('build', len(ignore_list)))
+
+    def test_pack_source_code(self):
+        _write_files(self.source, ['.dockerignore'], b'node_modules\nlogs\n!logs/keep.txt\n')
+        _write_files(self.source, ['Dockerfile', 'src/main.js', 'node_modules/pkg/index.js', 'logs/keep.txt',
+                                   'logs/app.txt', '.git/config'])
+        scanned = []
+        scandir = os.scandir
+
+        def _scandir(path):
+            scanned.append(os.path.relpath(path, self.source))
+            return scandir(path)
+
+        for workers in [1, 4]:
+            scanned.clear()
+            tar_file_path = os.path.join(self.folder, 'source{}.tar.gz'.format(workers))
+            with mock.patch('os.scandir', side_effect=_scandir):
+                _pack_source_code(self.source, tar_file_path, os.path.join(self.source, 'Dockerfile'),
+                                  'Dockerfile', compression_workers=workers)
+            with tarfile.open(tar_file_path, 'r:gz') as tar:
+                names = sorted(name for name in tar.getnames() if name)
+            self.assertEqual(names, ['.dockerignore', 'Dockerfile', 'Dockerfile', 'logs/keep.txt',
+                                     'src', 'src/main.js'])
+            # the ignored directories are only scanned when a rule can include back some of their files
+            self.assertEqual(sorted(scanned), ['.', 'logs', 'src'])
+
+    def test_compression_workers_setting(self):
+        cli_ctx = mock.MagicMock()
+        cli_ctx.config.getint.return_value = 0
+        self.assertEqual(get_compression_workers(cli_ctx), 1)
+        cli_ctx.config.getint.return_value = 3
+        self.assertEqual(get_compression_workers(cli_ctx), 3)
+        cli_ctx.config.getint.assert_called_with('containerapp', 'compression_workers', fallback=1)
+        cli_ctx.config.getint.side_effect = ValueError('invalid literal for int()')
+        self.assertEqual(get_compression_workers(cli_ctx), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
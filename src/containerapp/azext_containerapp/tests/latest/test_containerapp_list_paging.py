@@ -0,0 +1,112 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import time
+import unittest
+from unittest import mock
+from urllib.parse import unquote
+
+from azure.core.exceptions import HttpResponseError
+
+from azext_containerapp._clients import ContainerAppClient
+from azext_containerapp.custom import list_containerapp
+
+MANAGEMENT_HOSTNAME = "https://management.azure.com/"
+SUBSCRIPTION_ID = "00000000-0000-0000-0000-000000000000"
+ENV_ID_FMT = "/subscriptions/{}/resourceGroups/{}/providers/Microsoft.App/managedEnvironments/{}"
+PAGE_LATENCY = 0.05
+PAGE_SIZE = 10
+RESOURCE_GROUPS = 8
+APPS_PER_RESOURCE_GROUP = 30
+
+
+def _get_app(resource_group_name, index):
+    env_name = "env-{}".format(index % 2)
+    return {
+        "id": "/subscriptions/{}/resourceGroups/{}/providers/Microsoft.App/containerApps/app-{}".format(
+            SUBSCRIPTION_ID, resource_group_name, index),
+        "name": "app-{}".format(index),
+        "properties": {
+            "managedEnvironmentId": ENV_ID_FMT.format(SUBSCRIPTION_ID, resource_group_name, env_name)}}
+
+
+class FakeArm:
+    """Serves the container apps of several resource groups in pages, each page taking PAGE_LATENCY seconds."""
+
+    def __init__(self):
+        self.apps = {"rg{}".format(i): [_get_app("rg{}".format(i), j) for j in range(APPS_PER_RESOURCE_GROUP)]
+                     for i in range(RESOURCE_GROUPS)}
+        self.requests = []
+        self.resources_error = None
+
+    def _page(self, items, request_url, skip):
+        page_size = int(request_url.split("$top=")[1].split("&")[0]) if "$top=" in request_url else PAGE_SIZE
+        page = {"value": items[skip:skip + page_size]}
+        if skip + page_size < len(items):
+            page["nextLink"] = "{}&$skiptoken={}".format(request_url.split("&$skiptoken")[0], skip + page_size)
+        return page
+
+    def send_raw_request(self, cli_ctx, method, request_url, **_):
+        self.requests.append(request_url)
+        time.sleep(PAGE_LATENCY)
+        skip = int(request_url.split("$skiptoken=")[1]) if "$skiptoken=" in request_url else 0
+        path = unquote(request_url[len(MANAGEMENT_HOSTNAME):]).split("?")[0].split("/")
+        if path[-1] == "resources":
+            if self.resources_error:
+                raise self.resources_error
+            items = [{"id": app["id"]} for apps in self.apps.values() for app in apps]
+        elif path[2] == "resourceGroups":
+            items = self.apps[path[3]]
+        else:
+            items = [app for apps in self.apps.values() for app in apps]
+        return mock.MagicMock(json=mock.MagicMock(return_value=self._page(items, request_url, skip)))
+
+
+class ContainerappListPagingTest(unittest.TestCase):
+    def setUp(self):
+        self.arm = FakeArm()
+        self.cmd = mock.MagicMock()
+        self.cmd.cli_ctx.cloud.endpoints.resource_manager = MANAGEMENT_HOSTNAME
+        patches = [mock.patch("azext_containerapp._clients.send_raw_request", side_effect=self.arm.send_raw_request),
+                   mock.patch("azext_containerapp._clients.get_subscription_id", return_value=SUBSCRIPTION_ID),
+                   mock.patch("azext_containerapp.custom._validate_subscription_registered")]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_list_by_resource_group(self):
+        apps = ContainerAppClient.list_by_resource_group(self.cmd, "rg1", formatter=lambda app: app["name"])
+        self.assertEqual(apps, ["app-{}".format(i) for i in range(APPS_PER_RESOURCE_GROUP)])
+        self.assertEqual(len(self.arm.requests), APPS_PER_RESOURCE_GROUP // PAGE_SIZE)
+
+    def test_list_by_subscription(self):
+        start = time.time()
+        apps = ContainerAppClient.list_by_subscription(self.cmd)
+        elapsed = time.time() - start
+        expected = [app["id"] for apps in self.arm.apps.values() for app in apps]
+        self.assertEqual(sorted(app["id"] for app in apps), sorted(expected))
+        # the resource groups are listed concurrently rather than following the nextLink of the subscription
+        pages = RESOURCE_GROUPS * APPS_PER_RESOURCE_GROUP // PAGE_SIZE
+        self.assertLess(elapsed, pages * PAGE_LATENCY / 2)
+
+    def test_list_by_subscription_without_resources_permission(self):
+        self.arm.resources_error = HttpResponseError("(AuthorizationFailed) The client does not have authorization")
+        apps = ContainerAppClient.list_by_subscription(self.cmd)
+        expected = [app["id"] for apps in self.arm.apps.values() for app in apps]
+        self.assertEqual([app["id"] for app in apps], expected)
+        # the nextLink of the subscription is followed instead
+        self.assertTrue(all("/resourceGroups/" not in request_url for request_url in self.arm.requests))
+
+    @mock.patch("azext_containerapp.custom.ManagedEnvironmentClient")
+    def test_list_containerapp_managed_env(self, _):
+        env_id = ENV_ID_FMT.format(SUBSCRIPTION_ID, "rg2", "env-1")
+        apps = list_containerapp(self.cmd, managed_env=env_id)
+        self.assertEqual(len(apps), APPS_PER_RESOURCE_GROUP // 2)
+        self.assertTrue(all(app["properties"]["managedEnvironmentId"] == env_id for app in apps))
+        self.assertEqual(len(list_containerapp(self.cmd, resource_group_name="rg3", managed_env="env-0")),
+                         APPS_PER_RESOURCE_GROUP // 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from azure.cli.core.azclierror import MutuallyExclusiveArgumentError
+
+from azext_containerapp._utils import unescape_log_line
+from azext_containerapp.custom import stream_containerapp_logs
+
+EVENT_STREAM_ENDPOINT = ("https://eastus.azurecontainerapps.dev"
+                         "/subscriptions/sub/resourceGroups/rg/containerApps/app/eventstream")
+
+
+class FakeLogResponse:
+    def __init__(self, lines, status_code=200):
+        self.lines = lines
+        self.status_code = status_code
+        self.ok = status_code == 200
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+def _get_replica(name, *containers):
+    return {"name": name, "properties": {"containers": [{"name": container} for container in containers]}}
+
+
+class ContainerappLogsTest(unittest.TestCase):
+    def setUp(self):
+        client = mock.patch("azext_containerapp.custom.ContainerAppClient").start()
+        self.addCleanup(mock.patch.stopall)
+        mock.patch("azext_containerapp.custom.get_subscription_id", return_value="sub").start()
+        client.get_auth_token.return_value = {"properties": {"token": "token"}}
+        client.show.return_value = {"properties": {"eventStreamEndpoint": EVENT_STREAM_ENDPOINT}}
+        client.list_revisions.return_value = [{"name": "app--v1", "properties": {"active": True}},
+                                              {"name": "app--v2", "properties": {"active": True}},
+                                              {"name": "app--v0", "properties": {"active": False}}]
+        client.list_replicas.side_effect = lambda cmd, resource_group_name, container_app_name, revision_name: {
+            "app--v1": [_get_replica("replica-1", "app", "sidecar"), _get_replica("replica-2", "app")],
+            "app--v2": [_get_replica("replica-3", "app")]}[revision_name]
+        self.client = client
+
+    def _stream_logs(self, logs, **kwargs):
+        def get(url, **_):
+            replica, container = url.split("/replicas/")[1].split("/logstream")[0].split("/containers/")
+            if (replica, container) not in logs:
+                return FakeLogResponse([], status_code=404)
+            return FakeLogResponse(logs[replica, container])
+
+        output = io.StringIO()
+        with mock.patch("azext_containerapp.custom.requests.get", side_effect=get) as get_mock, redirect_stdout(output):
+            stream_containerapp_logs(mock.MagicMock(), "rg", "app", all_replicas=True, **kwargs)
+        return output.getvalue().splitlines(), get_mock
+
+    def test_unescape_log_line(self):
+        line = "\\u001B[32minfo\\u001B[0m: \\u0022a\\u0022 \\u002B \\u0027b\\u0027 \\u0041"
+        self.assertEqual(unescape_log_line(line), "\u001B[32minfo\u001B[0m: \"a\" + 'b' \\u0041")
+
+    def test_stream_all_replicas(self):
+        logs = {("replica-1", "app"): [b"app 1", b"", b"app 2"],
+                ("replica-1", "sidecar"): [b"sidecar \\u0022ready\\u0022"],
+                ("replica-3", "app"): [b"app 3"]}
+        lines, get_mock = self._stream_logs(logs, output_format="text", tail=20)
+        self.assertEqual(sorted(lines), ["[replica-1/app] app 1", "[replica-1/app] app 2",
+                                         '[replica-1/sidecar] sidecar "ready"', "[replica-3/app] app 3"])
+        self.assertLess(lines.index("[replica-1/app] app 1"), lines.index("[replica-1/app] app 2"))
+        # the replicas of the inactive revisions are left out, a replica failing to stream doesn't stop the others
+        self.assertEqual(get_mock.call_count, 4)
+
+    def test_stream_all_replicas_json(self):
+        logs = {("replica-2", "app"): [b'{"TimeStamp": "2022-11-01T00:00:00Z", "Log": "started"}', b"not json"]}
+        lines, _ = self._stream_logs(logs, output_format="json", container="app", revision="app--v1")
+        self.assertEqual(json.loads(lines[0]), {"Replica": "replica-2", "Container": "app",
+                                                "TimeStamp": "2022-11-01T00:00:00Z", "Log": "started"})
+        self.assertEqual(lines[1], "[replica-2/app] not json")
+        self.client.list_revisions.assert_not_called()
+
+    def test_stream_all_replicas_with_replica(self):
+        with self.assertRaises(MutuallyExclusiveArgumentError):
+            stream_containerapp_logs(mock.MagicMock(), "rg", "app", replica="replica-1", all_replicas=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,9 @@
 # --------------------------------------------------------------------------------------------
 
 from azure.cli.core import AzCommandsLoader
-from azure.cli.core.commands.parameters import tags_type
+from azure.cli.core.commands.parameters import tags_type, get_enum_type
+
+from azext_imagecopy.cli_utils import EXECUTION_MODES, EXECUTION_MODE_SUBPROCESS
 
 import azext_imagecopy._help  # pylint: disable=unused-import
 
@@ -52,6 +54,11 @@ class ImageCopyCommandsLoader(AzCommandsLoader):
                        help='Resource Group name where temporary storage account will be created.')
             c.argument('export_as_snapshot', options_list=['--export-as-snapshot'], action='store_true', default=False,
                        help='Include this switch to export the copies as snapshots instead of images.')
+            c.argument('execution_mode', options_list=['--execution-mode'], arg_type=get_enum_type(EXECUTION_MODES),
+                       default=EXECUTION_MODE_SUBPROCESS,
+                       help='How the underlying azure cli commands are run. "in-process" runs them with the cli '
+                       'instance of the current process and polls the copy status with the storage SDK, instead of '
+                       'starting a new azure cli process for each step.')
             c.argument('tags', tags_type)
             c.ignore('_subscription')
 
@@ -18,4 +18,9 @@ helps['image copy'] = """
           text: >
             az image copy --source-resource-group mySources-rg --source-object-name myVm \\
                 --source-type vm --target-location uksouth northeurope --target-resource-group "images-repo-rg"
+        - name: Run the copy steps within the current azure cli process instead of a new process for each of them.
+          text: >
+            az image copy --source-resource-group mySources-rg --source-object-name myImage \\
+                --target-location uksouth northeurope westeurope --target-resource-group "images-repo-rg" \\
+                --execution-mode in-process
 """
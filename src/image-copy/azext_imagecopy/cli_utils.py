@@ -3,8 +3,11 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import copy
+import io
 import sys
 import json
+import threading
 
 from subprocess import check_output, STDOUT, CalledProcessError
 from knack.util import CLIError
@@ -14,11 +17,94 @@ logger = get_logger(__name__)
 
 EXTENSION_TAG_STRING = 'created_by=image-copy-extension'
 
+EXECUTION_MODE_SUBPROCESS = 'subprocess'
+EXECUTION_MODE_IN_PROCESS = 'in-process'
+EXECUTION_MODES = [EXECUTION_MODE_SUBPROCESS, EXECUTION_MODE_IN_PROCESS]
+
+
+class SubprocessExecutor:
+    """Runs every command in a new azure cli process."""
+
+    mode = EXECUTION_MODE_SUBPROCESS
+    cli_ctx = None
+
+    def run(self, cmd):  # pylint: disable=no-self-use
+        return check_output(cmd, stderr=STDOUT, universal_newlines=True)
+
+
+class InProcessExecutor:
+    """Runs the commands with a single azure cli instance of the current process.
+
+    The command modules, the login context and the clients loaded by a step stay loaded for the next ones, instead of
+    paying the start of a new interpreter for each of them.
+
+    Each command goes through CLI.invoke, which configures the logging again for the arguments of the nested command
+    and tears down the command metadata logging of the `image copy` command when it ends. The telemetry of the
+    `image copy` command is saved before each nested command and restored after it."""
+
+    mode = EXECUTION_MODE_IN_PROCESS
+
+    def __init__(self):
+        self._cli = None
+        self._lock = threading.Lock()
+
+    @property
+    def cli_ctx(self):
+        if self._cli is None:
+            from azure.cli.core import get_default_cli
+            self._cli = get_default_cli()
+        return self._cli
+
+    def run(self, cmd):
+        args = list(cmd)
+        if args[:3] == [sys.executable, '-m', 'azure.cli']:
+            args = args[3:]
+        out_file = io.StringIO()
+        # an azure cli instance runs one command at a time
+        with self._lock:
+            telemetry_state = _save_telemetry()
+            try:
+                exit_code = self.cli_ctx.invoke(args, out_file=out_file)
+            finally:
+                _restore_telemetry(telemetry_state)
+        cmd_output = out_file.getvalue()
+        if exit_code:
+            raise CalledProcessError(exit_code, cmd, output=cmd_output)
+        return cmd_output
+
+
+def _save_telemetry():
+    from azure.cli.core import telemetry
+    return {name: copy.copy(value) for name, value in vars(telemetry._session).items()}  # pylint: disable=protected-access
+
+
+def _restore_telemetry(telemetry_state):
+    from azure.cli.core import telemetry
+    vars(telemetry._session).update(telemetry_state)  # pylint: disable=protected-access
+
+
+_executor = SubprocessExecutor()
+
+
+def set_execution_mode(execution_mode):
+    """Select how the following commands of this process are run, the in-process cli is kept across runs."""
+    global _executor  # pylint: disable=global-statement
+    execution_mode = execution_mode or EXECUTION_MODE_SUBPROCESS
+    if execution_mode not in EXECUTION_MODES:
+        raise CLIError('Invalid execution mode: {}'.format(execution_mode))
+    if _executor.mode != execution_mode:
+        _executor = InProcessExecutor() if execution_mode == EXECUTION_MODE_IN_PROCESS else SubprocessExecutor()
+    return _executor
+
+
+def get_executor():
+    return _executor
+
 
 # pylint: disable=inconsistent-return-statements
 def run_cli_command(cmd, return_as_json=False):
     try:
-        cmd_output = check_output(cmd, stderr=STDOUT, universal_newlines=True)
+        cmd_output = _executor.run(cmd)
         logger.debug('command: %s ended with output: %s', cmd, cmd_output)
 
         if return_as_json:
@@ -9,7 +9,8 @@ import time
 from knack.util import CLIError
 from knack.log import get_logger
 
-from azext_imagecopy.cli_utils import run_cli_command, prepare_cli_command, get_storage_account_id_from_blob_path
+from azext_imagecopy.cli_utils import (run_cli_command, prepare_cli_command, get_storage_account_id_from_blob_path,
+                                       set_execution_mode, EXECUTION_MODE_IN_PROCESS)
 
 logger = get_logger(__name__)
 
@@ -21,7 +22,11 @@ STORAGE_ACCOUNT_NAME_LENGTH = 24
 def create_target_image(location, transient_resource_group_name, source_type, source_object_name,
                         source_os_disk_snapshot_name, source_os_disk_snapshot_url, source_os_type,
                         target_resource_group_name, azure_pool_frequency, tags, target_name, target_subscription,
-                        export_as_snapshot, timeout, hyper_v_generation, only_show_errors=None):
+                        export_as_snapshot, timeout, hyper_v_generation, only_show_errors=None,
+                        execution_mode=None):
+
+    # the copies to several locations run in worker processes which have to select the mode again
+    executor = set_execution_mode(execution_mode)
 
     hyper_v_generation = 'V1' if hyper_v_generation is None else hyper_v_generation
 
@@ -103,8 +108,13 @@ def create_target_image(location, transient_resource_group_name, source_type, so
 
     # Wait for the copy to complete
     start_datetime = datetime.datetime.now()
+    copy_status_poller = None
+    if executor.mode == EXECUTION_MODE_IN_PROCESS:
+        copy_status_poller = BlobCopyStatusPoller(executor.cli_ctx, target_blob_endpoint, target_container_name,
+                                                  blob_name, target_storage_account_key)
     wait_for_blob_copy_operation(blob_name, target_container_name, target_storage_account_name,
-                                 azure_pool_frequency, location, target_subscription, only_show_errors=only_show_errors)
+                                 azure_pool_frequency, location, target_subscription, only_show_errors=only_show_errors,
+                                 copy_status_poller=copy_status_poller)
     msg = "{0} - Copy time: {1}".format(
         location, datetime.datetime.now() - start_datetime)
     logger.warning(msg)
@@ -164,22 +174,48 @@ def create_target_image(location, transient_resource_group_name, source_type, so
         run_cli_command(cli_cmd)
 
 
+class BlobCopyStatusPoller:
+    """Gets the copy status of the target blob with one storage client reused across the polls."""
+
+    def __init__(self, cli_ctx, blob_endpoint, container_name, blob_name, account_key):
+        from azure.cli.core.profiles import ResourceType, get_sdk
+        blob_client_cls = get_sdk(cli_ctx, ResourceType.DATA_STORAGE_BLOB, '_blob_client#BlobClient')
+        self._client = blob_client_cls(account_url=blob_endpoint, container_name=container_name,
+                                       blob_name=blob_name, credential=account_key)
+
+    def get_copy_status(self):
+        copy = self._client.get_blob_properties().copy
+        return copy.status, copy.progress, {'status': copy.status, 'progress': copy.progress,
+                                            'statusDescription': copy.status_description}
+
+
+def _get_copy_status_with_cli(blob_name, target_container_name, target_storage_account_name, subscription,
+                              only_show_errors=None):
+    cli_cmd = prepare_cli_command(['storage', 'blob', 'show',
+                                   '--name', blob_name,
+                                   '--container-name', target_container_name,
+                                   '--account-name', target_storage_account_name],
+                                  subscription=subscription,
+                                  only_show_errors=only_show_errors)
+
+    json_output = run_cli_command(cli_cmd, return_as_json=True)
+    copy = json_output["properties"]["copy"]
+    return copy["status"], copy["progress"], json_output
+
+
 def wait_for_blob_copy_operation(blob_name, target_container_name, target_storage_account_name,
-                                 azure_pool_frequency, location, subscription, only_show_errors=None):
+                                 azure_pool_frequency, location, subscription, only_show_errors=None,
+                                 copy_status_poller=None):
     copy_status = "pending"
     prev_progress = -1
     while copy_status == "pending":
-        cli_cmd = prepare_cli_command(['storage', 'blob', 'show',
-                                       '--name', blob_name,
-                                       '--container-name', target_container_name,
-                                       '--account-name', target_storage_account_name],
-                                      subscription=subscription,
-                                      only_show_errors=only_show_errors)
-
-        json_output = run_cli_command(cli_cmd, return_as_json=True)
-        copy_status = json_output["properties"]["copy"]["status"]
-        copy_progress_1, copy_progress_2 = json_output["properties"]["copy"]["progress"].split(
-            "/")
+        if copy_status_poller is not None:
+            copy_status, copy_progress, status_output = copy_status_poller.get_copy_status()
+        else:
+            copy_status, copy_progress, status_output = _get_copy_status_with_cli(
+                blob_name, target_container_name, target_storage_account_name, subscription,
+                only_show_errors=only_show_errors)
+        copy_progress_1, copy_progress_2 = copy_progress.split("/")
         current_progress = int(
             int(copy_progress_1) / int(copy_progress_2) * 100)
 
@@ -190,6 +226,9 @@ def wait_for_blob_copy_operation(blob_name, target_container_name, target_storag
 
         prev_progress = current_progress
 
+        if copy_status != "pending":
+            break
+
         try:
             time.sleep(azure_pool_frequency)
         except KeyboardInterrupt:
@@ -198,8 +237,8 @@ def wait_for_blob_copy_operation(blob_name, target_container_name, target_storag
     if copy_status != 'success':
         logger.error(
             "The copy operation didn't succeed. Last status: %s", copy_status)
-        logger.error("Command run: %s", cli_cmd)
-        logger.error("Command output: %s", json_output)
+        logger.error("Blob: %s/%s in %s", target_container_name, blob_name, target_storage_account_name)
+        logger.error("Copy status: %s", status_output)
 
         raise CLIError('Blob copy failed')
 
@@ -9,7 +9,8 @@ from knack.util import CLIError
 from azure.cli.core.azclierror import ResourceNotFoundError, ArgumentUsageError
 from knack.log import get_logger
 
-from azext_imagecopy.cli_utils import run_cli_command, prepare_cli_command, get_storage_account_id_from_blob_path
+from azext_imagecopy.cli_utils import (run_cli_command, prepare_cli_command, get_storage_account_id_from_blob_path,
+                                       set_execution_mode)
 from azext_imagecopy.create_target import create_target_image
 
 logger = get_logger(__name__)
@@ -21,8 +22,9 @@ logger = get_logger(__name__)
 def imagecopy(cmd, source_resource_group_name, source_object_name, target_location,
               target_resource_group_name, temporary_resource_group_name='image-copy-rg',
               source_type='image', cleanup=False, parallel_degree=-1, tags=None, target_name=None,
-              target_subscription=None, export_as_snapshot='false', timeout=3600):
+              target_subscription=None, export_as_snapshot='false', timeout=3600, execution_mode=None):
     only_show_errors = cmd.cli_ctx.only_show_errors
+    set_execution_mode(execution_mode)
     if cleanup:
         # If --cleanup is set, forbid using an existing temporary resource group name.
         # It is dangerous to clean up an existing resource group.
@@ -183,7 +185,7 @@ def imagecopy(cmd, source_resource_group_name, source_object_name, target_locati
                                     source_object_name, source_os_disk_snapshot_name, source_os_disk_snapshot_url,
                                     source_os_type, target_resource_group_name, azure_pool_frequency,
                                     tags, target_name, target_subscription, export_as_snapshot, timeout,
-                                    hyper_v_generation, only_show_errors)
+                                    hyper_v_generation, only_show_errors, execution_mode)
         else:
             if parallel_degree == -1:
                 pool = Pool(target_locations_count)
@@ -197,7 +199,7 @@ def imagecopy(cmd, source_resource_group_name, source_object_name, target_locati
                                 source_object_name, source_os_disk_snapshot_name, source_os_disk_snapshot_url,
                                 source_os_type, target_resource_group_name, azure_pool_frequency,
                                 tags, target_name, target_subscription, export_as_snapshot, timeout,
-                                hyper_v_generation, only_show_errors)
+                                hyper_v_generation, only_show_errors, execution_mode)
                 tasks.append(task_content)
 
             logger.warning("Starting async process for all locations")
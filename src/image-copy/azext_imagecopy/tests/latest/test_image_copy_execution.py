@@ -0,0 +1,157 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from subprocess import CalledProcessError
+from unittest import mock
+
+from azext_imagecopy import cli_utils
+from azext_imagecopy.cli_utils import (EXECUTION_MODE_IN_PROCESS, EXECUTION_MODE_SUBPROCESS, InProcessExecutor,
+                                       prepare_cli_command, run_cli_command, set_execution_mode)
+from azext_imagecopy.create_target import create_target_image
+
+# time to start a new python interpreter and load azure cli for each command
+CLI_STARTUP_TIME = 0.05
+LOCATIONS = ['westus', 'eastus', 'northeurope', 'uksouth']
+
+
+class FakeAzureCli:
+    """Answers the commands run by create_target_image, the way the real commands would."""
+
+    def __init__(self, pending_polls=2):
+        self.pending_polls = pending_polls
+        self.commands = []
+        self._polls = {}
+        self._lock = threading.Lock()
+
+    def get_output(self, args):
+        with self._lock:
+            self.commands.append(args)
+        command = ' '.join(itertools.takewhile(lambda arg: not arg.startswith('-'), args))
+        if command == 'storage account create':
+            result = {'primaryEndpoints': {'blob': 'https://{}.blob.core.windows.net/'.format(args[4])}}
+        elif command == 'storage account keys list':
+            result = [{'value': 'key'}]
+        elif command == 'storage account generate-sas':
+            return 'se=2020-01-01&sig=signature\n'
+        elif command == 'storage blob show':
+            account = args[args.index('--account-name') + 1]
+            with self._lock:
+                self._polls[account] = self._polls.get(account, 0) + 1
+                status = 'pending' if self._polls[account] <= self.pending_polls else 'success'
+            result = {'properties': {'copy': {'status': status, 'progress': '50/100'}}}
+        elif command == 'snapshot create':
+            result = {'id': '/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Compute/snapshots/snapshot'}
+        else:
+            result = {}
+        return json.dumps(result)
+
+    def check_output(self, cmd, **_):
+        # a new process has to load azure cli before running the command
+        time.sleep(CLI_STARTUP_TIME)
+        return self.get_output(cmd[3:])
+
+    def get_default_cli(self):
+        time.sleep(CLI_STARTUP_TIME)
+        cli = mock.MagicMock()
+
+        def invoke(args, out_file):
+            out_file.write(self.get_output(args))
+            return 0
+
+        cli.invoke.side_effect = invoke
+        return cli
+
+
+class FakeBlobClient:
+
+    def __init__(self, account_url, container_name, blob_name, credential):
+        self.account_url = account_url
+        self.polls = 0
+
+    def get_blob_properties(self):
+        self.polls += 1
+        status = 'pending' if self.polls <= 2 else 'success'
+        return mock.Mock(copy=mock.Mock(status=status, progress='50/100', status_description=None))
+
+
+class ImageCopyExecutionTest(unittest.TestCase):
+
+    def tearDown(self):
+        set_execution_mode(EXECUTION_MODE_SUBPROCESS)
+
+    def _copy_to_locations(self, fake_cli, execution_mode):
+        start = time.time()
+        with mock.patch.object(cli_utils, 'check_output', side_effect=fake_cli.check_output), \
+                mock.patch('azure.cli.core.get_default_cli', side_effect=fake_cli.get_default_cli), \
+                mock.patch('azure.cli.core.profiles.get_sdk', return_value=FakeBlobClient):
+            set_execution_mode(execution_mode)
+            for location in LOCATIONS:
+                create_target_image(location, 'image-copy-rg', 'image', 'image', 'image_os_disk_snapshot',
+                                    'https://source/snapshot?sas', 'Linux', 'target-rg', 0, None, None, 'sub',
+                                    False, 3600, 'V2', execution_mode=execution_mode)
+        return time.time() - start
+
+    def test_in_process_executor(self):
+        fake_cli = FakeAzureCli()
+        with mock.patch('azure.cli.core.get_default_cli', side_effect=fake_cli.get_default_cli) as get_default_cli:
+            executor = set_execution_mode(EXECUTION_MODE_IN_PROCESS)
+            cmd = prepare_cli_command(['storage', 'account', 'keys', 'list', '--account-name', 'account'])
+            self.assertEqual(run_cli_command(cmd, return_as_json=True), [{'value': 'key'}])
+            self.assertEqual(run_cli_command(cmd, return_as_json=True), [{'value': 'key'}])
+            # the cli is loaded once and kept when the mode is selected again
+            self.assertIs(set_execution_mode(EXECUTION_MODE_IN_PROCESS), executor)
+            self.assertEqual(get_default_cli.call_count, 1)
+        self.assertEqual(fake_cli.commands[0][:4], ['storage', 'account', 'keys', 'list'])
+        self.assertNotIn(sys.executable, fake_cli.commands[0])
+
+    def test_in_process_executor_failure(self):
+        executor = InProcessExecutor()
+        executor._cli = mock.MagicMock()
+        executor._cli.invoke.return_value = 3
+        with self.assertRaises(CalledProcessError) as context:
+            executor.run(prepare_cli_command(['group', 'show', '--name', 'rg']))
+        self.assertEqual(context.exception.returncode, 3)
+
+    def test_in_process_executor_keeps_telemetry(self):
+        from azure.cli.core import telemetry
+        self.addCleanup(setattr, telemetry._session, 'command', telemetry._session.command)
+        telemetry._session.command = 'image copy'
+        executor = InProcessExecutor()
+        executor._cli = mock.MagicMock()
+        executor._cli.invoke.side_effect = lambda args, out_file: setattr(telemetry._session, 'command', 'group show') or 0
+        executor.run(prepare_cli_command(['group', 'show', '--name', 'rg']))
+        self.assertEqual(telemetry._session.command, 'image copy')
+
+    def test_copy_status_poller(self):
+        fake_cli = FakeAzureCli()
+        self._copy_to_locations(fake_cli, EXECUTION_MODE_IN_PROCESS)
+        # the copy status is read with the storage client instead of `storage blob show`
+        self.assertFalse([args for args in fake_cli.commands if args[:3] == ['storage', 'blob', 'show']])
+        self.assertEqual(len([args for args in fake_cli.commands if args[:2] == ['image', 'create']]), len(LOCATIONS))
+
+    @unittest.skipUnless(os.environ.get('AZURE_CLI_RUN_BENCHMARKS'), 'set AZURE_CLI_RUN_BENCHMARKS to run the benchmarks')
+    def test_benchmark_multi_region_copy(self):
+        subprocess_cli = FakeAzureCli()
+        subprocess_time = self._copy_to_locations(subprocess_cli, EXECUTION_MODE_SUBPROCESS)
+        in_process_cli = FakeAzureCli()
+        in_process_time = self._copy_to_locations(in_process_cli, EXECUTION_MODE_IN_PROCESS)
+
+        print('\nimage copy to {} locations: subprocess {:.2f}s ({} processes), in-process {:.2f}s'.format(
+            len(LOCATIONS), subprocess_time, len(subprocess_cli.commands), in_process_time))
+        # the polls of the copy status do not go through the cli anymore
+        self.assertEqual(len(subprocess_cli.commands) - len(in_process_cli.commands), 3 * len(LOCATIONS))
+        # one cli start for the whole run instead of one per command
+        self.assertLess(in_process_time, subprocess_time / 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import hashlib
 import json
 import os
 import yaml  # pylint: disable=import-error
@@ -16,6 +17,9 @@ from knack.log import get_logger
 
 logger = get_logger(__name__)
 
+COMMAND_METADATA_CACHE_VERSION = 1
+CORE_COMMAND_SOURCE = 'azure-cli-core'
+
 
 class AzInteractiveCommandsLoader(MainCommandsLoader):  # pylint: disable=too-few-public-methods
 
@@ -75,7 +79,12 @@ class FreshTable(object):
         self.shell_ctx = shell_ctx
 
     def dump_command_table(self, shell_ctx=None):
-        """ dumps the command table """
+        """
+        dumps the command table
+
+        the command table and the arguments are always loaded, the completer needs the loader, the cached metadata
+        only saves extracting the parameters of the commands and parsing the help of the sources which did not change
+        """
         from azure.cli.core.commands.arm import register_global_subscription_argument, register_ids_argument
         from knack import events
         import timeit
@@ -91,50 +100,178 @@ class FreshTable(object):
         shell_ctx.cli_ctx.raise_event(events.EVENT_INVOKER_POST_CMD_TBL_CREATE, commands_loader=main_loader)
         cmd_table = main_loader.command_table
 
+        cache_file = os.path.join(get_cache_dir(shell_ctx), get_metadata_cache_file(shell_ctx))
+        metadata_cache = CommandMetadataCache(cache_file, get_command_source_keys())
+
         cmd_table_data = {}
         for command_name, cmd in cmd_table.items():
+            source = get_command_source(cmd)
+            command_data = metadata_cache.get(source, command_name)
+            if command_data is None:
+                try:
+                    command_data = _get_command_metadata(cmd)
+                except (ImportError, ValueError):
+                    continue
+                metadata_cache.set(source, command_name, command_data)
+            # load_help_files updates the entries in place, the cached copy must stay untouched
+            cmd_table_data[command_name] = dict(
+                command_data, parameters={name: dict(options) for name, options in command_data['parameters'].items()})
 
-            try:
-                command_description = cmd.description
-                if callable(command_description):
-                    command_description = command_description()
-
-                # checking all the parameters for a single command
-                parameter_metadata = {}
-                for arg in cmd.arguments.values():
-                    options = {
-                        'name': [name for name in arg.options_list],
-                        'required': REQUIRED_TAG if arg.type.settings.get('required') else '',
-                        'help': arg.type.settings.get('help') or ''
-                    }
-                    # the key is the first alias option
-                    if arg.options_list:
-                        parameter_metadata[arg.options_list[0]] = options
-
-                cmd_table_data[command_name] = {
-                    'parameters': parameter_metadata,
-                    'help': command_description,
-                    'examples': ''
-                }
-            except (ImportError, ValueError):
-                pass
-
-        load_help_files(cmd_table_data)
+        load_help_files(cmd_table_data, metadata_cache.help_cache)
         elapsed = timeit.default_timer() - start_time
         logger.debug('Command table dumped: %s sec', elapsed)
         FreshTable.loader = main_loader
 
-        # dump into the cache file
-        command_file = shell_ctx.config.get_help_files()
-        with open(os.path.join(get_cache_dir(shell_ctx), command_file), 'w') as help_file:
-            json.dump(cmd_table_data, help_file, default=lambda x: x.target or '', skipkeys=True)
+        # dump into the cache file, which is left as is when nothing was added, removed or changed since the last run
+        command_file = os.path.join(get_cache_dir(shell_ctx), shell_ctx.config.get_help_files())
+        if metadata_cache.is_modified() or not os.path.exists(command_file):
+            with open(command_file, 'w') as help_file:
+                json.dump(cmd_table_data, help_file, default=_serialize_help_value, skipkeys=True)
+            metadata_cache.save()
+        else:
+            logger.debug('Command table unchanged, reusing %s', command_file)
+
+
+def _get_command_metadata(cmd):
+    command_description = cmd.description
+    if callable(command_description):
+        command_description = command_description()
+
+    # checking all the parameters for a single command
+    parameter_metadata = {}
+    for arg in cmd.arguments.values():
+        options = {
+            'name': [name for name in arg.options_list],
+            'required': REQUIRED_TAG if arg.type.settings.get('required') else '',
+            'help': arg.type.settings.get('help') or ''
+        }
+        # the key is the first alias option
+        if arg.options_list:
+            parameter_metadata[arg.options_list[0]] = options
+
+    # round trip through json so cached and freshly loaded entries are identical
+    return json.loads(json.dumps({
+        'parameters': parameter_metadata,
+        'help': command_description,
+        'examples': ''
+    }, default=_serialize_help_value, skipkeys=True))
+
+
+def _serialize_help_value(value):
+    return value.target or ''
+
+
+def get_metadata_cache_file(shell_ctx):
+    """ gets the name of the file caching the command metadata next to the help file """
+    return '{}.metadata.json'.format(os.path.splitext(shell_ctx.config.get_help_files())[0])
+
+
+def get_command_source(cmd):
+    """ gets the name of the extension which defines the command, or the core source for built-in modules """
+    return getattr(cmd.command_source, 'extension_name', None) or CORE_COMMAND_SOURCE
+
 
+def get_command_source_keys():
+    """ gets the version of the CLI core and of each installed extension, the keys of the cached metadata """
+    from azure.cli.core import __version__ as core_version
+    from azure.cli.core.extension import get_extensions
+
+    keys = {CORE_COMMAND_SOURCE: core_version}
+    for ext in get_extensions():
+        try:
+            mtime = os.path.getmtime(ext.path)
+        except (OSError, TypeError):
+            mtime = None
+        try:
+            version = ext.version
+        except Exception:  # pylint: disable=broad-except
+            version = None
+        keys[ext.name] = '{}:{}'.format(version, mtime)
+    return keys
+
+
+class CommandMetadataCache(object):
+    """
+    the command metadata of the last dump, grouped by the extension defining the commands
+
+    the metadata of a source is only reused while the CLI core version, or the extension version and install time,
+    match the ones recorded with it. the parsed help entries are kept by hash of their yaml text.
+
+    the cache does not spare loading the command table and the arguments, which the completer and the parser of the
+    shell need, so a warm start still pays for that load in the background thread
+    """
+
+    def __init__(self, path, source_keys):
+        self.path = path
+        self.source_keys = source_keys
+        self.sources = {}
+        self.help_cache = {}
+        self._cached_sources = {}
+        self._cached_commands = set()
+        self._modified = False
+        try:
+            with open(path, 'r') as cache_file:
+                content = json.load(cache_file)
+            if content.get('version') == COMMAND_METADATA_CACHE_VERSION:
+                self._cached_sources = content.get('sources', {})
+                self.help_cache = content.get('helps', {})
+        except (OSError, ValueError):
+            pass
+        for source in self._cached_sources.values():
+            self._cached_commands.update(source['commands'])
+        self._cached_helps = dict(self.help_cache)
+
+    def get(self, source, command_name):
+        """ gets the cached metadata of the command if its source did not change """
+        cached_source = self._cached_sources.get(source)
+        if not cached_source or cached_source['key'] != self.source_keys.get(source):
+            return None
+        command_data = cached_source['commands'].get(command_name)
+        if command_data is not None:
+            self._get_source(source)['commands'][command_name] = command_data
+        return command_data
+
+    def set(self, source, command_name, command_data):
+        self._get_source(source)['commands'][command_name] = command_data
+        self._modified = True
+
+    def _get_source(self, source):
+        if source not in self.sources:
+            self.sources[source] = {'key': self.source_keys.get(source), 'commands': {}}
+        return self.sources[source]
+
+    def is_modified(self):
+        """ whether commands or help entries were added, removed or changed since the cache was written """
+        commands = set()
+        for source in self.sources.values():
+            commands.update(source['commands'])
+        return self._modified or commands != self._cached_commands or self.help_cache != self._cached_helps
+
+    def save(self):
+        temp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        with open(temp_path, 'w') as cache_file:
+            json.dump({'version': COMMAND_METADATA_CACHE_VERSION, 'sources': self.sources, 'helps': self.help_cache},
+                      cache_file)
+        os.replace(temp_path, self.path)
+
+
+def load_help_files(data, help_cache=None):
+    """
+    loads all the extra information from help files
+
+    help_cache maps the help entries to the sha1 of their yaml and the parsed content, it is updated in place so
+    that the entries which did not change are not parsed again
+    """
+    if help_cache is None:
+        help_cache = {}
+    for command_name in set(help_cache) - set(helps):
+        del help_cache[command_name]
 
-def load_help_files(data):
-    """ loads all the extra information from help files """
     for command_name, help_yaml in helps.items():
 
-        help_entry = yaml.safe_load(help_yaml)
+        help_entry = _parse_help_entry(command_name, help_yaml, help_cache)
+        if not isinstance(help_entry, dict):
+            continue
         try:
             help_type = help_entry['type']
         except KeyError:
@@ -170,6 +307,18 @@ def load_help_files(data):
                                               for example in help_entry['examples']]
 
 
+def _parse_help_entry(command_name, help_yaml, help_cache):
+    digest = hashlib.sha1(help_yaml.encode('utf-8')).hexdigest()
+    cached = help_cache.get(command_name)
+    if cached and cached[0] == digest:
+        return cached[1]
+    help_entry = yaml.safe_load(help_yaml)
+    # round trip through json so cached and freshly parsed entries are identical
+    help_entry = json.loads(json.dumps(help_entry, default=str))
+    help_cache[command_name] = [digest, help_entry]
+    return help_entry
+
+
 def get_cache_dir(shell_ctx):
     """ gets the location of the cache """
     azure_folder = shell_ctx.config.get_config_dir()
@@ -38,7 +38,7 @@ from . import VERSION
 from .az_completer import AzCompleter
 from .az_lexer import get_az_lexer, ExampleLexer, ToolbarLexer
 from .configuration import Configuration, SELECT_SYMBOL
-from .frequency_heuristic import DISPLAY_TIME, frequency_heuristic
+from .frequency_heuristic import DISPLAY_TIME, frequency_heuristic, update_command_frequency
 from .gather_commands import add_new_lines, GatherCommands
 from .key_bindings import InteractiveKeyBindings
 from .layout import LayoutManager
@@ -677,6 +677,15 @@ class AzInteractiveShell(object):
         except SystemExit as ex:
             self.last_exit = int(ex.code)
 
+    def record_command_usage(self, cmd):
+        """ counts the command run so that the completions show the most used commands first """
+        if not self.completer:
+            return
+        _, command, _ = self.completer.command_tree.get_sub_tree(parse_quotes(cmd))
+        if command:
+            update_command_frequency(self, command)
+            self.completer.update_command_usage(command)
+
     def progress_patch(self, *args, **kwargs):
         """ forces to use the Shell Progress """
         from .progress import ShellProgressView
@@ -737,5 +746,6 @@ class AzInteractiveShell(object):
                         telemetry.set_failure()
                     else:
                         telemetry.set_success()
+                        self.record_command_usage(cmd)
                     telemetry.flush()
         telemetry.conclude()
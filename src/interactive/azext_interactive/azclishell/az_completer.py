@@ -17,6 +17,8 @@ from prompt_toolkit.completion import Completer, Completion  # pylint: disable=i
 
 from . import configuration
 from .argfinder import ArgsFinder
+from .completion_index import CompletionIndex
+from .frequency_heuristic import load_command_frequency
 from .util import parse_quotes
 
 SELECT_SYMBOL = configuration.SELECT_SYMBOL
@@ -34,18 +36,19 @@ def _check_value_muted(_, action, value):
         raise argparse.ArgumentError(action, msg)
 
 
-def sort_completions(completions_gen):
-    """ sorts the completions """
+def _get_weight(text, display_meta):
+    """ weights the completions with required things first the lexicographically"""
     from knack.help import REQUIRED_TAG
 
-    def _get_weight(val):
-        """ weights the completions with required things first the lexicographically"""
-        priority = ''
-        if val.display_meta and val.display_meta.startswith(REQUIRED_TAG):
-            priority = ' '  # a space has the lowest ordinance
-        return priority + val.text
+    priority = ''
+    if display_meta and display_meta.startswith(REQUIRED_TAG):
+        priority = ' '  # a space has the lowest ordinance
+    return priority + text
+
 
-    return sorted(completions_gen, key=_get_weight)
+def sort_completions(completions_gen):
+    """ sorts the completions """
+    return sorted(completions_gen, key=lambda val: _get_weight(val.text, val.display_meta))
 
 
 # pylint: disable=too-many-instance-attributes
@@ -69,6 +72,14 @@ class AzCompleter(Completer):
         self.command_examples = None
         # a dictionary of commands with parameters with multiple names (e.g. {'vm create':{-n: --name}})
         self.command_param_info = {}
+        # the indexes of the sub-commands of each group and of the parameters of each command
+        self.completion_indexes = {}
+        # the indexes of the allowed values of the arguments, the values of the completers are not indexed
+        self.value_indexes = {}
+        # how many times each command and group was run, used to show the most used first
+        self.command_usage = {}
+        # whether to also complete the words containing the typed characters in order
+        self.fuzzy = False
 
         # information about what completions to generate
         self.current_command = ''
@@ -102,6 +113,10 @@ class AzCompleter(Completer):
         self.param_description = commands.param_descript
         self.command_examples = commands.command_example
         self.command_param_info = commands.command_param_info or self.command_param_info
+        self.completion_indexes = {}
+        self.value_indexes = {}
+        self.command_usage = load_command_frequency(self.shell_ctx)
+        self.fuzzy = self.shell_ctx.config.get_fuzzy_completion()
 
         if global_params:
             self.global_param = commands.global_param
@@ -120,8 +135,10 @@ class AzCompleter(Completer):
     def validate_param_completion(self, param, leftover_args):
         """ validates that a param should be completed """
         # validates param starts with unfinished word
-        completes = self.validate_completion(param)
+        return self.validate_completion(param) and self.is_param_applicable(param, leftover_args)
 
+    def is_param_applicable(self, param, leftover_args):
+        """ whether the param can be completed given the unfinished word and the params already in the line """
         # show parameter completions when started
         full_param = self.unfinished_word.startswith("--") and param.startswith("--")
         char_param = self.unfinished_word.startswith("-") and not param.startswith("--")
@@ -136,7 +153,7 @@ class AzCompleter(Completer):
             if alias in leftover_args:
                 no_doubles = False
 
-        return completes and no_doubles and any((full_param, char_param, new_param))
+        return no_doubles and any((full_param, char_param, new_param))
 
     def validate_completion(self, completion):
         return completion.lower().startswith(self.unfinished_word.lower())
@@ -171,7 +188,8 @@ class AzCompleter(Completer):
         self.shell_ctx.cli_ctx.raise_event(EVENT_INTERACTIVE_POST_SUB_TREE_CREATE, subtree=self.subtree)
         self.complete_command = not self.subtree.children
 
-        for comp in sort_completions(self.gen_cmd_and_param_completions()):
+        # already ordered by the completion index
+        for comp in self.gen_cmd_and_param_completions():
             yield comp
 
         for comp in sort_completions(self.gen_global_params_and_arg_completions()):
@@ -183,13 +201,21 @@ class AzCompleter(Completer):
 
     def gen_enum_completions(self, arg_name):
         """ generates dynamic enumeration completions """
-        try:  # if enum completion
-            for choice in self.cmdtab[self.current_command].arguments[arg_name].choices:
-                if self.validate_completion(choice):
-                    yield Completion(choice, -len(self.unfinished_word))
-
-        except TypeError:  # there is no choices option
-            pass
+        choices = self.cmdtab[self.current_command].arguments[arg_name].choices
+        if not choices:  # there is no choices option
+            return
+        index = self.get_value_index(self.current_command, arg_name, choices)
+        for choice, _ in index.get_matches(self.unfinished_word, fuzzy=self.fuzzy):
+            yield Completion(choice, -len(self.unfinished_word))
+
+    def get_value_index(self, command, arg_name, choices):
+        """ gets the index of the allowed values of an argument, built on first use """
+        key = (command, arg_name)
+        index = self.value_indexes.get(key)
+        if index is None:
+            index = CompletionIndex([(str(choice), None) for choice in choices])
+            self.value_indexes[key] = index
+        return index
 
     def get_arg_name(self, param):
         """ gets the argument name used in the command table for a parameter """
@@ -259,21 +285,45 @@ class AzCompleter(Completer):
         except Exception:  # pylint: disable=broad-except
             pass
 
-    def yield_param_completion(self, param, last_word):
-        """ yields a parameter """
-        return Completion(param, -len(last_word), display_meta=self.param_description.get(
-            self.current_command + " " + str(param), '').replace(os.linesep, ''))
-
     def gen_cmd_and_param_completions(self):
         """ generates command and parameter completions """
         if self.complete_command:
-            for param in self.command_param_info.get(self.current_command, []):
-                if self.validate_param_completion(param, self.leftover_args):
-                    yield self.yield_param_completion(param, self.unfinished_word)
+            index = self.get_completion_index(self.current_command, self.subtree, params=True)
+            for param, meta in index.get_matches(self.unfinished_word, fuzzy=self.fuzzy):
+                if self.is_param_applicable(param, self.leftover_args):
+                    yield Completion(param, -len(self.unfinished_word), display_meta=meta)
         elif not self.leftover_args:
-            for child_command in self.subtree.children:
-                if self.validate_completion(child_command):
-                    yield Completion(child_command, -len(self.unfinished_word))
+            index = self.get_completion_index(self.current_command, self.subtree)
+            for child_command, _ in index.get_matches(self.unfinished_word, fuzzy=self.fuzzy):
+                yield Completion(child_command, -len(self.unfinished_word))
+
+    def get_completion_index(self, command, subtree, params=False):
+        """ gets the index of the parameters of a command or of the sub-commands of a group, built on first use """
+        key = (command, params)
+        # the sub tree can be extended by the handlers of EVENT_INTERACTIVE_POST_SUB_TREE_CREATE
+        cached = self.completion_indexes.get(key)
+        if cached and cached[0] is subtree and cached[1] == len(subtree.children):
+            return cached[2]
+
+        if params:
+            entries = [(param, self.param_description.get(command + " " + str(param), '').replace(os.linesep, ''))
+                       for param in self.command_param_info.get(command, [])]
+            entries.sort(key=lambda entry: _get_weight(*entry))
+        else:
+            prefix = command + ' ' if command else ''
+            entries = sorted(((child, None) for child in subtree.children),
+                             key=lambda entry: (-self.command_usage.get(prefix + entry[0], 0), entry[0]))
+        index = CompletionIndex(entries)
+        self.completion_indexes[key] = (subtree, len(subtree.children), index)
+        return index
+
+    def update_command_usage(self, command):
+        """ counts one more run of the command in the usage ranking of the completions """
+        words = command.split()
+        for position in range(1, len(words) + 1):
+            group = ' '.join(words[:position])
+            self.command_usage[group] = self.command_usage.get(group, 0) + 1
+            self.completion_indexes.pop((' '.join(words[:position - 1]), False), None)
 
     def gen_global_params_and_arg_completions(self):
         # global parameters
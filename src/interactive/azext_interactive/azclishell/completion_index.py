@@ -0,0 +1,54 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import bisect
+
+_MAX_CHAR = u'\U0010ffff'
+
+
+def fuzzy_score(word, candidate):
+    """ scores how closely the characters of the word appear in order in the candidate, None if they do not """
+    position = -1
+    gaps = 0
+    for char in word:
+        index = candidate.find(char, position + 1)
+        if index < 0:
+            return None
+        gaps += index - position - 1
+        position = index
+    return gaps
+
+
+class CompletionIndex(object):
+    """
+    the completions available at one position of the command line, e.g. the sub-commands of a group or
+    the parameters of a command, indexed by their lower case text for prefix lookups
+    """
+
+    def __init__(self, entries):
+        """ entries are pairs of text and display meta, in the order to show them """
+        self._entries = sorted((text.lower(), rank, text, meta) for rank, (text, meta) in enumerate(entries))
+        self._keys = [entry[0] for entry in self._entries]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_matches(self, word, fuzzy=False):
+        """
+        returns the pairs of text and display meta which start with the word, in display order. in fuzzy mode the
+        entries containing the characters of the word in order follow, the closest matches first
+        """
+        word = word.lower()
+        start = bisect.bisect_left(self._keys, word)
+        end = bisect.bisect_right(self._keys, word + _MAX_CHAR, lo=start)
+        matches = sorted(self._entries[start:end], key=lambda entry: entry[1])
+        if fuzzy and word:
+            scored = []
+            for entry in self._entries[:start] + self._entries[end:]:
+                score = fuzzy_score(word, entry[0])
+                if score is not None:
+                    scored.append((score, entry[1], entry))
+            matches.extend(entry for _, _, entry in sorted(scored))
+        return [(entry[2], entry[3]) for entry in matches]
@@ -64,12 +64,15 @@ class Configuration(object):
         self.cli_config = cli_config
         self.config.add_section('Help Files')
         self.config.add_section('Layout')
+        self.config.add_section('Completion')
         self.config.set('Help Files', 'command', 'help_dump.json')
         self.config.set('Help Files', 'history', 'history.txt')
         self.config.set('Help Files', 'frequency', 'frequency.json')
+        self.config.set('Help Files', 'command_frequency', 'command_frequency.json')
         self.config.set('Layout', 'command_description', 'yes')
         self.config.set('Layout', 'param_description', 'yes')
         self.config.set('Layout', 'examples', 'yes')
+        self.config.set('Completion', 'fuzzy', 'no')
         self.config_dir = os.getenv('AZURE_CONFIG_DIR') or os.path.expanduser(os.path.join('~', '.azure-shell'))
 
         if not os.path.exists(self.config_dir):
@@ -97,6 +100,14 @@ class Configuration(object):
         """ returns the name of the frequency file """
         return self.config.get('Help Files', 'frequency')
 
+    def get_command_frequency(self):
+        """ returns the name of the file counting the commands run """
+        return self.config.get('Help Files', 'command_frequency')
+
+    def get_fuzzy_completion(self):
+        """ returns whether completions also match words containing the typed characters in order """
+        return self.BOOLEAN_STATES.get(self.config.get('Completion', 'fuzzy').lower(), False)
+
     def load(self, path):
         """ loads the configuration settings """
         self.config.read(path)
@@ -7,6 +7,10 @@ import os
 import datetime
 import json
 
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
 DAYS_AGO = 28
 ACTIVE_STATUS = 5
 DISPLAY_TIME = 20
@@ -53,3 +57,42 @@ def frequency_measurement(shell_ctx):
 def frequency_heuristic(shell_ctx):
     """ decides whether user meets requirements for frequency """
     return frequency_measurement(shell_ctx) >= ACTIVE_STATUS
+
+
+def _get_command_frequency_path(shell_ctx):
+    return os.path.join(shell_ctx.config.get_config_dir(), shell_ctx.config.get_command_frequency())
+
+
+def load_command_frequency(shell_ctx):
+    """ returns how many times each command, and each of its groups, was run """
+    try:
+        with open(_get_command_frequency_path(shell_ctx), 'r') as freq:
+            frequency = json.load(freq)
+    except (OSError, ValueError):
+        return {}
+
+    usage = {}
+    for command, count in frequency.items():
+        words = command.split()
+        for index in range(1, len(words) + 1):
+            group = ' '.join(words[:index])
+            usage[group] = usage.get(group, 0) + count
+    return usage
+
+
+def update_command_frequency(shell_ctx, command):
+    """ counts one more run of the command """
+    frequency_path = _get_command_frequency_path(shell_ctx)
+    try:
+        with open(frequency_path, 'r') as freq:
+            frequency = json.load(freq)
+    except (OSError, ValueError):
+        frequency = {}
+
+    frequency[command] = frequency.get(command, 0) + 1
+    try:
+        with open(frequency_path, 'w') as freq:
+            json.dump(frequency, freq)
+    except OSError as ex:
+        # the ranking of the completions is a nicety, a read-only config dir must not fail the command
+        logger.debug('Failed to save the command frequency to %s: %s', frequency_path, ex)
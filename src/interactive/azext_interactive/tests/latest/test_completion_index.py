@@ -0,0 +1,84 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import timeit
+import unittest
+from unittest import mock
+
+from azext_interactive.azclishell.az_completer import AzCompleter
+from azext_interactive.azclishell.completion_index import CompletionIndex, fuzzy_score
+from azext_interactive.azclishell.frequency_heuristic import load_command_frequency, update_command_frequency
+
+
+class CompletionIndexTest(unittest.TestCase):
+    def test_prefix_matches(self):
+        index = CompletionIndex([('--name', 'REQUIRED name'), ('--location', 'location'), ('--no-wait', None),
+                                 ('-n', 'REQUIRED name')])
+        self.assertEqual(len(index), 4)
+        self.assertEqual([text for text, _ in index.get_matches('--n')], ['--name', '--no-wait'])
+        self.assertEqual(index.get_matches('--LO'), [('--location', 'location')])
+        self.assertEqual([text for text, _ in index.get_matches('')], ['--name', '--location', '--no-wait', '-n'])
+        self.assertEqual(index.get_matches('--x'), [])
+
+    def test_fuzzy_matches(self):
+        index = CompletionIndex([(name, None) for name in ['storage', 'sql', 'vmss', 'vm', 'network']])
+        self.assertEqual([text for text, _ in index.get_matches('sq')], ['sql'])
+        # prefix matches first, then the closest subsequence matches
+        self.assertEqual([text for text, _ in index.get_matches('s', fuzzy=True)], ['storage', 'sql', 'vmss'])
+        self.assertEqual([text for text, _ in index.get_matches('vs', fuzzy=True)], ['vmss'])
+        self.assertEqual([text for text, _ in index.get_matches('nwk', fuzzy=True)], ['network'])
+
+    def test_fuzzy_score(self):
+        self.assertEqual(fuzzy_score('vm', 'vmss'), 0)
+        self.assertEqual(fuzzy_score('vs', 'vmss'), 1)
+        self.assertIsNone(fuzzy_score('sv', 'vmss'))
+
+    @unittest.skipUnless(os.environ.get('AZURE_CLI_RUN_BENCHMARKS'), 'set AZURE_CLI_RUN_BENCHMARKS to run the benchmarks')
+    def test_lookup_time(self):
+        index = CompletionIndex([('command-{:05d}'.format(i), None) for i in range(50000)])
+        elapsed = timeit.timeit(lambda: index.get_matches('command-4999'), number=100) / 100
+        self.assertEqual(len(index.get_matches('command-4999')), 10)
+        self.assertLess(elapsed, 0.005)
+
+    def test_enum_value_completions(self):
+        completer = AzCompleter(mock.MagicMock(), None)
+        argument = mock.MagicMock(choices=['Standard_LRS', 'Premium_LRS', 'Standard_GRS'])
+        completer.cmdtab = {'disk create': mock.MagicMock(arguments={'sku': argument})}
+        completer.current_command = 'disk create'
+        completer.unfinished_word = 'stan'
+        self.assertEqual([comp.text for comp in completer.gen_enum_completions('sku')], ['Standard_LRS', 'Standard_GRS'])
+        completer.unfinished_word = ''
+        self.assertEqual(len(list(completer.gen_enum_completions('sku'))), 3)
+        self.assertEqual(list(completer.value_indexes), [('disk create', 'sku')])
+
+
+class CommandFrequencyTest(unittest.TestCase):
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.shell_ctx = mock.MagicMock()
+        self.shell_ctx.config.get_config_dir.return_value = self.config_dir
+        self.shell_ctx.config.get_command_frequency.return_value = 'command_frequency.json'
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir, ignore_errors=True)
+
+    def test_command_frequency(self):
+        self.assertEqual(load_command_frequency(self.shell_ctx), {})
+        update_command_frequency(self.shell_ctx, 'vm create')
+        update_command_frequency(self.shell_ctx, 'vm create')
+        update_command_frequency(self.shell_ctx, 'vm list')
+        self.assertEqual(load_command_frequency(self.shell_ctx), {'vm': 3, 'vm create': 2, 'vm list': 1})
+
+    def test_command_frequency_not_writable(self):
+        self.shell_ctx.config.get_config_dir.return_value = os.path.join(self.config_dir, 'missing')
+        update_command_frequency(self.shell_ctx, 'vm create')
+        self.assertEqual(load_command_frequency(self.shell_ctx), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
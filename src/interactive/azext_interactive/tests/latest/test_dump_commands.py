@@ -0,0 +1,115 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from azext_interactive.azclishell import _dump_commands
+from azext_interactive.azclishell._dump_commands import CommandMetadataCache, load_help_files
+
+
+HELPS = {
+    'vm': """
+        type: group
+        short-summary: Manage virtual machines.
+        """,
+    'vm create': """
+        type: command
+        short-summary: Create a virtual machine.
+        parameters:
+          - name: --name -n
+            short-summary: Name of the virtual machine.
+        examples:
+          - name: Create a VM.
+            text: az vm create -n MyVm
+        """
+}
+
+
+def _command_data():
+    return {
+        'vm create': {
+            'parameters': {'--name': {'name': ['--name', '-n'], 'required': '', 'help': ''}},
+            'help': '',
+            'examples': ''
+        }
+    }
+
+
+class DumpCommandsTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.cache_dir, 'help_dump.metadata.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_load_help_files(self):
+        data = _command_data()
+        with mock.patch.object(_dump_commands, 'helps', HELPS):
+            load_help_files(data)
+        self.assertEqual(data['vm'], {'help': 'Manage virtual machines.'})
+        self.assertEqual(data['vm create']['help'], 'Create a virtual machine.')
+        self.assertEqual(data['vm create']['parameters']['--name']['help'], 'Name of the virtual machine.')
+        self.assertEqual(data['vm create']['examples'], [['Create a VM.', 'az vm create -n MyVm']])
+
+    def test_load_help_files_memoized(self):
+        help_cache = {}
+        helps = dict(HELPS)
+        with mock.patch.object(_dump_commands, 'helps', helps):
+            load_help_files(_command_data(), help_cache)
+            self.assertEqual(set(help_cache), {'vm', 'vm create'})
+
+            with mock.patch.object(_dump_commands.yaml, 'safe_load') as safe_load:
+                data = _command_data()
+                load_help_files(data, help_cache)
+                safe_load.assert_not_called()
+            self.assertEqual(data['vm create']['help'], 'Create a virtual machine.')
+
+            # only the changed entry is parsed again, the removed one is dropped
+            helps['vm create'] = HELPS['vm create'].replace('Create a virtual machine.', 'Create a VM.')
+            del helps['vm']
+            data = _command_data()
+            load_help_files(data, help_cache)
+            self.assertEqual(data['vm create']['help'], 'Create a VM.')
+            self.assertEqual(set(help_cache), {'vm create'})
+
+    def test_command_metadata_cache(self):
+        command_data = _command_data()['vm create']
+        cache = CommandMetadataCache(self.cache_file, {'azure-cli-core': '2.0.0', 'ext': '1.0.0:1'})
+        self.assertIsNone(cache.get('azure-cli-core', 'vm create'))
+        cache.set('azure-cli-core', 'vm create', command_data)
+        cache.set('ext', 'ext show', command_data)
+        self.assertTrue(cache.is_modified())
+        cache.save()
+
+        # nothing changed
+        cache = CommandMetadataCache(self.cache_file, {'azure-cli-core': '2.0.0', 'ext': '1.0.0:1'})
+        self.assertEqual(cache.get('azure-cli-core', 'vm create'), command_data)
+        self.assertEqual(cache.get('ext', 'ext show'), command_data)
+        self.assertFalse(cache.is_modified())
+
+        # the extension was updated, its commands have to be loaded again
+        cache = CommandMetadataCache(self.cache_file, {'azure-cli-core': '2.0.0', 'ext': '1.1.0:2'})
+        self.assertEqual(cache.get('azure-cli-core', 'vm create'), command_data)
+        self.assertIsNone(cache.get('ext', 'ext show'))
+
+        # the extension was removed
+        cache = CommandMetadataCache(self.cache_file, {'azure-cli-core': '2.0.0'})
+        self.assertEqual(cache.get('azure-cli-core', 'vm create'), command_data)
+        self.assertTrue(cache.is_modified())
+
+    def test_command_metadata_cache_version(self):
+        with open(self.cache_file, 'w') as f:
+            f.write('{"version": 0, "sources": {"azure-cli-core": {"key": "2.0.0", "commands": {"vm": {}}}}}')
+        cache = CommandMetadataCache(self.cache_file, {'azure-cli-core': '2.0.0'})
+        self.assertIsNone(cache.get('azure-cli-core', 'vm'))
+
+
+if __name__ == '__main__':
+    unittest.main()
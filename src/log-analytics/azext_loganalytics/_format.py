@@ -4,10 +4,23 @@
 # --------------------------------------------------------------------------------------------
 
 
+import csv
+import json
 from collections import OrderedDict
 
+RESULT_FORMAT_ROWS = 'rows'
+RESULT_FORMAT_COLUMNAR = 'columnar'
+RESULT_FORMAT_CSV = 'csv'
+RESULT_FORMAT_NDJSON = 'ndjson'
+RESULT_FORMATS = [RESULT_FORMAT_ROWS, RESULT_FORMAT_COLUMNAR, RESULT_FORMAT_CSV, RESULT_FORMAT_NDJSON]
+STREAMED_RESULT_FORMATS = [RESULT_FORMAT_CSV, RESULT_FORMAT_NDJSON]
+
 
 def transform_query_output(result):
+    # the columnar results are returned as received and the streamed results were already written
+    if result is None or isinstance(result, dict):
+        return result
+
     tables_output = []
 
     def _transform_query_output(table):
@@ -32,3 +45,23 @@ def transform_query_output(result):
         tables_output.extend(table_output)
 
     return tables_output
+
+
+def write_query_result(result, result_format, out_file):
+    """Writes the rows of the tables of a columnar result one at a time, as CSV or as lines of JSON.
+    The values keep their type and the name of the table is only added when there are several tables."""
+    tables = result['tables']
+    add_table_name = len(tables) > 1
+    writer = csv.writer(out_file) if result_format == RESULT_FORMAT_CSV else None
+    encode = json.JSONEncoder().encode
+    for table in tables:
+        column_names = [column['name'] for column in table['columns']]
+        rows = table['rows']
+        if add_table_name:
+            column_names.insert(0, 'TableName')
+            rows = ([table['name']] + row for row in rows)
+        if writer:
+            writer.writerow(column_names)
+            writer.writerows(rows)
+        else:
+            out_file.writelines(encode(dict(zip(column_names, row))) + '\n' for row in rows)
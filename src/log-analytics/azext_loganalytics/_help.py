@@ -23,4 +23,13 @@ helps['monitor log-analytics query'] = """
         text: |
           QUERY=$(az monitor log-analytics workspace saved-search show -g resource-group --workspace-name workspace-name -n query-name --query query --output tsv)
           az monitor log-analytics query -w workspace-customId --analytics-query "$QUERY"
+      - name: Export the results of a large query as CSV.
+        text: |
+          az monitor log-analytics query -w workspace-customId --analytics-query "AzureActivity | where TimeGenerated > ago(1d)" --result-format csv --output-file activity.csv
+      - name: Export a week of data by querying each day concurrently.
+        text: |
+          az monitor log-analytics query -w workspace-customId --analytics-query "AzureActivity" -t P7D --time-slices 7 --result-format ndjson --output-file activity.json
+      - name: Get the results with the column names once and typed values.
+        text: |
+          az monitor log-analytics query -w workspace-customId --analytics-query "Heartbeat | summarize count() by Computer" --result-format columnar
 """
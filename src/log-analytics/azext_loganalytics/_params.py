@@ -5,6 +5,10 @@
 
 # pylint: disable=line-too-long
 
+from azure.cli.core.commands.parameters import get_enum_type
+
+from ._format import RESULT_FORMATS
+
 
 def load_arguments(self, _):
     with self.argument_context('monitor log-analytics query') as c:
@@ -12,3 +16,6 @@ def load_arguments(self, _):
         c.argument('analytics_query', help='Query to execute over Log Analytics data.')
         c.argument('timespan', options_list=['--timespan', '-t'], help='Timespan over which to query. Defaults to querying all available data.')
         c.argument('workspaces', nargs='+', help='Additional workspaces to union data for querying. Specify additional workspace IDs separated by space.')
+        c.argument('result_format', arg_type=get_enum_type(RESULT_FORMATS), help='Format of the results. "rows" returns an object per row with the values as strings. "columnar" returns the tables with their columns once and the rows as lists of typed values. "csv" and "ndjson" write the rows as they are read, to stdout or to --output-file. Defaults to "rows".')
+        c.argument('output_file', help='File to write the rows to with --result-format csv or ndjson.')
+        c.argument('time_slices', type=int, help='Split the timespan into this number of consecutive intervals which are queried concurrently, the rows are returned in time order. Use it for queries returning rows over long timespans, the aggregations are computed for each interval.')
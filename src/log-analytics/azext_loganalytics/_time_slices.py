@@ -0,0 +1,58 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import isodate
+
+MAX_CONCURRENT_SLICES = 8
+
+
+def _parse_timespan(timespan):
+    """Start and end of an ISO 8601 time interval: start/end, start/duration, duration/end or a duration until now"""
+    if '/' not in timespan:
+        end = datetime.now(timezone.utc)
+        return end - isodate.parse_duration(timespan), end
+    start, end = timespan.split('/', 1)
+    if start.upper().startswith('P'):
+        end = isodate.parse_datetime(end)
+        return end - isodate.parse_duration(start), end
+    start = isodate.parse_datetime(start)
+    if end.upper().startswith('P'):
+        return start, start + isodate.parse_duration(end)
+    return start, isodate.parse_datetime(end)
+
+
+def split_timespan(timespan, slices):
+    """Splits an ISO 8601 time interval into consecutive intervals of the same length, the earliest first"""
+    start, end = _parse_timespan(timespan)
+    if end <= start:
+        return [timespan]
+    step = (end - start) / slices
+    bounds = [start + step * i for i in range(slices)] + [end]
+    return ['{}/{}'.format(bounds[i].isoformat(), bounds[i + 1].isoformat()) for i in range(slices)]
+
+
+def run_time_slices(query, timespans):
+    """Runs the query for each timespan concurrently, the results are returned in the order of the timespans"""
+    if len(timespans) == 1:
+        return [query(timespans[0])]
+    with ThreadPoolExecutor(max_workers=min(len(timespans), MAX_CONCURRENT_SLICES)) as executor:
+        return list(executor.map(query, timespans))
+
+
+def _get(obj, name):
+    # the tables are models or, for the columnar results, dictionaries
+    return obj[name] if isinstance(obj, dict) else getattr(obj, name)
+
+
+def merge_tables(results):
+    """Appends the rows of the tables of the later results to the tables of the first one"""
+    merged = results[0]
+    for result in results[1:]:
+        for merged_table, table in zip(_get(merged, 'tables'), _get(result, 'tables')):
+            _get(merged_table, 'rows').extend(_get(table, 'rows'))
+    return merged
@@ -3,12 +3,63 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import sys
+
 from knack.log import get_logger
 
+from ._format import RESULT_FORMAT_COLUMNAR, STREAMED_RESULT_FORMATS, write_query_result
+from ._time_slices import merge_tables, run_time_slices, split_timespan
+
 logger = get_logger(__name__)
 
 
-def execute_query(client, workspace, analytics_query, timespan=None, workspaces=None):
+def execute_query(client, workspace, analytics_query, timespan=None, workspaces=None, result_format=None,
+                  output_file=None, time_slices=None):
     """Executes a query against the provided Log Analytics workspace."""
+    from azure.cli.core.azclierror import InvalidArgumentValueError
     from .vendored_sdks.loganalytics.models import QueryBody
-    return client.query(workspace, QueryBody(query=analytics_query, timespan=timespan, workspaces=workspaces))
+    if output_file and result_format not in STREAMED_RESULT_FORMATS:
+        raise InvalidArgumentValueError('--output-file can only be used with --result-format {}.'.format(
+            ' or '.join(STREAMED_RESULT_FORMATS)))
+    if time_slices is not None and time_slices < 1:
+        raise InvalidArgumentValueError('Value of --time-slices has to be at least 1.')
+    if time_slices and not timespan:
+        raise InvalidArgumentValueError('--time-slices can only be used with --timespan.')
+
+    columnar = result_format in [RESULT_FORMAT_COLUMNAR] + STREAMED_RESULT_FORMATS
+
+    def _query(slice_timespan):
+        body = QueryBody(query=analytics_query, timespan=slice_timespan, workspaces=workspaces)
+        if columnar:
+            return _query_columnar(client, workspace, body)
+        return client.query(workspace, body)
+
+    timespans = split_timespan(timespan, time_slices) if time_slices and time_slices > 1 else [timespan]
+    result = merge_tables(run_time_slices(_query, timespans))
+    if not columnar or result_format == RESULT_FORMAT_COLUMNAR:
+        return result
+
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8', newline='') as out_file:
+            write_query_result(result, result_format, out_file)
+    else:
+        write_query_result(result, result_format, sys.stdout)
+        sys.stdout.flush()
+    return None
+
+
+def _query_columnar(client, workspace, body):
+    """Same request as client.query, but the tables of the response are kept as received: the column names once and
+    the rows as lists of typed values, without deserializing every value into the models."""
+    # the generated operation deserializes the response into QueryResults even with raw=True, so the request is built
+    # and sent with the msrest service client of the generated client, the same way the operation does it
+    # pylint: disable=protected-access
+    from .vendored_sdks.loganalytics.models import ErrorResponseException
+    url = client._client.format_url(client.query.metadata['url'],
+                                    workspaceId=client._serialize.url('workspace_id', workspace, 'str'))
+    request = client._client.post(url, {})
+    response = client._client.send(request, {'Content-Type': 'application/json; charset=utf-8'},
+                                   client._serialize.body(body, 'QueryBody'), stream=False)
+    if response.status_code != 200:
+        raise ErrorResponseException(client._deserialize, response)
+    return response.json()
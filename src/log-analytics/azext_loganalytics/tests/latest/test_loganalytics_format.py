@@ -0,0 +1,115 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# pylint: disable=line-too-long
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import unittest
+from unittest import mock
+
+from msrest import Deserializer
+
+from azext_loganalytics._format import transform_query_output, write_query_result
+from azext_loganalytics.custom import execute_query
+from azext_loganalytics.vendored_sdks.loganalytics import models
+
+BENCHMARK_ROWS = 20000
+COLUMNS = [('TimeGenerated', 'datetime'), ('Computer', 'string'), ('Category', 'string'),
+           ('Count', 'long'), ('Duration', 'real'), ('Succeeded', 'bool')]
+
+
+def _get_columnar_result(rows, tables=('PrimaryResult',)):
+    return {'tables': [{'name': name,
+                        'columns': [{'name': column, 'type': column_type} for column, column_type in COLUMNS],
+                        'rows': [['2020-01-01T00:00:{:02d}Z'.format(i % 60), 'vm{}'.format(i % 100), 'Heartbeat',
+                                  i, i / 10, i % 2 == 0] for i in range(rows)]}
+                       for name in tables]}
+
+
+def _measure(func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    # tracing the allocations slows everything down, the memory is measured on another run
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+class LogAnalyticsFormatTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def _get_client(self, result):
+        client = mock.MagicMock()
+        client._client.send.return_value.status_code = 200
+        client._client.send.return_value.json.return_value = result
+        return client
+
+    def test_write_query_result_csv(self):
+        out_file = io.StringIO()
+        write_query_result(_get_columnar_result(2), 'csv', out_file)
+        self.assertEqual(out_file.getvalue().splitlines(), [
+            'TimeGenerated,Computer,Category,Count,Duration,Succeeded',
+            '2020-01-01T00:00:00Z,vm0,Heartbeat,0,0.0,True',
+            '2020-01-01T00:00:01Z,vm1,Heartbeat,1,0.1,False'])
+
+    def test_write_query_result_ndjson(self):
+        out_file = io.StringIO()
+        write_query_result(_get_columnar_result(1, tables=('first', 'second')), 'ndjson', out_file)
+        rows = [json.loads(line) for line in out_file.getvalue().splitlines()]
+        # the values keep their type and the table name is added when there are several tables
+        self.assertEqual(rows[1], {'TableName': 'second', 'TimeGenerated': '2020-01-01T00:00:00Z', 'Computer': 'vm0',
+                                   'Category': 'Heartbeat', 'Count': 0, 'Duration': 0.0, 'Succeeded': True})
+
+    def test_execute_query_output_file(self):
+        client = self._get_client(_get_columnar_result(3))
+        output_file = os.path.join(self.folder, 'result.csv')
+        self.assertIsNone(execute_query(client, 'workspace', 'Heartbeat', result_format='csv', output_file=output_file))
+        # the models are not used to read the result
+        client.query.assert_not_called()
+        self.assertIsNone(transform_query_output(None))
+        with open(output_file, encoding='utf-8') as f:
+            self.assertEqual(len(f.read().splitlines()), 4)
+
+    def test_execute_query_columnar(self):
+        result = _get_columnar_result(3)
+        output = transform_query_output(execute_query(self._get_client(result), 'workspace', 'Heartbeat', result_format='columnar'))
+        self.assertEqual(output, result)
+
+    @unittest.skipUnless(os.environ.get('AZURE_CLI_RUN_BENCHMARKS'), 'set AZURE_CLI_RUN_BENCHMARKS to run the benchmarks')
+    def test_benchmark_result_formats(self):
+        columnar_result = _get_columnar_result(BENCHMARK_ROWS)
+        deserialize = Deserializer({k: v for k, v in models.__dict__.items() if isinstance(v, type)})
+
+        # the default format reads the response into the models before transforming them
+        rows_time, rows_memory = _measure(lambda: transform_query_output(deserialize('QueryResults', columnar_result)))
+        timings = {}
+        for result_format in ['csv', 'ndjson']:
+            with open(os.devnull, 'w', encoding='utf-8') as out_file:
+                timings[result_format] = _measure(lambda: write_query_result(columnar_result, result_format, out_file))  # pylint: disable=cell-var-from-loop
+
+        print('\n{} rows: rows {:.2f}s {:.1f}MiB, {}'.format(
+            BENCHMARK_ROWS, rows_time, rows_memory / 2 ** 20, ', '.join(
+                '{} {:.2f}s {:.1f}MiB'.format(result_format, elapsed, peak / 2 ** 20) for result_format, (elapsed, peak) in timings.items())))
+        for elapsed, peak in timings.values():
+            # no copy of the rows is kept while writing them
+            self.assertLess(peak, rows_memory / 20)
+            self.assertLess(elapsed, rows_time / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# pylint: disable=line-too-long
+import threading
+import time
+import unittest
+from unittest import mock
+
+from azure.cli.core.azclierror import InvalidArgumentValueError
+
+from azext_loganalytics._time_slices import split_timespan
+from azext_loganalytics.custom import execute_query
+from azext_loganalytics.vendored_sdks.loganalytics.models import Column, QueryResults, Table
+
+QUERY_LATENCY = 0.1
+
+
+class FakeLogAnalyticsClient:
+    """Returns a row with the start of the timespan of the query, the later slices answer first."""
+
+    def __init__(self):
+        self.timespans = []
+        self._lock = threading.Lock()
+
+    def query(self, workspace, body):
+        with self._lock:
+            self.timespans.append(body.timespan)
+            latency = QUERY_LATENCY / len(self.timespans)
+        time.sleep(latency)
+        start = body.timespan.split('/')[0]
+        return QueryResults(tables=[Table(name='PrimaryResult', columns=[Column(name='TimeGenerated', type='datetime')],
+                                          rows=[[start]])])
+
+
+class LogAnalyticsTimeSlicesTest(unittest.TestCase):
+
+    def test_split_timespan(self):
+        self.assertEqual(split_timespan('2020-01-01T00:00:00Z/2020-01-03T00:00:00Z', 2),
+                         ['2020-01-01T00:00:00+00:00/2020-01-02T00:00:00+00:00',
+                          '2020-01-02T00:00:00+00:00/2020-01-03T00:00:00+00:00'])
+        self.assertEqual(split_timespan('2020-01-01T00:00:00Z/P2D', 2), split_timespan('P2D/2020-01-03T00:00:00Z', 2))
+        slices = split_timespan('PT3H', 3)
+        self.assertEqual(len(slices), 3)
+        self.assertEqual(slices[0].split('/')[1], slices[1].split('/')[0])
+
+    def test_execute_query_time_slices(self):
+        client = FakeLogAnalyticsClient()
+        start = time.time()
+        result = execute_query(client, 'workspace', 'AzureActivity', timespan='2020-01-01T00:00:00Z/P4D', time_slices=4)
+        self.assertLess(time.time() - start, 2 * QUERY_LATENCY)
+        self.assertEqual(len(client.timespans), 4)
+        # the rows are in time order whatever the order the slices completed in
+        self.assertEqual([row[0] for row in result.tables[0].rows],
+                         ['2020-01-0{}T00:00:00+00:00'.format(day) for day in range(1, 5)])
+
+    def test_execute_query_time_slices_requires_timespan(self):
+        with self.assertRaises(InvalidArgumentValueError):
+            execute_query(mock.MagicMock(), 'workspace', 'AzureActivity', time_slices=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
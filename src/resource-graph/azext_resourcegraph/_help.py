@@ -41,6 +41,23 @@ helps['graph query'] = """
         - name: --allow-partial-scopes -a
           type: bool
           short-summary: Indicates if query should succeed when only partial number of subscription underneath can be processed by server.
+        - name: --all
+          type: bool
+          short-summary: Get all the results of the query by following the skip tokens.
+          long-summary: More than 1000 subscriptions or 10 management groups are queried in concurrent batches and the resources returned by several batches are only kept once. --first sets the size of the pages.
+        - name: --stream
+          type: bool
+          short-summary: With --all, write each row as a line of JSON as soon as its page is received instead of returning all the rows at the end.
+        - name: --cache-ttl
+          type: int
+          short-summary: Seconds for which the result of the query is cached and returned for the same query and options.
+          long-summary: Defaults to the "query_cache_ttl" value of the "graph" section of the CLI config, 0 disables the cache. At most "query_cache_max_entries" (default 100) results are kept in the CLI config directory, the least recently used are removed first.
+        - name: --no-cache
+          type: bool
+          short-summary: Neither use nor update the cached result of the query.
+        - name: --refresh
+          type: bool
+          short-summary: Run the query even if its result is cached, and cache the new result.
     examples:
         - name: Query resources requesting a subset of resource fields.
           text: >
@@ -60,6 +77,18 @@ helps['graph query'] = """
         - name: Query with the skip token.
           text: >
             az graph query -q "where type =~ "Microsoft.Compute" | project name, tags" --skip-token skip_token_value_from_previous_query_response
+        - name: Get all the results of the query.
+          text: >
+            az graph query -q "project id, name, type, location" --all
+        - name: Export all the resources as lines of JSON without keeping them in memory.
+          text: >
+            az graph query -q "project id, name, type, location" --all --stream > resources.jsonl
+        - name: Cache the result of the query for 5 minutes.
+          text: >
+            az graph query -q "summarize count() by type" --cache-ttl 300
+        - name: Cache the results of all the queries for a minute.
+          text: >
+            az config set graph.query_cache_ttl=60
 """
 
 
@@ -42,6 +42,16 @@ def load_arguments(self, _):
         c.argument('allow_partial_scopes', options_list=['--allow-partial-scopes', '-a'],
                    arg_type=get_three_state_flag(), required=False, default=False,
                    help='Indicates if query should succeed when only partial number of subscription underneath can be processed by server.')
+        c.argument('all_pages', options_list=['--all'], action='store_true', required=False, default=False,
+                   help='Get all the results of the query by following the skip tokens. More than 1000 subscriptions or 10 management groups are queried in concurrent batches.')
+        c.argument('stream', options_list=['--stream'], action='store_true', required=False, default=False,
+                   help='With --all, write each row as a line of JSON as soon as its page is received instead of returning all the rows at the end.')
+        c.argument('cache_ttl', options_list=['--cache-ttl'], type=int, required=False, arg_group='Cache',
+                   help='Seconds for which the result of the query is cached and returned for the same query and options. Defaults to the "query_cache_ttl" value of the "graph" section of the CLI config, 0 disables the cache.')
+        c.argument('no_cache', options_list=['--no-cache'], action='store_true', required=False, default=False, arg_group='Cache',
+                   help='Neither use nor update the cached result of the query.')
+        c.argument('refresh', options_list=['--refresh'], action='store_true', required=False, default=False, arg_group='Cache',
+                   help='Run the query even if its result is cached, and cache the new result.')
 
     with self.argument_context('graph shared-query') as c:
         c.argument('graph_query', options_list=['--graph-query', '--q', '-q'],
@@ -0,0 +1,107 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import re
+import time
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+CONFIG_SECTION = 'graph'
+CACHE_TTL_CONFIG = 'query_cache_ttl'
+CACHE_MAX_ENTRIES_CONFIG = 'query_cache_max_entries'
+DEFAULT_CACHE_MAX_ENTRIES = 100
+CACHE_DIR_NAME = 'resourcegraph_query_cache'
+
+
+def get_query_cache(cli_ctx, cache_ttl=None):
+    """The cache of query results, None when caching is disabled.
+    The TTL in seconds comes from --cache-ttl or from the 'graph' section of the CLI config, caching is off
+    by default."""
+    config = cli_ctx.config
+    if cache_ttl is None:
+        cache_ttl = config.getint(CONFIG_SECTION, CACHE_TTL_CONFIG, fallback=0)
+    if not cache_ttl or cache_ttl <= 0:
+        return None
+    max_entries = config.getint(CONFIG_SECTION, CACHE_MAX_ENTRIES_CONFIG, fallback=DEFAULT_CACHE_MAX_ENTRIES)
+    return QueryCache(os.path.join(config.config_dir, CACHE_DIR_NAME), cache_ttl, max_entries)
+
+
+def normalize_query(graph_query):
+    # whitespace outside of the string literals does not change the results
+    parts = re.split(r'''("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')''', graph_query.strip())
+    return ''.join(part if i % 2 else re.sub(r'\s+', ' ', part) for i, part in enumerate(parts))
+
+
+class QueryCache:
+    """Results of the queries stored on disk, one file per query keyed by the query and its options.
+    The entries expire after ttl seconds and the least recently used ones are evicted above max_entries."""
+
+    def __init__(self, path, ttl, max_entries=DEFAULT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @staticmethod
+    def get_key(graph_query, **options):
+        content = json.dumps({'query': normalize_query(graph_query), 'options': options}, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, key + '.json')
+
+    def get(self, key):
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('created', 0) > self.ttl:
+            logger.debug('The cached result of the query has expired')
+            return None
+        try:
+            # the access time is used to find the least recently used entries
+            os.utime(entry_path)
+        except OSError:
+            pass
+        logger.debug('Using the cached result of the query from %s', entry_path)
+        return entry.get('result')
+
+    def put(self, key, result):
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            entry_path = self._entry_path(key)
+            temp_path = '{}.{}.tmp'.format(entry_path, os.getpid())
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'created': time.time(), 'result': result}, f, default=str)
+            os.replace(temp_path, entry_path)
+            self._evict()
+        except OSError as ex:
+            logger.debug('Unable to cache the result of the query: %s', ex)
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.path):
+            if not name.endswith('.json'):
+                continue
+            entry_path = os.path.join(self.path, name)
+            try:
+                entries.append((os.path.getmtime(entry_path), entry_path))
+            except OSError:
+                continue
+        now = time.time()
+        entries.sort()
+        for count, (last_used, entry_path) in enumerate(entries):
+            # entries which can no longer be used are removed too
+            if count < len(entries) - self.max_entries or now - last_used > self.ttl:
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    pass
@@ -23,6 +23,22 @@ def validate_query_args(namespace):
         recommendation = 'Try to pass --subscriptions param only or --management-groups param only.'
         raise InvalidArgumentValueError(error_msg, recommendation)
 
+    if getattr(namespace, 'cache_ttl', None) is not None and namespace.cache_ttl < 0:
+        raise InvalidArgumentValueError("Value of --cache-ttl cannot be negative.")
+
+    if getattr(namespace, 'no_cache', False) and getattr(namespace, 'refresh', False):
+        raise InvalidArgumentValueError('--no-cache and --refresh cannot be used together.')
+
+    if getattr(namespace, 'stream', False) and not getattr(namespace, 'all_pages', False):
+        raise InvalidArgumentValueError('--stream can only be used with --all.')
+
+    if getattr(namespace, 'all_pages', False):
+        if namespace.skip or namespace.skip_token:
+            raise InvalidArgumentValueError('--skip and --skip-token cannot be used with --all.',
+                                            'Remove --skip and --skip-token to get all the results of the query.')
+        # --first is the size of the pages
+        namespace.first = namespace.first or __ROWS_PER_PAGE
+
     if namespace.first is not None:
         namespace.first = min(namespace.first, __ROWS_PER_PAGE)
     elif namespace.skip_token is None:
@@ -3,11 +3,14 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-# pylint: disable=unused-import, broad-except
+# pylint: disable=unused-import, broad-except, line-too-long
 
 import json
 import os
+import sys
+import threading
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import requests
@@ -21,17 +24,57 @@ from knack.log import get_logger
 from knack.util import todict
 
 from azext_resourcegraph.vendored_sdks.resourcegraph.models import ResultTruncated
+from ._query_cache import get_query_cache
 from .vendored_sdks.resourcegraph import ResourceGraphClient
 from .vendored_sdks.resourcegraph.models import \
     QueryRequest, QueryRequestOptions, QueryResponse, ResultFormat, ErrorResponse, Error
 
 __SUBSCRIPTION_LIMIT = 1000
 __MANAGEMENT_GROUP_LIMIT = 10
+__MAX_CONCURRENT_BATCHES = 4
 __logger = get_logger(__name__)
 
 
-def execute_query(client, graph_query, first, skip, subscriptions, management_groups, allow_partial_scopes, skip_token):
-    # type: (ResourceGraphClient, str, int, int, list[str], list[str], bool, str) -> object
+def execute_query(cmd, client, graph_query, first, skip, subscriptions, management_groups, allow_partial_scopes,
+                  skip_token, all_pages=False, stream=False, cache_ttl=None, no_cache=False, refresh=False):
+    # type: (AzCliCommand, ResourceGraphClient, str, int, int, list[str], list[str], bool, str, bool, bool, int, bool, bool) -> object
+    # The rows which are streamed are not kept, so they cannot be cached
+    query_cache = None if no_cache or stream else get_query_cache(cmd.cli_ctx, cache_ttl)
+    if query_cache is None:
+        return _execute_query(client, graph_query, first, skip, subscriptions, management_groups, allow_partial_scopes,
+                              skip_token, all_pages, stream)
+
+    # The results depend on what the signed in identity can read, e.g. the subscriptions under the management groups
+    tenant_id, user_name = _get_current_identity(cmd.cli_ctx)
+    cache_key = query_cache.get_key(
+        graph_query,
+        tenant_id=tenant_id,
+        user_name=user_name,
+        subscriptions=subscriptions or (None if management_groups is not None else _get_cached_subscriptions()),
+        management_groups=management_groups,
+        first=first,
+        skip=skip,
+        skip_token=skip_token,
+        allow_partial_scopes=allow_partial_scopes,
+        all_pages=all_pages)
+    if not refresh:
+        result = query_cache.get(cache_key)
+        if result is not None:
+            return result
+
+    result = _execute_query(client, graph_query, first, skip, subscriptions, management_groups, allow_partial_scopes,
+                            skip_token, all_pages, stream)
+    query_cache.put(cache_key, todict(result))
+    return result
+
+
+def _execute_query(client, graph_query, first, skip, subscriptions, management_groups, allow_partial_scopes, skip_token,
+                   all_pages, stream):
+    # type: (ResourceGraphClient, str, int, int, list[str], list[str], bool, str, bool, bool) -> object
+    if all_pages:
+        return _execute_query_all_pages(client, graph_query, first, subscriptions, management_groups,
+                                        allow_partial_scopes, stream)
+
     mgs_list = management_groups
     if mgs_list is not None and len(mgs_list) > __MANAGEMENT_GROUP_LIMIT:
         mgs_list = mgs_list[:__MANAGEMENT_GROUP_LIMIT]
@@ -54,7 +97,20 @@ def execute_query(client, graph_query, first, skip, subscriptions, management_gr
                               "https://aka.ms/arg-error-toomanysubs".format(__SUBSCRIPTION_LIMIT)
             __logger.warning(warning_message)
 
-    response = None
+    response = _query_resources(client, graph_query, first, skip, subs_list, mgs_list, allow_partial_scopes,
+                                skip_token)
+
+    result_dict = dict()
+    result_dict['data'] = response.data
+    result_dict['count'] = response.count
+    result_dict['total_records'] = response.total_records
+    result_dict['skip_token'] = response.skip_token
+
+    return result_dict
+
+
+def _query_resources(client, graph_query, first, skip, subs_list, mgs_list, allow_partial_scopes, skip_token):
+    # type: (ResourceGraphClient, str, int, int, list[str], list[str], bool, str) -> QueryResponse
     try:
         result_truncated = False
 
@@ -87,15 +143,87 @@ def execute_query(client, graph_query, first, skip, subscriptions, management_gr
 
         raise AzureInternalError(json.dumps(_to_dict(ex.model.error), indent=4)) from ex
 
+    return response
+
+
+def _execute_query_all_pages(client, graph_query, first, subscriptions, management_groups, allow_partial_scopes,
+                             stream):
+    # type: (ResourceGraphClient, str, int, list[str], list[str], bool, bool) -> object
+    # The scopes above the limits of a single request are split into batches which are queried concurrently,
+    # each batch follows its skip tokens until the last page.
+    if management_groups is not None:
+        scopes = [(None, mgs_batch) for mgs_batch in _split(management_groups, __MANAGEMENT_GROUP_LIMIT)]
+    else:
+        subs_list = subscriptions or _get_cached_subscriptions()
+        scopes = [(subs_batch, None) for subs_batch in _split(subs_list, __SUBSCRIPTION_LIMIT)]
+    scopes = scopes or [(subscriptions, management_groups)]
+
+    # The same resource can be returned for several batches, e.g. by nested management groups
+    rows = _QueryRows(stream, deduplicate=len(scopes) > 1)
+
+    def _query_scope(subs_list, mgs_list):
+        skip_token = None
+        while True:
+            response = _query_resources(client, graph_query, first, None, subs_list, mgs_list, allow_partial_scopes,
+                                        skip_token)
+            rows.add(response.data)
+            skip_token = response.skip_token
+            if not skip_token:
+                return
+
+    if len(scopes) == 1:
+        _query_scope(*scopes[0])
+    else:
+        __logger.info("Querying %d batches of scopes", len(scopes))
+        with ThreadPoolExecutor(max_workers=min(len(scopes), __MAX_CONCURRENT_BATCHES)) as executor:
+            futures = [executor.submit(_query_scope, subs_list, mgs_list) for subs_list, mgs_list in scopes]
+            for future in futures:
+                future.result()
+
+    if stream:
+        return None
+
     result_dict = dict()
-    result_dict['data'] = response.data
-    result_dict['count'] = response.count
-    result_dict['total_records'] = response.total_records
-    result_dict['skip_token'] = response.skip_token
+    result_dict['data'] = rows.data
+    result_dict['count'] = rows.count
+    result_dict['total_records'] = rows.count
+    result_dict['skip_token'] = None
 
     return result_dict
 
 
+class _QueryRows:
+    """Rows of the pages of a query, either kept for the result or written to the output as JSON lines."""
+
+    def __init__(self, stream, deduplicate):
+        self.stream = stream
+        self.deduplicate = deduplicate
+        self.data = []
+        self.count = 0
+        self._ids = set()
+        self._lock = threading.Lock()
+
+    def add(self, page):
+        with self._lock:
+            for row in page or []:
+                row_id = row.get('id') if self.deduplicate and isinstance(row, dict) else None
+                if row_id is not None:
+                    if row_id in self._ids:
+                        continue
+                    self._ids.add(row_id)
+                self.count += 1
+                if self.stream:
+                    sys.stdout.write(json.dumps(row, default=str) + '\n')
+                else:
+                    self.data.append(row)
+            if self.stream:
+                sys.stdout.flush()
+
+
+def _split(items, size):
+    return [items[i:i + size] for i in range(0, len(items or []), size)]
+
+
 def create_shared_query(client, resource_group_name,
                         resource_name, description,
                         graph_query, location='global', tags=None):
@@ -116,6 +244,17 @@ def _get_cached_subscriptions():
     return [sub['id'] for sub in cached_subs]
 
 
+def _get_current_identity(cli_ctx):
+    # type: (object) -> tuple[str, str]
+
+    try:
+        account = Profile(cli_ctx=cli_ctx).get_subscription()
+    except Exception as ex:
+        __logger.debug('Failed to get the current account: %s', ex)
+        return None, None
+    return account.get('tenantId'), account.get('user', {}).get('name')
+
+
 def _to_dict(obj):
     if isinstance(obj, Error):
         return _to_dict(todict(obj))
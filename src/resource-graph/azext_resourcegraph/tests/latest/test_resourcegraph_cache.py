@@ -0,0 +1,107 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# pylint: disable=line-too-long
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from azext_resourcegraph._query_cache import QueryCache, get_query_cache, normalize_query
+from azext_resourcegraph.custom import execute_query
+from azext_resourcegraph.vendored_sdks.resourcegraph.models import QueryResponse, ResultTruncated
+
+
+class FakeResourceGraphClient:
+
+    def __init__(self):
+        self.requests = []
+
+    def resources(self, request):
+        self.requests.append(request)
+        data = [{'id': '/subscriptions/sub/resources/{}'.format(len(self.requests))}]
+        return QueryResponse(total_records=1, count=1, result_truncated=ResultTruncated.false, data=data)
+
+
+class ResourceGraphCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.config = {}
+        self.cmd = mock.MagicMock()
+        self.cmd.cli_ctx.config.config_dir = self.config_dir
+        self.cmd.cli_ctx.config.getint.side_effect = lambda section, option, fallback: self.config.get(option, fallback)
+        self.identity = ('tenant', 'user@example.com')
+        patcher = mock.patch('azext_resourcegraph.custom._get_current_identity', side_effect=lambda cli_ctx: self.identity)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir, ignore_errors=True)
+
+    def _query(self, client, graph_query='project id', **kwargs):
+        return execute_query(self.cmd, client, graph_query, 100, 0, ['sub'], None, False, None, **kwargs)
+
+    def test_cache_key_identity(self):
+        self.config['query_cache_ttl'] = 60
+        client = FakeResourceGraphClient()
+
+        def query():
+            return execute_query(self.cmd, client, 'project id', 100, 0, None, ['mg'], False, None)
+
+        result = query()
+        self.assertEqual(query(), result)
+        self.assertEqual(len(client.requests), 1)
+
+        # another identity can read other subscriptions under the same management group
+        self.identity = ('tenant', 'other@example.com')
+        self.assertNotEqual(query(), result)
+        self.identity = ('other-tenant', 'user@example.com')
+        query()
+        self.assertEqual(len(client.requests), 3)
+
+    def test_cache_disabled_by_default(self):
+        self.assertIsNone(get_query_cache(self.cmd.cli_ctx))
+        client = FakeResourceGraphClient()
+        self._query(client)
+        self._query(client)
+        self.assertEqual(len(client.requests), 2)
+
+    def test_cached_result(self):
+        self.config['query_cache_ttl'] = 60
+        client = FakeResourceGraphClient()
+        result = self._query(client, graph_query='project id |  limit 1')
+        self.assertEqual(self._query(client, graph_query=' project id\n| limit 1'), result)
+        self.assertEqual(len(client.requests), 1)
+
+        # other options, --refresh and --no-cache run the query
+        self._query(client, graph_query='project id |  limit 1', cache_ttl=60, stream=False, refresh=True)
+        self.assertEqual(len(client.requests), 2)
+        self.assertEqual(self._query(client, graph_query='project id | limit 1')['data'], [{'id': '/subscriptions/sub/resources/2'}])
+        self._query(client, graph_query='project name | limit 1')
+        self._query(client, graph_query='project id | limit 1', no_cache=True)
+        self.assertEqual(len(client.requests), 4)
+
+    def test_cache_expiry_and_eviction(self):
+        cache = QueryCache(self.config_dir, ttl=60, max_entries=2)
+        for i in range(3):
+            cache.put(cache.get_key('project id', first=i), {'count': i})
+            time.sleep(0.01)
+        self.assertIsNone(cache.get(cache.get_key('project id', first=0)))
+        self.assertEqual(cache.get(cache.get_key('project id', first=2)), {'count': 2})
+        self.assertEqual(len(os.listdir(self.config_dir)), 2)
+
+        cache.ttl = 0
+        time.sleep(0.01)
+        self.assertIsNone(cache.get(cache.get_key('project id', first=2)))
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query(" where  name == 'a  b'\n| limit 1 "), "where name == 'a  b' | limit 1")
+
+
+if __name__ == '__main__':
+    unittest.main()
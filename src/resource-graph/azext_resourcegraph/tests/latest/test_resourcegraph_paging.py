@@ -0,0 +1,107 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# pylint: disable=line-too-long
+import io
+import json
+import threading
+import time
+import unittest
+from argparse import Namespace
+from unittest import mock
+
+from azure.cli.core.azclierror import InvalidArgumentValueError
+
+from azext_resourcegraph._validators import validate_query_args
+from azext_resourcegraph.custom import execute_query
+from azext_resourcegraph.vendored_sdks.resourcegraph.models import QueryResponse, ResultTruncated
+
+PAGE_LATENCY = 0.05
+
+
+class FakeResourceGraphClient:
+    """Returns `pages` pages of rows for each batch of subscriptions, the last row of a batch is shared by all of them."""
+
+    def __init__(self, pages=3, rows_per_page=2):
+        self.pages = pages
+        self.rows_per_page = rows_per_page
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def resources(self, request):
+        with self._lock:
+            self.requests.append(request)
+        time.sleep(PAGE_LATENCY)
+        batch = request.subscriptions[0] if request.subscriptions else request.management_groups[0]
+        page = int(request.options.skip_token or 0)
+        data = [{'id': '/subscriptions/{}/resources/{}-{}'.format(batch, page, row)} for row in range(self.rows_per_page)]
+        skip_token = str(page + 1) if page + 1 < self.pages else None
+        if skip_token is None:
+            data[-1] = {'id': '/providers/shared'}
+        return QueryResponse(total_records=len(data), count=len(data), result_truncated=ResultTruncated.false,
+                             data=data, skip_token=skip_token)
+
+
+class ResourceGraphPagingTest(unittest.TestCase):
+
+    def _query(self, client, subscriptions=None, management_groups=None, first=1000, stream=False):
+        return execute_query(mock.MagicMock(), client, 'project id', first, None, subscriptions, management_groups, False, None,
+                             all_pages=True, stream=stream, no_cache=True)
+
+    def test_all_pages_follows_skip_tokens(self):
+        client = FakeResourceGraphClient()
+        result = self._query(client, subscriptions=['sub'])
+        self.assertEqual([request.options.skip_token for request in client.requests], [None, '1', '2'])
+        self.assertEqual(result['count'], 6)
+        self.assertEqual(result['total_records'], 6)
+        self.assertIsNone(result['skip_token'])
+        self.assertEqual(result['data'][-1], {'id': '/providers/shared'})
+
+    def test_all_pages_batches_subscriptions(self):
+        client = FakeResourceGraphClient()
+        subscriptions = ['sub{}'.format(i) for i in range(2500)]
+        start = time.time()
+        result = self._query(client, subscriptions=subscriptions)
+        # the three batches are queried at the same time
+        self.assertLess(time.time() - start, 5 * PAGE_LATENCY)
+        batches = {tuple(request.subscriptions) for request in client.requests}
+        self.assertEqual(sorted(len(batch) for batch in batches), [500, 1000, 1000])
+        self.assertEqual(len(client.requests), 9)
+        # the row returned by each batch is only kept once
+        self.assertEqual(result['count'], 3 * 6 - 2)
+        self.assertEqual(len({row['id'] for row in result['data']}), result['count'])
+
+    def test_all_pages_batches_management_groups(self):
+        client = FakeResourceGraphClient(pages=1)
+        result = self._query(client, management_groups=['mg{}'.format(i) for i in range(15)])
+        self.assertEqual(sorted(len(request.management_groups) for request in client.requests), [5, 10])
+        self.assertTrue(all(request.subscriptions is None for request in client.requests))
+        self.assertEqual(result['count'], 3)
+
+    def test_all_pages_stream(self):
+        client = FakeResourceGraphClient()
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            result = self._query(client, subscriptions=['sub'], stream=True)
+        self.assertIsNone(result)
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0], {'id': '/subscriptions/sub/resources/0-0'})
+
+    def test_validate_all_pages_args(self):
+        namespace = Namespace(first=None, skip=None, skip_token=None, subscriptions=None, management_groups=None,
+                              all_pages=True, stream=False)
+        validate_query_args(namespace)
+        self.assertEqual(namespace.first, 1000)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            validate_query_args(Namespace(first=None, skip=None, skip_token='token', subscriptions=None,
+                                          management_groups=None, all_pages=True, stream=False))
+        with self.assertRaises(InvalidArgumentValueError):
+            validate_query_args(Namespace(first=None, skip=None, skip_token=None, subscriptions=None,
+                                          management_groups=None, all_pages=False, stream=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,7 @@
 from codecs import open
 from setuptools import setup, find_packages
 
-VERSION = "2.1.0"
+VERSION = "2.3.0"
 
 CLASSIFIERS = [
     'Development Status :: 4 - Beta',
@@ -10,7 +10,11 @@ import tempfile
 import uuid
 from azure.cli.core.azclierror import InvalidArgumentValueError
 from azure.cli.core.profiles import ResourceType, get_sdk
-from ._utils import (get_azure_files_info, _pack_source_code)
+from knack.log import get_logger
+from ._utils import (get_azure_files_info, get_compression_workers, _pack_source_code)
+from ._ranged_upload import MAX_UPLOAD_ATTEMPTS, upload_file_in_ranges
+
+logger = get_logger(__name__)
 
 
 class Empty:
@@ -43,7 +47,30 @@ class FileUpload:
     def _upload(self, artifact_path):
         FileService = get_sdk(self.cli_ctx, ResourceType.DATA_STORAGE, 'file#FileService')
         file_service = FileService(self.account_name, sas_token=self.sas_token, endpoint_suffix=self.endpoint_suffix)
-        file_service.create_file_from_path(self.share_name, None, self.relative_name, artifact_path)
+        # the SaS token is left out so that a new token for the same file can resume the upload
+        upload_url = 'https://{}.file.{}/{}/{}'.format(self.account_name, self.endpoint_suffix,
+                                                       self.share_name, self.relative_name)
+        journal_folder = os.path.join(self.cli_ctx.config.config_dir, 'spring_upload_journal')
+        progress_bar = self.cli_ctx.get_progress_controller(det=True)
+        progress_bar.begin(message='Uploading')
+
+        def _report_progress(current, total):
+            progress_bar.add(message='Uploading', value=current, total_val=total)
+
+        try:
+            for attempt in range(1, MAX_UPLOAD_ATTEMPTS + 1):
+                try:
+                    upload_file_in_ranges(file_service, self.share_name, None, self.relative_name, artifact_path,
+                                          upload_url, journal_folder, progress_callback=_report_progress)
+                    break
+                except Exception as ex:  # pylint: disable=broad-except
+                    if attempt == MAX_UPLOAD_ATTEMPTS:
+                        raise
+                    # the ranges already written are recorded in the journal, only the missing ones are sent again
+                    logger.warning('Upload interrupted, resuming it (attempt %d of %d): %s',
+                                   attempt + 1, MAX_UPLOAD_ATTEMPTS, ex)
+        finally:
+            progress_bar.end()
 
 
 class FolderUpload(FileUpload):
@@ -58,7 +85,8 @@ class FolderUpload(FileUpload):
 
     def _compress_folder(self, folder):
         file_path = os.path.join(tempfile.gettempdir(), 'build_archive_{}.tar.gz'.format(uuid.uuid4().hex))
-        _pack_source_code(os.path.abspath(folder), file_path)
+        _pack_source_code(os.path.abspath(folder), file_path,
+                          compression_workers=get_compression_workers(self.cli_ctx))
         return file_path
 
 
@@ -363,6 +363,8 @@ def load_arguments(self, _):
             '--deployment', '-d'], help='Name of an existing deployment of the app. Default to the production deployment if not specified.', validator=fulfill_deployment_param)
         c.argument('format_json', nargs='?', const='{timestamp} {level:>5} [{thread:>15.15}] {logger{39}:<40.40}: {message}\n{stackTrace}',
                    help='Format JSON logs if structured log is enabled')
+        c.argument('all_instances', action='store_true',
+                   help='Show the logs of all the instances of the deployment, each line is prefixed with the name of its instance.')
 
     with self.argument_context('spring app logs') as c:
         prepare_logs_argument(c)
@@ -0,0 +1,175 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+# the maximum size of a range written to Azure Files in one request
+UPLOAD_RANGE_SIZE = 4 * 1024 * 1024
+MAX_UPLOAD_CONNECTIONS = 8
+MAX_RANGE_RETRIES = 3
+RANGE_RETRY_BACKOFF_SECONDS = 2
+# the whole upload is resumed from the journal that many times when ranges still fail after their retries
+MAX_UPLOAD_ATTEMPTS = 3
+# journals left by uploads which were never resumed are deleted after a week
+JOURNAL_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def get_file_hash(file_path):
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+class UploadJournal:
+    '''
+    Record on disk the ranges of an artifact already written to an upload url,
+    so that an interrupted upload of the same artifact to the same url only sends the missing ranges.
+    '''
+    def __init__(self, folder, artifact_hash, upload_url, file_size, range_size):
+        key = hashlib.sha256('{}\n{}'.format(artifact_hash, upload_url).encode('utf-8')).hexdigest()
+        self.folder = folder
+        self.path = os.path.join(folder, '{}.json'.format(key))
+        self.file_size = file_size
+        self.range_size = range_size
+        self.completed = set()
+        self._lock = Lock()
+
+    def load(self):
+        '''
+        Load the ranges recorded by a previous upload, return whether there was one.
+        '''
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if journal.get('file_size') != self.file_size or journal.get('range_size') != self.range_size:
+            return False
+        self.completed = set(journal.get('completed', []))
+        return True
+
+    def add(self, start):
+        with self._lock:
+            self.completed.add(start)
+            self._save()
+
+    def reset(self):
+        self._delete_stale_journals()
+        with self._lock:
+            self.completed = set()
+            self._save()
+
+    def _delete_stale_journals(self):
+        try:
+            entries = list(os.scandir(self.folder))
+        except OSError:
+            return
+        now = time.time()
+        for entry in entries:
+            try:
+                if entry.is_file() and now - entry.stat().st_mtime > JOURNAL_MAX_AGE_SECONDS:
+                    os.remove(entry.path)
+                    logger.debug('Deleted the stale upload journal %s', entry.path)
+            except OSError:
+                pass
+
+    def delete(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _save(self):
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'file_size': self.file_size,
+                           'range_size': self.range_size,
+                           'completed': sorted(self.completed)}, f)
+            os.replace(temp_path, self.path)
+        except OSError as ex:
+            # the upload goes on without being resumable
+            logger.debug('Failed to save the upload journal %s: %s', self.path, ex)
+
+
+def _get_ranges(file_size, range_size):
+    return [(start, min(start + range_size, file_size) - 1) for start in range(0, file_size, range_size)]
+
+
+def _upload_range(file_service, share_name, directory_name, file_name, file_path, journal, start, end):
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start + 1)
+    for attempt in range(MAX_RANGE_RETRIES + 1):
+        try:
+            file_service.update_range(share_name, directory_name, file_name, data, start, end)
+            # recorded as soon as it is written so that the ranges still in flight on a failure are not sent again
+            journal.add(start)
+            return len(data)
+        except Exception as ex:  # pylint: disable=broad-except
+            if attempt == MAX_RANGE_RETRIES:
+                raise
+            logger.warning('Failed to upload bytes %d-%d, retrying: %s', start, end, ex)
+            time.sleep(RANGE_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+    return None
+
+
+def _can_resume(file_service, share_name, directory_name, file_name, journal):
+    if not journal.load():
+        return False
+    try:
+        properties = file_service.get_file_properties(share_name, directory_name, file_name).properties
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return properties.content_length == journal.file_size
+
+
+def upload_file_in_ranges(file_service, share_name, directory_name, file_name, file_path, upload_url,
+                          journal_folder, range_size=UPLOAD_RANGE_SIZE, max_connections=MAX_UPLOAD_CONNECTIONS,
+                          progress_callback=None):
+    '''
+    Upload a local file to Azure Files in fixed-size ranges sent concurrently.
+    Each range is retried on its own when it fails, and the ranges already written are recorded in a journal
+    keyed by the hash of the file and the upload url, so that uploading again the same file to the same url
+    resumes the upload.
+    '''
+    file_size = os.path.getsize(file_path)
+    journal = UploadJournal(journal_folder, get_file_hash(file_path), upload_url, file_size, range_size)
+    if _can_resume(file_service, share_name, directory_name, file_name, journal):
+        logger.info('Resuming the upload of %s, %d ranges already uploaded.', file_path, len(journal.completed))
+    else:
+        file_service.create_file(share_name, directory_name, file_name, file_size)
+        journal.reset()
+
+    uploaded = sum(end - start + 1 for start, end in _get_ranges(file_size, range_size) if start in journal.completed)
+    ranges = [(start, end) for start, end in _get_ranges(file_size, range_size) if start not in journal.completed]
+    if progress_callback:
+        progress_callback(uploaded, file_size)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_connections, len(ranges)))) as executor:
+        futures = [executor.submit(_upload_range, file_service, share_name, directory_name, file_name,
+                                   file_path, journal, start, end) for start, end in ranges]
+        try:
+            for future in as_completed(futures):
+                uploaded += future.result()
+                if progress_callback:
+                    progress_callback(uploaded, file_size)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    journal.delete()
@@ -31,6 +31,7 @@ from azure.cli.core.commands import cached_put
 from ._resource_quantity import validate_cpu, validate_memory
 from six.moves.urllib import parse
 from threading import Thread
+from queue import Empty, Queue
 import sys
 import json
 import base64
@@ -47,6 +48,8 @@ APP_CREATE_OR_UPDATE_SLEEP_INTERVAL = 2
 NO_PRODUCTION_DEPLOYMENT_ERROR = "No production deployment found, use --deployment to specify deployment or create deployment with: az spring app deployment create"
 NO_PRODUCTION_DEPLOYMENT_SET_ERROR = "This app has no production deployment, use \"az spring app deployment create\" to create a deployment and \"az spring app set-deployment\" to set production deployment."
 DELETE_PRODUCTION_DEPLOYMENT_WARNING = "You are going to delete production deployment, the app will be inaccessible after this operation."
+LOG_STREAM_INSTANCE_BUFFER_LINES = 1000
+LOG_STREAM_INSTANCE_BATCH_LINES = 100
 LOG_RUNNING_PROMPT = "This command usually takes minutes to run. Add '--verbose' parameter if needed."
 
 
@@ -389,33 +392,36 @@ def app_get_build_log(cmd, client, resource_group, service, name, deployment=Non
 
 
 def app_tail_log(cmd, client, resource_group, service, name,
-                 deployment=None, instance=None, follow=False, lines=50, since=None, limit=2048, format_json=None):
+                 deployment=None, instance=None, follow=False, lines=50, since=None, limit=2048, format_json=None,
+                 all_instances=False):
     app_tail_log_internal(cmd, client, resource_group, service, name, deployment, instance, follow, lines, since, limit,
-                          format_json, get_app_log=_get_app_log)
+                          format_json, get_app_log=_get_app_log, all_instances=all_instances)
 
 
 def app_tail_log_internal(cmd, client, resource_group, service, name,
                           deployment=None, instance=None, follow=False, lines=50, since=None, limit=2048,
-                          format_json=None, timeout=None, get_app_log=None):
+                          format_json=None, timeout=None, get_app_log=None, all_instances=False):
+    if instance and all_instances:
+        raise InvalidArgumentValueError("'-i/--instance' and '--all-instances' cannot be used together")
+    instance_names = [instance]
     if not instance:
         if not deployment.properties.instances:
             raise CLIError("No instances found for deployment '{0}' in app '{1}'".format(
                 deployment.name, name))
         instances = deployment.properties.instances
-        if len(instances) > 1:
+        if len(instances) > 1 and not all_instances:
             logger.warning("Multiple app instances found:")
             for temp_instance in instances:
                 logger.warning("{}".format(temp_instance.name))
-            logger.warning("Please use '-i/--instance' parameter to specify the instance name")
+            logger.warning("Please use '-i/--instance' parameter to specify the instance name, "
+                           "or '--all-instances' to show the logs of all of them")
             return None
-        instance = instances[0].name
+        instance_names = [temp_instance.name for temp_instance in instances]
 
     log_stream = LogStream(client, resource_group, service)
     if not log_stream:
         raise CLIError("To use the log streaming feature, please enable the test endpoint by running 'az spring test-endpoint enable -n {0} -g {1}'".format(service, resource_group))
 
-    streaming_url = "https://{0}/api/logstream/apps/{1}/instances/{2}".format(
-        log_stream.base_url, name, instance)
     params = {}
     params["tailLines"] = lines
     params["limitBytes"] = limit
@@ -425,9 +431,17 @@ def app_tail_log_internal(cmd, client, resource_group, service, name,
         params["follow"] = True
 
     exceptions = []
-    streaming_url += "?{}".format(parse.urlencode(params)) if params else ""
-    t = Thread(target=get_app_log, args=(
-        streaming_url, "primary", log_stream.primary_key, format_json, exceptions))
+    streaming_urls = {}
+    for instance_name in instance_names:
+        streaming_urls[instance_name] = "https://{0}/api/logstream/apps/{1}/instances/{2}".format(
+            log_stream.base_url, name, instance_name)
+        streaming_urls[instance_name] += "?{}".format(parse.urlencode(params)) if params else ""
+    if len(instance_names) > 1:
+        t = Thread(target=_get_app_log_of_instances, args=(
+            streaming_urls, "primary", log_stream.primary_key, format_json, exceptions))
+    else:
+        t = Thread(target=get_app_log, args=(
+            streaming_urls[instance_names[0]], "primary", log_stream.primary_key, format_json, exceptions))
     t.daemon = True
     t.start()
 
@@ -979,128 +993,180 @@ def _get_redis_primary_key(cli_ctx, resource_id):
     return keys.primary_key
 
 
-# pylint: disable=bare-except, too-many-statements
-def _get_app_log(url, user_name, password, format_json, exceptions, chunk_size=None, stderr=False):
+def _build_log_shortener(length):
     logger_seg_regex = re.compile(r'([^\.])[^\.]+\.')
 
-    def build_log_shortener(length):
-        if length <= 0:
-            raise InvalidArgumentValueError('Logger length in `logger{length}` should be positive')
-
-        def shortener(record):
-            '''
-            Try shorten the logger property to the specified length before feeding it to the formatter.
-            '''
-            logger_name = record.get('logger', None)
-            if logger_name is None:
-                return record
-
-            # first, try to shorten the package name to one letter, e.g.,
-            #     org.springframework.cloud.netflix.eureka.config.DiscoveryClientOptionalArgsConfiguration
-            # to: o.s.c.n.e.c.DiscoveryClientOptionalArgsConfiguration
-            while len(logger_name) > length:
-                logger_name, count = logger_seg_regex.subn(r'\1.', logger_name, 1)
-                if count < 1:
-                    break
+    if length <= 0:
+        raise InvalidArgumentValueError('Logger length in `logger{length}` should be positive')
 
-            # then, cut off the leading packages if necessary
-            logger_name = logger_name[-length:]
-            record['logger'] = logger_name
+    def shortener(record):
+        '''
+        Try shorten the logger property to the specified length before feeding it to the formatter.
+        '''
+        logger_name = record.get('logger', None)
+        if logger_name is None:
             return record
 
-        return shortener
+        # first, try to shorten the package name to one letter, e.g.,
+        #     org.springframework.cloud.netflix.eureka.config.DiscoveryClientOptionalArgsConfiguration
+        # to: o.s.c.n.e.c.DiscoveryClientOptionalArgsConfiguration
+        while len(logger_name) > length:
+            logger_name, count = logger_seg_regex.subn(r'\1.', logger_name, 1)
+            if count < 1:
+                break
 
-    def build_formatter():
-        '''
-        Build the log line formatter based on the format_json argument.
-        '''
-        nonlocal format_json
+        # then, cut off the leading packages if necessary
+        logger_name = logger_name[-length:]
+        record['logger'] = logger_name
+        return record
 
-        def identity(o):
-            return o
+    return shortener
 
-        if format_json is None or len(format_json) == 0:
-            return identity
 
-        logger_regex = re.compile(r'\blogger\{(\d+)\}')
-        match = logger_regex.search(format_json)
-        pre_processor = identity
-        if match:
-            length = int(match[1])
-            pre_processor = build_log_shortener(length)
-            format_json = logger_regex.sub('logger', format_json, 1)
+# pylint: disable=bare-except
+def _build_log_formatter(format_json):
+    '''
+    Build the log line formatter based on the format_json argument.
+    '''
+    def identity(o):
+        return o
 
-        first_exception = True
+    if format_json is None or len(format_json) == 0:
+        return identity
 
-        def format_line(line):
-            nonlocal first_exception
-            try:
-                log_record = json.loads(line)
-                # Add n=\n so that in Windows CMD it's easy to specify customized format with line ending
-                # e.g., "{timestamp} {message}{n}"
-                # (Windows CMD does not escape \n in string literal.)
-                return format_json.format_map(pre_processor(defaultdict(str, n="\n", **log_record)))
-            except:
-                if first_exception:
-                    # enable this format error logging only with --verbose
-                    logger.info("Failed to format log line '{}'".format(line), exc_info=sys.exc_info())
-                    first_exception = False
-                return line
-
-        return format_line
-
-    def iter_lines(response, limit=2 ** 20, chunk_size=None):
-        '''
-        Returns a line iterator from the response content. If no line ending was found and the buffered content size is
-        larger than the limit, the buffer will be yielded directly.
-        '''
-        buffer = []
-        total = 0
-        for content in response.iter_content(chunk_size=chunk_size):
-            if not content:
-                if len(buffer) > 0:
-                    yield b''.join(buffer)
-                break
+    logger_regex = re.compile(r'\blogger\{(\d+)\}')
+    match = logger_regex.search(format_json)
+    pre_processor = identity
+    if match:
+        length = int(match[1])
+        pre_processor = _build_log_shortener(length)
+        format_json = logger_regex.sub('logger', format_json, 1)
+
+    first_exception = True
 
-            start = 0
-            while start < len(content):
-                line_end = content.find(b'\n', start)
-                should_print = False
-                if line_end < 0:
-                    next = (content if start == 0 else content[start:])
-                    buffer.append(next)
-                    total += len(next)
-                    start = len(content)
-                    should_print = total >= limit
-                else:
-                    buffer.append(content[start:line_end + 1])
-                    start = line_end + 1
-                    should_print = True
-
-                if should_print:
-                    yield b''.join(buffer)
-                    buffer.clear()
-                    total = 0
+    def format_line(line):
+        nonlocal first_exception
+        try:
+            log_record = json.loads(line)
+            # Add n=\n so that in Windows CMD it's easy to specify customized format with line ending
+            # e.g., "{timestamp} {message}{n}"
+            # (Windows CMD does not escape \n in string literal.)
+            return format_json.format_map(pre_processor(defaultdict(str, n="\n", **log_record)))
+        except:
+            if first_exception:
+                # enable this format error logging only with --verbose
+                logger.info("Failed to format log line '{}'".format(line), exc_info=sys.exc_info())
+                first_exception = False
+            return line
+
+    return format_line
+
+
+def _iter_lines(response, limit=2 ** 20, chunk_size=None):
+    '''
+    Returns a line iterator from the response content. If no line ending was found and the buffered content size is
+    larger than the limit, the buffer will be yielded directly.
+    '''
+    buffer = []
+    total = 0
+    for content in response.iter_content(chunk_size=chunk_size):
+        if not content:
+            break
+
+        start = 0
+        while start < len(content):
+            line_end = content.find(b'\n', start)
+            should_print = False
+            if line_end < 0:
+                next = (content if start == 0 else content[start:])
+                buffer.append(next)
+                total += len(next)
+                start = len(content)
+                should_print = total >= limit
+            else:
+                buffer.append(content[start:line_end + 1])
+                start = line_end + 1
+                should_print = True
+
+            if should_print:
+                yield b''.join(buffer)
+                buffer.clear()
+                total = 0
+
+    # the content may not end with a line ending
+    if len(buffer) > 0:
+        yield b''.join(buffer)
 
+
+def _iter_app_log(url, user_name, password, format_json, chunk_size=None):
+    '''
+    Returns the formatted lines of the log streamed from the url.
+    '''
     with requests.get(url, stream=True, auth=HTTPBasicAuth(user_name, password)) as response:
+        if response.status_code != 200:
+            raise CLIError("Failed to connect to the server with status code '{}' and reason '{}'".format(
+                response.status_code, response.reason))
+        std_encoding = sys.stdout.encoding
+
+        formatter = _build_log_formatter(format_json)
+
+        for line in _iter_lines(response, chunk_size=chunk_size):
+            decoded = (line.decode(encoding='utf-8', errors='replace')
+                       .encode(std_encoding, errors='replace')
+                       .decode(std_encoding, errors='replace'))
+            yield formatter(decoded)
+
+
+def _get_app_log(url, user_name, password, format_json, exceptions, chunk_size=None, stderr=False):
+    try:
+        for line in _iter_app_log(url, user_name, password, format_json, chunk_size=chunk_size):
+            if stderr:
+                print(line, end='', file=sys.stderr)
+            else:
+                print(line, end='')
+    except CLIError as e:
+        exceptions.append(e)
+
+
+def _get_app_log_of_instances(urls, user_name, password, format_json, exceptions, chunk_size=None):
+    '''
+    Streams the logs of several instances at the same time, urls maps the instance names to their log stream url.
+    Each line is prefixed with the name of its instance. The lines of each instance are buffered in a bounded queue and
+    the queues are printed in turns, so a noisy instance waits for its turn instead of holding back the others.
+    '''
+    queues = {instance: Queue(maxsize=LOG_STREAM_INSTANCE_BUFFER_LINES) for instance in urls}
+    readers = []
+
+    def read_instance_log(instance, url):
         try:
-            if response.status_code != 200:
-                raise CLIError("Failed to connect to the server with status code '{}' and reason '{}'".format(
-                    response.status_code, response.reason))
-            std_encoding = sys.stdout.encoding
-
-            formatter = build_formatter()
-
-            for line in iter_lines(response, chunk_size=chunk_size):
-                decoded = (line.decode(encoding='utf-8', errors='replace')
-                           .encode(std_encoding, errors='replace')
-                           .decode(std_encoding, errors='replace'))
-                if stderr:
-                    print(formatter(decoded), end='', file=sys.stderr)
-                else:
-                    print(formatter(decoded), end='')
+            for line in _iter_app_log(url, user_name, password, format_json, chunk_size=chunk_size):
+                queues[instance].put(line)
         except CLIError as e:
-            exceptions.append(e)
+            exceptions.append(CLIError("Failed to get the log of instance '{}': {}".format(instance, e)))
+
+    for instance, url in urls.items():
+        reader = Thread(target=read_instance_log, args=(instance, url))
+        reader.daemon = True
+        reader.start()
+        readers.append(reader)
+
+    while True:
+        all_done = not any(reader.is_alive() for reader in readers)
+        printed = False
+        for instance, instance_queue in queues.items():
+            for _ in range(LOG_STREAM_INSTANCE_BATCH_LINES):
+                try:
+                    line = instance_queue.get_nowait()
+                except Empty:
+                    break
+                printed = True
+                # the formatted log of a line can span several lines, and each of them is ended so that the log of
+                # another instance does not continue it
+                print(''.join('[{}] {}\n'.format(instance, part) for part in line.splitlines()), end='')
+        if not printed:
+            if all_done:
+                return
+            sleep(0.1)
 
 
 def storage_callback(pipeline_response, deserialized, headers):
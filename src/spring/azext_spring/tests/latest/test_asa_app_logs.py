@@ -0,0 +1,101 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from urllib.parse import urlparse
+
+from azure.cli.core.azclierror import InvalidArgumentValueError
+from knack.util import CLIError
+
+from ...custom import _get_app_log, _get_app_log_of_instances, app_tail_log_internal
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    from unittest import mock
+
+
+class Output(io.StringIO):
+    encoding = 'utf-8'
+
+
+class FakeLogResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.reason = 'OK' if status_code == 200 else 'Not Found'
+
+    def iter_content(self, chunk_size=None):
+        chunk_size = chunk_size or 7
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+def _fake_get(logs):
+    def get(url, stream, auth):
+        instance = urlparse(url).path.rsplit('/', 1)[-1]
+        if instance not in logs:
+            return FakeLogResponse(b'', status_code=404)
+        return FakeLogResponse(logs[instance])
+    return get
+
+
+class TestAppLogs(unittest.TestCase):
+    def _get_urls(self, *instances):
+        return {instance: 'https://service.test.azuremicroservices.io/api/logstream/apps/app/instances/{}?follow=True'.format(instance)
+                for instance in instances}
+
+    def test_get_app_log(self):
+        urls = self._get_urls('app-1')
+        exceptions = []
+        output = Output()
+        record = {'timestamp': '2022-01-01', 'level': 'INFO', 'logger': 'org.springframework.boot.Application', 'message': 'Started'}
+        with mock.patch('requests.get', side_effect=_fake_get({'app-1': json.dumps(record).encode() + b'\n'})), redirect_stdout(output):
+            _get_app_log(urls['app-1'], 'primary', 'key', '{level} {logger{11}} {message}\n', exceptions)
+        self.assertEqual(exceptions, [])
+        self.assertEqual(output.getvalue(), 'INFO Application Started\n')
+
+    def test_get_app_log_of_instances(self):
+        logs = {
+            'app-1': b''.join(b'noisy line %d\n' % i for i in range(5000)),
+            'app-2': b'quiet line\npartial line',
+        }
+        exceptions = []
+        output = Output()
+        with mock.patch('requests.get', side_effect=_fake_get(logs)), redirect_stdout(output):
+            _get_app_log_of_instances(self._get_urls('app-1', 'app-2', 'app-3'), 'primary', 'key', None, exceptions)
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 5002)
+        self.assertEqual([line for line in lines if line.startswith('[app-1] ')][-1], '[app-1] noisy line 4999')
+        # the quiet instance does not wait for the noisy one to be done
+        self.assertLess(lines.index('[app-2] quiet line'), 1000)
+        self.assertIn('[app-2] partial line', lines)
+        self.assertEqual(len(exceptions), 1)
+        self.assertIn("instance 'app-3'", str(exceptions[0]))
+
+    def test_app_tail_log_all_instances(self):
+        deployment = mock.MagicMock()
+        deployment.properties.instances = [mock.MagicMock(), mock.MagicMock()]
+        deployment.properties.instances[0].name = 'app-1'
+        deployment.properties.instances[1].name = 'app-2'
+        output = Output()
+        with mock.patch('azext_spring.custom.LogStream') as log_stream, \
+                mock.patch('requests.get', side_effect=_fake_get({'app-1': b'line 1\n', 'app-2': b'line 2\n'})), \
+                redirect_stdout(output):
+            log_stream.return_value.base_url = 'service.test.azuremicroservices.io'
+            app_tail_log_internal(None, None, 'rg', 'service', 'app', deployment, timeout=5, all_instances=True)
+        self.assertEqual(sorted(output.getvalue().splitlines()), ['[app-1] line 1', '[app-2] line 2'])
+
+        with self.assertRaises(InvalidArgumentValueError):
+            app_tail_log_internal(None, None, 'rg', 'service', 'app', deployment, instance='app-1', all_instances=True)
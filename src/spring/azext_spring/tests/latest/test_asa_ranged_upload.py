@@ -0,0 +1,139 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from ..._deployment_uploadable_factory import FileUpload
+from ..._ranged_upload import upload_file_in_ranges
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    from unittest import mock
+
+RANGE_SIZE = 1024
+UPLOAD_URL = 'https://account.file.core.windows.net/share/resources/artifact.jar'
+
+
+class FakeFileService:
+    '''
+    Keep the content of a single file in memory, the starts of the ranges in fail_ranges fail as many times as given.
+    '''
+    def __init__(self, fail_ranges=None):
+        self.content = None
+        self.created = 0
+        self.uploaded_ranges = []
+        self.fail_ranges = dict(fail_ranges or {})
+        self._lock = threading.Lock()
+
+    def create_file(self, share_name, directory_name, file_name, content_length):
+        self.content = bytearray(content_length)
+        self.created += 1
+
+    def get_file_properties(self, share_name, directory_name, file_name):
+        if self.content is None:
+            raise Exception('ResourceNotFound')
+        return mock.MagicMock(properties=mock.MagicMock(content_length=len(self.content)))
+
+    def update_range(self, share_name, directory_name, file_name, data, start_range, end_range):
+        with self._lock:
+            if self.fail_ranges.get(start_range):
+                self.fail_ranges[start_range] -= 1
+                raise ConnectionError('Connection aborted.')
+            self.uploaded_ranges.append(start_range)
+        assert len(data) == end_range - start_range + 1
+        self.content[start_range:end_range + 1] = data
+
+
+class TestRangedUpload(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.journal_folder = os.path.join(self.folder, 'journal')
+        self.artifact_path = os.path.join(self.folder, 'artifact.jar')
+        self.data = os.urandom(RANGE_SIZE * 10 + 100)
+        with open(self.artifact_path, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def _upload(self, file_service, **kwargs):
+        upload_file_in_ranges(file_service, 'share', None, 'resources/artifact.jar', self.artifact_path, UPLOAD_URL,
+                              self.journal_folder, range_size=RANGE_SIZE, max_connections=4, **kwargs)
+
+    @mock.patch('azext_spring._ranged_upload.RANGE_RETRY_BACKOFF_SECONDS', 0)
+    def test_upload_retries_failed_ranges(self):
+        file_service = FakeFileService(fail_ranges={0: 1, RANGE_SIZE * 3: 2})
+        progress = []
+        self._upload(file_service, progress_callback=lambda current, total: progress.append((current, total)))
+        self.assertEqual(bytes(file_service.content), self.data)
+        # only the failed ranges are sent again
+        self.assertEqual(len(file_service.uploaded_ranges), 11)
+        self.assertEqual(progress[0], (0, len(self.data)))
+        self.assertEqual(progress[-1], (len(self.data), len(self.data)))
+        # the journal is removed once the upload is done
+        self.assertEqual(os.listdir(self.journal_folder), [])
+
+    @mock.patch('azext_spring._ranged_upload.RANGE_RETRY_BACKOFF_SECONDS', 0)
+    def test_upload_resumes_interrupted_upload(self):
+        file_service = FakeFileService(fail_ranges={RANGE_SIZE * 5: 100})
+        with self.assertRaises(ConnectionError):
+            self._upload(file_service)
+        uploaded_ranges = set(file_service.uploaded_ranges)
+        self.assertNotIn(RANGE_SIZE * 5, uploaded_ranges)
+
+        file_service.fail_ranges = {}
+        file_service.uploaded_ranges = []
+        self._upload(file_service)
+        self.assertEqual(bytes(file_service.content), self.data)
+        self.assertEqual(file_service.created, 1)
+        self.assertEqual(set(file_service.uploaded_ranges), set(range(0, len(self.data), RANGE_SIZE)) - uploaded_ranges)
+
+        # another artifact uploaded to the same url starts over
+        with open(self.artifact_path, 'wb') as f:
+            f.write(self.data[::-1])
+        self._upload(file_service)
+        self.assertEqual(file_service.created, 2)
+        self.assertEqual(bytes(file_service.content), self.data[::-1])
+
+    def test_stale_journals_deleted(self):
+        os.makedirs(self.journal_folder)
+        stale_journal = os.path.join(self.journal_folder, 'stale.json')
+        recent_journal = os.path.join(self.journal_folder, 'recent.json')
+        for path in [stale_journal, recent_journal]:
+            with open(path, 'w') as f:
+                f.write('{}')
+        os.utime(stale_journal, (0, time.time() - 8 * 24 * 60 * 60))
+        self._upload(FakeFileService())
+        self.assertEqual(os.listdir(self.journal_folder), ['recent.json'])
+
+    @mock.patch('azext_spring._ranged_upload.RANGE_RETRY_BACKOFF_SECONDS', 0)
+    @mock.patch('azext_spring._deployment_uploadable_factory.ResourceType')
+    @mock.patch('azext_spring._deployment_uploadable_factory.get_sdk')
+    def test_file_upload_resumed(self, get_sdk_mock, _):
+        # the range keeps failing after its retries, the upload is resumed from the journal
+        file_service = FakeFileService(fail_ranges={0: 5})
+        get_sdk_mock.return_value.return_value = file_service
+        cli_ctx = mock.MagicMock()
+        cli_ctx.config.config_dir = self.folder
+        FileUpload(UPLOAD_URL + '?sig=signature', cli_ctx).upload_and_build(artifact_path=self.artifact_path)
+        self.assertEqual(bytes(file_service.content), self.data)
+        self.assertEqual(file_service.created, 1)
+
+    @mock.patch('azext_spring._deployment_uploadable_factory.ResourceType')
+    @mock.patch('azext_spring._deployment_uploadable_factory.get_sdk')
+    def test_file_upload(self, get_sdk_mock, _):
+        file_service = FakeFileService()
+        get_sdk_mock.return_value.return_value = file_service
+        cli_ctx = mock.MagicMock()
+        cli_ctx.config.config_dir = self.folder
+        upload_url = UPLOAD_URL + '?sv=2018-03-28&sig=signature'
+        FileUpload(upload_url, cli_ctx).upload_and_build(artifact_path=self.artifact_path)
+        self.assertEqual(bytes(file_service.content), self.data)
+        cli_ctx.get_progress_controller.return_value.end.assert_called_once()
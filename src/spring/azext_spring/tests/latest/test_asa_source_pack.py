@@ -0,0 +1,124 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import gzip
+import io
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import time
+import unittest
+
+from ..._deployment_uploadable_factory import FolderUpload
+from ..._utils import IgnoreMatcher, IgnoreRule, ParallelGzipWriter, get_compression_workers, _pack_source_code
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    from unittest import mock
+
+BENCHMARK_DEPENDENCY_FILES = 95000
+BENCHMARK_SOURCE_FILES = 5000
+
+
+def _write_files(root, files, content=b'content'):
+    for path in files:
+        path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+
+
+def _get_member_names(tar_file_path):
+    with tarfile.open(tar_file_path, 'r:gz') as tar:
+        return sorted(name for name in tar.getnames() if name)
+
+
+class TestSourcePack(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.source = os.path.join(self.folder, 'source')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_ignore_matcher(self):
+        # the rule at the end of .gitignore has the highest priority
+        rules = ['node_modules', '*.log', 'build/**', '!build/keep.txt', 'docs/*.(md)', '!important.log']
+        ignore_list = [IgnoreRule(rule) for rule in reversed(rules)]
+        matcher = IgnoreMatcher(ignore_list)
+        names = ['node_modules', 'a.log', 'important.log', 'build', 'build/out.js', 'build/keep.txt',
+                 'docs/a.(md)', 'src/a.log', 'src/main.py']
+        for name in names:
+            for max_index in range(len(ignore_list) + 1):
+                expected = next((index for index, item in enumerate(ignore_list[:max_index])
+                                 if re.match(item.pattern, name)), None)
+                self.assertEqual(matcher.match(name, max_index), expected, (name, max_index))
+
+        self.assertFalse(matcher.can_include_under('node_modules', len(ignore_list)))
+        self.assertTrue(matcher.can_include_under('build', len(ignore_list)))
+        # the rules with a lower priority than the one ignoring the directory cannot include back its files
+        self.assertFalse(matcher.can_include_under('build', 0))
+
+    def test_pack_source_code(self):
+        _write_files(self.source, ['.gitignore'], b'node_modules\nlogs\n!logs/keep.txt\n')
+        _write_files(self.source, ['src/main.js', 'node_modules/pkg/index.js', 'logs/keep.txt', 'logs/app.txt',
+                                   '.git/config', 'target/app.jar'])
+        scanned = []
+        scandir = os.scandir
+
+        def _scandir(path):
+            scanned.append(os.path.relpath(path, self.source))
+            return scandir(path)
+
+        expected = ['logs/keep.txt', 'src', 'src/main.js']
+        for workers in [1, 4]:
+            scanned.clear()
+            tar_file_path = os.path.join(self.folder, 'source{}.tar.gz'.format(workers))
+            with mock.patch('os.scandir', side_effect=_scandir):
+                _pack_source_code(self.source, tar_file_path, compression_workers=workers)
+            self.assertEqual(_get_member_names(tar_file_path), expected)
+            # the ignored directories are only scanned when a rule can include back some of their files
+            self.assertEqual(sorted(scanned), ['.', 'logs', 'src'])
+
+    def test_compression_workers_setting(self):
+        cli_ctx = mock.MagicMock()
+        cli_ctx.config.getint.return_value = 3
+        upload_url = 'https://account.file.core.windows.net/share/resources/source.tar.gz?sv=2018-03-28&sig=signature'
+        with mock.patch('azext_spring._deployment_uploadable_factory._pack_source_code') as pack:
+            FolderUpload(upload_url, cli_ctx)._compress_folder(self.source)
+        self.assertEqual(pack.call_args[1], {'compression_workers': 3})
+        cli_ctx.config.getint.assert_called_with('spring', 'compression_workers', fallback=1)
+
+        cli_ctx.config.getint.side_effect = ValueError('invalid literal for int()')
+        self.assertEqual(get_compression_workers(cli_ctx), 1)
+
+    def test_parallel_gzip_writer(self):
+        data = os.urandom(100000) * 5
+        out_file = io.BytesIO()
+        writer = ParallelGzipWriter(out_file, workers=3, block_size=4096)
+        for start in range(0, len(data), 1000):
+            writer.write(data[start:start + 1000])
+        writer.close()
+        self.assertEqual(gzip.decompress(out_file.getvalue()), data)
+
+    @unittest.skipUnless(os.environ.get('AZURE_CLI_RUN_BENCHMARKS'), 'set AZURE_CLI_RUN_BENCHMARKS to run the benchmarks')
+    def test_benchmark_pack_source_code(self):
+        _write_files(self.source, ['.gitignore'], b'node_modules\n*.log\n!src/keep.log\n')
+        _write_files(self.source, ['node_modules/pkg{}/lib/index{}.js'.format(i // 100, i % 100)
+                                   for i in range(BENCHMARK_DEPENDENCY_FILES)])
+        _write_files(self.source, ['src/module{}/file{}.js'.format(i // 100, i % 100)
+                                   for i in range(BENCHMARK_SOURCE_FILES)], os.urandom(2048) * 4)
+
+        timings = []
+        for workers in [1, 4]:
+            tar_file_path = os.path.join(self.folder, 'source{}.tar.gz'.format(workers))
+            start = time.time()
+            _pack_source_code(self.source, tar_file_path, compression_workers=workers)
+            timings.append('{} compression workers {:.2f}s'.format(workers, time.time() - start))
+            # the src directory, the module directories and their files
+            self.assertEqual(len(_get_member_names(tar_file_path)), 1 + BENCHMARK_SOURCE_FILES // 100 + BENCHMARK_SOURCE_FILES)
+        print('\npacking {} files: {}'.format(BENCHMARK_DEPENDENCY_FILES + BENCHMARK_SOURCE_FILES, ', '.join(timings)))
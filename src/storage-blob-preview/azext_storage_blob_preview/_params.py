@@ -48,6 +48,11 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
                                       completer=get_storage_name_completion_list(t_table_service, 'list_tables'))
     progress_type = CLIArgumentType(help='Include this flag to disable progress reporting for the command.',
                                     action='store_true')
+    max_workers_type = CLIArgumentType(
+        type=int, is_preview=True,
+        help='The number of blobs to process concurrently. When greater than 1, blobs are processed by a pool of '
+        'worker threads, progress is reported for the whole batch and the results keep the listing order. '
+        'Default to 1, which processes blobs one by one.')
     sas_help = 'The permissions the SAS grants. Allowed values: {}. Do not use if a stored access policy is ' \
                'referenced with --policy-name that specifies this value. Can be combined.'
 
@@ -206,6 +211,7 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.argument('source', options_list=('--source', '-s'))
         c.argument('delete_snapshots', delete_snapshots_type)
         c.argument('lease_id', help='The active lease id for the blob.')
+        c.argument('max_workers', max_workers_type)
 
     with self.argument_context('storage blob download') as c:
         c.register_blob_arguments()
@@ -244,6 +250,7 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.extra('max_concurrency', options_list='--max-connections', type=int, default=2,
                 help='The number of parallel connections with which to download.')
         c.extra('no_progress', progress_type)
+        c.argument('max_workers', max_workers_type)
 
     with self.argument_context('storage blob exists') as c:
         c.register_blob_arguments()
@@ -467,6 +474,11 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.extra('no_progress', progress_type)
         c.extra('tier', tier_type, is_preview=True)
         c.extra('overwrite', overwrite_type, is_preview=True)
+        c.argument('max_workers', max_workers_type)
+        c.argument('incremental', action='store_true', is_preview=True,
+                   help='Only upload the files which changed since the last upload to the same destination. The size, '
+                   'modification time and MD5 of the uploaded files are kept in a local manifest and compared '
+                   'against the size, ETag and Content-MD5 of the existing blobs.')
 
     with self.argument_context('storage blob query') as c:
         from ._validators import validate_text_configuration
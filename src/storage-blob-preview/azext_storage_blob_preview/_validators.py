@@ -1077,24 +1077,6 @@ def validate_upload_blob(namespace):
         raise InvalidArgumentValueError("usage error: please specify one of --file and --data to upload.")
 
 
-def _match_path(path, pattern):
-    from fnmatch import fnmatch
-    return fnmatch(path, pattern)
-
-
-def glob_files_locally(folder_path, pattern):
-    """glob files in local folder based on the given pattern"""
-
-    pattern = os.path.join(folder_path, pattern.lstrip('/')) if pattern else None
-
-    len_folder_path = len(folder_path) + 1
-    for root, _, files in os.walk(folder_path):
-        for f in files:
-            full_path = os.path.join(root, f)
-            if not pattern or _match_path(full_path, pattern):
-                yield (full_path, full_path[len_folder_path:])
-
-
 def process_blob_download_batch_parameters(cmd, namespace):
     """Process the parameters for storage blob download command"""
     from azure.cli.core.azclierror import InvalidArgumentValueError
@@ -1107,6 +1089,7 @@ def process_blob_download_batch_parameters(cmd, namespace):
 
     # 3. Call validators
     add_download_progress_callback(cmd, namespace)
+    validate_max_workers(namespace)
 
 
 def process_blob_upload_batch_parameters(cmd, namespace):
@@ -1119,6 +1102,7 @@ def process_blob_upload_batch_parameters(cmd, namespace):
     _process_blob_batch_container_parameters(cmd, namespace, source=False)
 
     # 3. collect the files to be uploaded
+    from .util import glob_files_locally
     namespace.source = os.path.realpath(namespace.source)
     namespace.source_files = [c for c in glob_files_locally(namespace.source, namespace.pattern)]
 
@@ -1144,10 +1128,19 @@ def process_blob_upload_batch_parameters(cmd, namespace):
     get_content_setting_validator(t_blob_content_settings, update=False)(cmd, namespace)
     add_upload_progress_callback(cmd, namespace)
     blob_tier_validator(cmd, namespace)
+    validate_max_workers(namespace)
 
 
 def process_blob_delete_batch_parameters(cmd, namespace):
     _process_blob_batch_container_parameters(cmd, namespace)
+    validate_max_workers(namespace)
+
+
+def validate_max_workers(namespace):
+    max_workers = getattr(namespace, 'max_workers', None)
+    if max_workers is not None and max_workers < 1:
+        from azure.cli.core.azclierror import InvalidArgumentValueError
+        raise InvalidArgumentValueError('incorrect usage: --max-workers must be a positive integer')
 
 
 def _process_blob_batch_container_parameters(cmd, namespace, source=True):
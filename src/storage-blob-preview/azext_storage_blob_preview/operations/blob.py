@@ -17,7 +17,8 @@ from ..util import (create_file_share_from_storage_client,
                     create_short_lived_share_sas,
                     filter_none, collect_blobs, collect_blob_objects, collect_files,
                     mkdir_p, guess_content_type, normalize_blob_file_path,
-                    check_precondition_success)
+                    check_precondition_success, run_batch_operation, prefetch, BatchProgressReporter,
+                    LIST_BLOBS_PAGE_SIZE)
 from ..profiles import CUSTOM_DATA_STORAGE_BLOB
 
 logger = get_logger(__name__)
@@ -176,20 +177,10 @@ def storage_blob_copy_batch(cmd, client, source_client, container_name=None,
 
 # pylint: disable=unused-argument, too-many-locals
 def storage_blob_download_batch(client, source, destination, container_name, pattern=None, dryrun=False,
-                                progress_callback=None, socket_timeout=None, **kwargs):
-    source_blobs = collect_blobs(client, container_name, pattern)
-    blobs_to_download = {}
-    for blob_name in source_blobs:
-        # remove starting path seperator and normalize
-        normalized_blob_name = normalize_blob_file_path(None, blob_name)
-        if normalized_blob_name in blobs_to_download:
-            raise CLIError('Multiple blobs with download path: `{}`. As a solution, use the `--pattern` parameter '
-                           'to select for a subset of blobs to download OR utilize the `storage blob download` '
-                           'command instead to download individual blobs.'.format(normalized_blob_name))
-        blobs_to_download[normalized_blob_name] = blob_name
-
+                                progress_callback=None, socket_timeout=None, max_workers=None, **kwargs):
     results = []
     if dryrun:
+        source_blobs = list(collect_blobs(client, container_name, pattern))
         # download_blobs = _blob_precondition_check(source_blobs, if_modified_since=if_modified_since,
         #                                           if_unmodified_since=if_unmodified_since)
         logger.warning('download action: from %s to %s', source, destination)
@@ -201,23 +192,53 @@ def storage_blob_download_batch(client, source, destination, container_name, pat
             logger.warning('  - %s', b)
 
     else:
+        from azure.cli.core.azclierror import FileOperationError
+
         @check_precondition_success
         def _download_blob(*args, **kwargs):
             blob = download_blob(*args, **kwargs)
             return blob.name
 
-        # Tell progress reporter to reuse the same hook
+        parallel = max_workers and max_workers > 1
+        reporter = None
         if progress_callback:
-            progress_callback.reuse = True
-
-        for index, blob_normed in enumerate(blobs_to_download):
-            from azure.cli.core.azclierror import FileOperationError
-            # add blob name and number to progress message
-            if progress_callback:
-                progress_callback.message = '{}/{}: "{}"'.format(
-                    index + 1, len(blobs_to_download), blobs_to_download[blob_normed])
-            blob_client = client.get_blob_client(container=container_name,
-                                                 blob=blobs_to_download[blob_normed])
+            if parallel:
+                reporter = BatchProgressReporter(progress_callback.hook, 0, 0, 'download_stream_current')
+            else:
+                # Tell progress reporter to reuse the same hook
+                progress_callback.reuse = True
+
+        # Blobs are downloaded while the listing is still in progress, so the duplicate download path check is done
+        # incrementally and only keeps a digest of each path rather than the full listing.
+        listed = {'count': 0}
+
+        def _blobs_to_download():
+            from hashlib import md5
+            seen = set()
+            for blob_name, blob in collect_blob_objects(client, container_name, pattern):
+                # remove starting path seperator and normalize
+                normalized_blob_name = normalize_blob_file_path(None, blob_name)
+                digest = md5(normalized_blob_name.encode('utf-8')).digest()
+                if digest in seen:
+                    raise CLIError('Multiple blobs with download path: `{}`. As a solution, use the `--pattern` '
+                                   'parameter to select for a subset of blobs to download OR utilize the '
+                                   '`storage blob download` command instead to download individual '
+                                   'blobs.'.format(normalized_blob_name))
+                seen.add(digest)
+                listed['count'] += 1
+                if reporter:
+                    reporter.discover(blob.size)
+                yield normalized_blob_name, blob_name
+
+        def _download_action(args):
+            blob_normed, blob_name = args
+            item_progress_callback = progress_callback
+            if reporter:
+                item_progress_callback = reporter.callback_for(blob_name)
+            elif progress_callback:
+                # add blob name and number to progress message
+                progress_callback.message = '{}: "{}"'.format(listed['count'], blob_name)
+            blob_client = client.get_blob_client(container=container_name, blob=blob_name)
             destination_path = os.path.join(destination, os.path.normpath(blob_normed))
             destination_folder = os.path.dirname(destination_path)
             # Failed when there is same name for file and folder
@@ -226,18 +247,26 @@ def storage_blob_download_batch(client, source, destination, container_name, pat
                                          "destination folder. ")
             if not os.path.exists(destination_folder):
                 mkdir_p(destination_folder)
-            include, result = _download_blob(client=blob_client, file_path=destination_path,
-                                             progress_callback=progress_callback, **kwargs)
-            if include:
-                results.append(result)
+            outcome = _download_blob(client=blob_client, file_path=destination_path,
+                                     progress_callback=item_progress_callback, **kwargs)
+            if reporter:
+                reporter.complete(blob_name)
+            return outcome
+
+        source_blobs = _blobs_to_download()
+        if parallel:
+            # list the next pages in the background while the current blobs are being downloaded
+            source_blobs = prefetch(source_blobs, buffer_size=LIST_BLOBS_PAGE_SIZE)
+        results = [result for include, result in run_batch_operation(_download_action, source_blobs,
+                                                                     max_workers=max_workers) if include]
 
         # end progress hook
         if progress_callback:
             progress_callback.hook.end()
-        num_failures = len(blobs_to_download) - len(results)
+        num_failures = listed['count'] - len(results)
         if num_failures:
             logger.warning('%s of %s files not downloaded due to "Failed Precondition"',
-                           num_failures, len(blobs_to_download))
+                           num_failures, listed['count'])
     return results
 
 
@@ -247,7 +276,8 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
                               content_settings=None, metadata=None, validate_content=False,
                               maxsize_condition=None, max_connections=2, lease_id=None, progress_callback=None,
                               if_modified_since=None, if_unmodified_since=None, if_match=None,
-                              if_none_match=None, timeout=None, dryrun=False, socket_timeout=None, **kwargs):
+                              if_none_match=None, timeout=None, dryrun=False, socket_timeout=None, max_workers=None,
+                              incremental=False, **kwargs):
     def _create_return_result(blob_content_settings, upload_result=None):
         return {
             'Blob': client.url,
@@ -258,6 +288,17 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
     source_files = source_files or []
     t_content_settings = cmd.get_models('_models#ContentSettings', resource_type=cmd.command_kwargs['resource_type'])
 
+    manifest, local_states = None, {}
+    if incremental:
+        manifest, local_states = _get_changed_blob_files(cmd, client, container_name, destination_path, source_files,
+                                                         max_workers=max_workers)
+        num_unchanged = len(source_files) - len(local_states)
+        source_files = [(src, dst) for src, dst in source_files
+                        if normalize_blob_file_path(destination_path, dst) in local_states]
+        if num_unchanged:
+            logger.warning('%s of %s files skipped as unchanged since the last upload', num_unchanged,
+                           num_unchanged + len(source_files))
+
     results = []
     if dryrun:
         logger.info('upload action: from %s to %s', source, destination)
@@ -274,32 +315,57 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
         def _upload_blob(*args, **kwargs):
             return upload_blob(*args, **kwargs)
 
-        # Tell progress reporter to reuse the same hook
+        parallel = max_workers and max_workers > 1
+        reporter = None
         if progress_callback:
-            progress_callback.reuse = True
+            if parallel:
+                reporter = BatchProgressReporter(progress_callback.hook, len(source_files),
+                                                 sum(os.path.getsize(src) for src, _ in source_files),
+                                                 'upload_stream_current', status_codes=(200, 201))
+            else:
+                # Tell progress reporter to reuse the same hook
+                progress_callback.reuse = True
 
-        for index, source_file in enumerate(source_files):
-            src, dst = source_file
-            # logger.warning('uploading %s', src)
+        def _upload_action(args):
+            index, (src, dst) = args
+            blob_name = normalize_blob_file_path(destination_path, dst)
             guessed_content_settings = guess_content_type(src, content_settings, t_content_settings)
-
-            # add blob name and number to progress message
-            if progress_callback:
-                progress_callback.message = '{}/{}: "{}"'.format(
-                    index + 1, len(source_files), normalize_blob_file_path(destination_path, dst))
-            blob_client = client.get_blob_client(container=container_name,
-                                                 blob=normalize_blob_file_path(destination_path, dst))
+            local_state = local_states.get(blob_name)
+            if local_state and not guessed_content_settings.content_md5:
+                # store the MD5 of the content, so the next incremental upload can compare it without the manifest
+                guessed_content_settings = _with_content_md5(t_content_settings, guessed_content_settings,
+                                                             local_state['md5'])
+
+            item_progress_callback = progress_callback
+            if reporter:
+                item_progress_callback = reporter.callback_for(blob_name)
+            elif progress_callback:
+                # add blob name and number to progress message
+                progress_callback.message = '{}/{}: "{}"'.format(index + 1, len(source_files), blob_name)
+            blob_client = client.get_blob_client(container=container_name, blob=blob_name)
             include, result = _upload_blob(cmd, blob_client, file_path=src,
                                            blob_type=blob_type, content_settings=guessed_content_settings,
                                            metadata=metadata, validate_content=validate_content,
                                            maxsize_condition=maxsize_condition, max_connections=max_connections,
-                                           lease_id=lease_id, progress_callback=progress_callback,
+                                           lease_id=lease_id, progress_callback=item_progress_callback,
                                            if_modified_since=if_modified_since,
                                            if_unmodified_since=if_unmodified_since, if_match=if_match,
                                            if_none_match=if_none_match, timeout=timeout, **kwargs)
+            if reporter:
+                reporter.complete(blob_name)
             if include:
-                results.append(_create_return_result(blob_content_settings=guessed_content_settings,
-                                                     upload_result=result))
+                if manifest:
+                    manifest.record(blob_name, local_state, result['etag'])
+                return _create_return_result(blob_content_settings=guessed_content_settings, upload_result=result)
+            return None
+
+        try:
+            results = list(filter_none(run_batch_operation(_upload_action, enumerate(source_files),
+                                                           max_workers=max_workers)))
+        finally:
+            if manifest:
+                # keep the record of the files uploaded so far even if the batch failed
+                manifest.save()
         # end progress hook
         if progress_callback:
             progress_callback.hook.end()
@@ -309,6 +375,46 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
     return results
 
 
+def _get_changed_blob_files(cmd, client, container_name, destination_path, source_files, max_workers=None):
+    """
+    Compare the local files with the sync manifest of the destination and the remote listing. Return the manifest and
+    the local state (size, mtime and MD5) of each blob which needs to be uploaded.
+    """
+    from ..sync_util import SyncManifest, encode_content_md5
+    manifest = SyncManifest.for_destination(cmd.cli_ctx, client.url, container_name, destination_path)
+
+    prefix = normalize_blob_file_path(destination_path, '') if destination_path else None
+    container_client = client.get_container_client(container=container_name)
+    remote_blobs = {blob.name: (blob.size, blob.etag, encode_content_md5(blob.content_settings.content_md5))
+                    for blob in container_client.list_blobs(name_starts_with=prefix + '/' if prefix else None)}
+
+    def _get_local_state(source_file):
+        src, dst = source_file
+        blob_name = normalize_blob_file_path(destination_path, dst)
+        local_state = manifest.local_state(blob_name, src)
+        remote_blob = remote_blobs.get(blob_name, ())
+        if manifest.is_synced(blob_name, local_state, *remote_blob):
+            manifest.record_synced(blob_name, local_state, remote_blob[1])
+            return blob_name, None
+        return blob_name, local_state
+
+    # hashing the changed files is IO bound as well, share the workers of the upload
+    changed = {blob_name: local_state for blob_name, local_state in run_batch_operation(
+        _get_local_state, source_files, max_workers=max_workers) if local_state}
+    return manifest, changed
+
+
+def _with_content_md5(settings_class, content_settings, content_md5):
+    import base64
+    return settings_class(
+        content_type=content_settings.content_type,
+        content_encoding=content_settings.content_encoding,
+        content_disposition=content_settings.content_disposition,
+        content_language=content_settings.content_language,
+        content_md5=bytearray(base64.b64decode(content_md5)),
+        cache_control=content_settings.cache_control)
+
+
 def transform_blob_type(cmd, blob_type):
     """
     get_blob_types() will get ['block', 'page', 'append']
@@ -357,7 +463,7 @@ def _blob_precondition_check(source_blobs, if_modified_since=None, if_unmodified
 
 def storage_blob_delete_batch(client, source, container_name, pattern=None, lease_id=None,
                               delete_snapshots=None, if_modified_since=None, if_unmodified_since=None, if_match=None,
-                              if_none_match=None, timeout=None, dryrun=False, **kwargs):
+                              if_none_match=None, timeout=None, dryrun=False, max_workers=None, **kwargs):
     @check_precondition_success
     def _delete_blob(blob_name):
         blob_client = client.get_blob_client(container=container_name, blob=blob_name)
@@ -372,9 +478,8 @@ def storage_blob_delete_batch(client, source, container_name, pattern=None, leas
         }
         return blob_client.delete_blob(**delete_blob_args)
 
-    source_blobs = list(collect_blob_objects(client, container_name, pattern))
-
     if dryrun:
+        source_blobs = list(collect_blob_objects(client, container_name, pattern))
         delete_blobs = _blob_precondition_check(source_blobs, if_modified_since=if_modified_since,
                                                 if_unmodified_since=if_unmodified_since)
         logger.warning('delete action: from %s', source)
@@ -386,10 +491,22 @@ def storage_blob_delete_batch(client, source, container_name, pattern=None, leas
             logger.warning('  - %s', blob)
         return []
 
-    results = [result for include, result in (_delete_blob(blob[0]) for blob in source_blobs) if include]
-    num_failures = len(source_blobs) - len(results)
+    listed = {'count': 0}
+
+    def _blobs_to_delete():
+        for blob_name in collect_blobs(client, container_name, pattern):
+            listed['count'] += 1
+            yield blob_name
+
+    source_blobs = _blobs_to_delete()
+    if max_workers and max_workers > 1:
+        # list the next pages in the background while the current blobs are being deleted
+        source_blobs = prefetch(source_blobs, buffer_size=LIST_BLOBS_PAGE_SIZE)
+    results = [result for include, result in run_batch_operation(_delete_blob, source_blobs,
+                                                                 max_workers=max_workers) if include]
+    num_failures = listed['count'] - len(results)
     if num_failures:
-        logger.warning('%s of %s blobs not deleted due to "Failed Precondition"', num_failures, len(source_blobs))
+        logger.warning('%s of %s blobs not deleted due to "Failed Precondition"', num_failures, listed['count'])
 
 
 def generate_container_shared_access_signature(client, container_name, permission=None,
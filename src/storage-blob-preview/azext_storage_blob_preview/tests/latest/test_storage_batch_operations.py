@@ -37,6 +37,12 @@ class StorageBatchOperationScenarios(StorageScenarioMixin, LiveScenarioTest):
         self.storage_cmd(cmd, storage_account_info)
         self.assertEqual(41, sum(len(f) for r, d, f in os.walk(local_folder)))
 
+        # download recursively with multiple workers
+        local_folder = self.create_temp_dir()
+        self.storage_cmd('storage blob download-batch -s {} -d "{}" --max-workers 4', storage_account_info,
+                         src_container, local_folder)
+        self.assertEqual(41, sum(len(f) for r, d, f in os.walk(local_folder)))
+
         # download recursively with wild card *, and use URL as source
         local_folder = self.create_temp_dir()
         src_url = self.storage_cmd('storage blob url -c {} -n readme -otsv', storage_account_info, src_container).output
@@ -92,6 +98,23 @@ class StorageBatchOperationScenarios(StorageScenarioMixin, LiveScenarioTest):
             .assert_with_checks(JMESPathCheck('[0].properties.blobTier', 'Cool')) \
             .assert_with_checks(JMESPathCheck('[0].properties.blobType', 'BlockBlob'))
 
+        # upload files with multiple workers
+        container = self.create_container(storage_account_info)
+        self.storage_cmd('storage blob upload-batch -s "{}" -d {} --max-workers 4', storage_account_info, test_dir,
+                         container)
+        self.storage_cmd('storage blob list -c {}', storage_account_info, container).assert_with_checks(
+            JMESPathCheck('length(@)', 41))
+
+        # upload unchanged files incrementally
+        result = self.storage_cmd('storage blob upload-batch -s "{}" -d {} --incremental', storage_account_info,
+                                  test_dir, container).get_output_in_json()
+        self.assertEqual(len(result), 0)
+
+        # delete files with multiple workers
+        self.storage_cmd('storage blob delete-batch -s {} --max-workers 4', storage_account_info, container)
+        self.storage_cmd('storage blob list -c {}', storage_account_info, container).assert_with_checks(
+            JMESPathCheck('length(@)', 0))
+
         # upload files with pattern apple/*
         container = self.create_container(storage_account_info)
         src_url = self.storage_cmd('storage blob url -c {} -n \'\' -otsv', storage_account_info,
@@ -0,0 +1,277 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from azext_storage_blob_preview.util import (run_batch_operation, prefetch, BatchProgressReporter,
+                                             collect_blob_objects, glob_files_locally, get_pattern_prefix,
+                                             _match_path)
+from azext_storage_blob_preview.sync_util import SyncManifest, compute_file_md5, encode_content_md5
+
+
+class TestRunBatchOperation(unittest.TestCase):
+    def test_serial_keeps_order(self):
+        self.assertEqual(list(run_batch_operation(lambda x: x * 2, range(10))), [x * 2 for x in range(10)])
+
+    def test_parallel_keeps_order(self):
+        def _action(x):
+            time.sleep(random.random() / 100)
+            return x
+
+        self.assertEqual(list(run_batch_operation(_action, range(50), max_workers=8)), list(range(50)))
+
+    def test_parallel_bounds_in_flight_items(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def _action(x):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.01)
+            with lock:
+                state['active'] -= 1
+            return x
+
+        consumed = []
+
+        def _items():
+            for i in range(40):
+                consumed.append(i)
+                yield i
+
+        results = run_batch_operation(_action, _items(), max_workers=4)
+        next(results)
+        # the item iterable is consumed lazily
+        self.assertLessEqual(len(consumed), 9)
+        self.assertEqual(list(results), list(range(1, 40)))
+        self.assertLessEqual(state['peak'], 4)
+
+    def test_parallel_speedup(self):
+        def _action(x):
+            time.sleep(0.02)
+            return x
+
+        start = time.time()
+        list(run_batch_operation(_action, range(40), max_workers=8))
+        self.assertLess(time.time() - start, 0.02 * 40 / 2)
+
+    def test_parallel_raises_error(self):
+        def _action(x):
+            if x == 5:
+                raise ValueError(x)
+            return x
+
+        with self.assertRaises(ValueError):
+            list(run_batch_operation(_action, range(20), max_workers=4))
+
+
+class TestPrefetch(unittest.TestCase):
+    def test_prefetch_keeps_order(self):
+        self.assertEqual(list(prefetch(iter(range(1000)), buffer_size=10)), list(range(1000)))
+
+    def test_prefetch_bounds_buffer(self):
+        produced = []
+
+        def _items():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        items = prefetch(_items(), buffer_size=5)
+        self.assertEqual(next(items), 0)
+        time.sleep(0.1)
+        # the buffer is full, one item is consumed and one more is blocked in the producer
+        self.assertLessEqual(len(produced), 7)
+        items.close()
+
+    def test_prefetch_raises_producer_error(self):
+        def _items():
+            yield 1
+            raise ValueError('listing failed')
+
+        items = prefetch(_items(), buffer_size=5)
+        self.assertEqual(next(items), 1)
+        with self.assertRaises(ValueError):
+            next(items)
+
+    def test_prefetch_feeds_workers_before_listing_ends(self):
+        started = threading.Event()
+
+        def _items():
+            yield 0
+            # the second page is only listed after the first item has started
+            self.assertTrue(started.wait(1))
+            yield 1
+
+        def _action(x):
+            started.set()
+            return x
+
+        self.assertEqual(list(run_batch_operation(_action, prefetch(_items(), buffer_size=5), max_workers=2)),
+                         [0, 1])
+
+
+class TestBatchProgressReporter(unittest.TestCase):
+    @staticmethod
+    def _response(current, status_code=201):
+        return mock.MagicMock(http_response=mock.MagicMock(status_code=status_code),
+                              context={'upload_stream_current': current})
+
+    def test_aggregate_progress(self):
+        hook = mock.MagicMock()
+        reporter = BatchProgressReporter(hook, 2, 30, 'upload_stream_current')
+        first, second = reporter.callback_for('a'), reporter.callback_for('b')
+
+        first(self._response(5))
+        second(self._response(10))
+        first(self._response(10))
+        hook.add.assert_called_with(message='0/2 files', value=20, total_val=30)
+
+        # non-success responses are ignored
+        second(self._response(20, status_code=412))
+        hook.add.assert_called_with(message='0/2 files', value=20, total_val=30)
+
+        reporter.complete('a')
+        second(self._response(20))
+        reporter.complete('b')
+        hook.add.assert_called_with(message='2/2 files', value=30, total_val=30)
+
+        reporter.end()
+        hook.end.assert_called_once_with()
+
+    def test_discover_items_while_listing(self):
+        hook = mock.MagicMock()
+        reporter = BatchProgressReporter(hook, 0, 0, 'upload_stream_current')
+        reporter.discover(10)
+        reporter.callback_for('a')(self._response(5))
+        hook.add.assert_called_with(message='0/1 files', value=5, total_val=10)
+        reporter.discover(10)
+        reporter.complete('a')
+        hook.add.assert_called_with(message='1/2 files', value=5, total_val=20)
+
+
+class TestPatternPushdown(unittest.TestCase):
+    @unittest.skipIf(os.name == 'nt', 'no prefix is pushed down on Windows')
+    def test_pattern_prefix(self):
+        self.assertEqual(get_pattern_prefix('logs/2024/*.json'), 'logs/2024/')
+        self.assertEqual(get_pattern_prefix('logs/202?/a'), 'logs/202')
+        self.assertEqual(get_pattern_prefix('logs/[0-9]*'), 'logs/')
+        self.assertEqual(get_pattern_prefix('*/file_0'), '')
+
+    def test_no_pattern_prefix_on_windows(self):
+        with mock.patch('os.name', 'nt'):
+            self.assertEqual(get_pattern_prefix('Apple/*'), '')
+
+    def test_match_path_keeps_fnmatch_semantics(self):
+        self.assertTrue(_match_path('logs/2024/a.json', 'logs/2024/*.json'))
+        self.assertTrue(_match_path('logs/2024/01/a.json', 'logs/2024/*.json'))
+        self.assertFalse(_match_path('logs/2023/a.json', 'logs/2024/*.json'))
+        self.assertTrue(_match_path('apple/file_0', '*/file_0'))
+
+    @unittest.skipIf(os.name == 'nt', 'no prefix is pushed down on Windows')
+    def test_collect_blob_objects_pushes_down_prefix(self):
+        blob = mock.MagicMock()
+        blob.name = 'logs/2024/01/a.json'
+        service = mock.MagicMock()
+        container_client = service.get_container_client.return_value
+        container_client.list_blobs.return_value = [blob]
+
+        result = list(collect_blob_objects(service, 'container', 'logs/2024/*.json'))
+        self.assertEqual(result, [('logs/2024/01/a.json', blob)])
+        self.assertEqual(container_client.list_blobs.call_args[1]['name_starts_with'], 'logs/2024/')
+
+    @unittest.skipIf(os.name == 'nt', 'no prefix is pushed down on Windows')
+    def test_glob_files_locally_prunes_walk(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        for path in ('apple/file_0', 'apple/sub/file_1', 'butter/file_0', 'file_0'):
+            os.makedirs(os.path.dirname(os.path.join(folder, path)), exist_ok=True)
+            open(os.path.join(folder, path), 'w').close()
+
+        with mock.patch('os.walk', wraps=os.walk) as walk:
+            result = sorted(dst for _, dst in glob_files_locally(folder, 'apple/*'))
+        walk.assert_called_once_with(os.path.join(folder, 'apple'))
+        self.assertEqual(result, [os.path.join('apple', 'file_0'), os.path.join('apple', 'sub', 'file_1')])
+
+        self.assertEqual(len(list(glob_files_locally(folder, '*/file_0'))), 2)
+        self.assertEqual(len(list(glob_files_locally(folder, None))), 4)
+        self.assertEqual(list(glob_files_locally(folder, 'nonexists/*')), [])
+
+
+class TestSyncManifest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.file_path = os.path.join(self.folder, 'file')
+        with open(self.file_path, 'wb') as f:
+            f.write(b'content')
+        self.manifest_path = os.path.join(self.folder, 'manifests', 'manifest.json')
+
+    def test_md5_format(self):
+        import base64
+        import hashlib
+        expected = base64.b64encode(hashlib.md5(b'content').digest()).decode('utf-8')
+        self.assertEqual(compute_file_md5(self.file_path), expected)
+        self.assertEqual(encode_content_md5(bytearray(hashlib.md5(b'content').digest())), expected)
+        self.assertIsNone(encode_content_md5(None))
+
+    def test_synced_by_remote_md5(self):
+        manifest = SyncManifest(self.manifest_path)
+        local = manifest.local_state('file', self.file_path)
+        self.assertTrue(manifest.is_synced('file', local, 7, 'etag', local['md5']))
+        self.assertFalse(manifest.is_synced('file', local, 7, 'etag', 'other'))
+        self.assertFalse(manifest.is_synced('file', local, 8, 'etag', local['md5']))
+        self.assertFalse(manifest.is_synced('file', local))
+
+    def test_synced_by_manifest(self):
+        manifest = SyncManifest(self.manifest_path)
+        local = manifest.local_state('file', self.file_path)
+        self.assertFalse(manifest.is_synced('file', local, 7, 'etag'))
+        manifest.record('file', local, 'etag')
+        manifest.save()
+
+        manifest = SyncManifest(self.manifest_path)
+        with mock.patch('azext_storage_blob_preview.sync_util.compute_file_md5') as compute:
+            local = manifest.local_state('file', self.file_path)
+        # the file is unchanged, its MD5 is not computed again
+        compute.assert_not_called()
+        self.assertTrue(manifest.is_synced('file', local, 7, 'etag'))
+        self.assertFalse(manifest.is_synced('file', local, 7, 'modified-etag'))
+
+        with open(self.file_path, 'wb') as f:
+            f.write(b'CONTENT')
+        os.utime(self.file_path, (0, 0))
+        local = manifest.local_state('file', self.file_path)
+        self.assertFalse(manifest.is_synced('file', local, 7, 'etag'))
+
+    def test_record_synced(self):
+        manifest = SyncManifest(self.manifest_path)
+        local = manifest.local_state('file', self.file_path)
+        # found in sync by the remote Content-MD5 while missing from the manifest
+        manifest.record_synced('file', local, 'etag')
+        os.utime(self.file_path, (0, 0))
+        local = manifest.local_state('file', self.file_path)
+        self.assertTrue(manifest.is_synced('file', local, 7, 'etag'))
+        # touched without being modified, the recorded ETag is kept
+        manifest.record_synced('file', local)
+        manifest.save()
+
+        manifest = SyncManifest(self.manifest_path)
+        with mock.patch('azext_storage_blob_preview.sync_util.compute_file_md5') as compute:
+            local = manifest.local_state('file', self.file_path)
+        compute.assert_not_called()
+        self.assertTrue(manifest.is_synced('file', local, 7, 'etag'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,14 +5,18 @@
 
 
 import os
+import threading
+from functools import lru_cache
 from azure.cli.core.profiles import ResourceType
 
+LIST_BLOBS_PAGE_SIZE = 5000
+
 
 def collect_blobs(blob_service, container, pattern=None):
     """
     List the blobs in the given blob container, filter the blob by comparing their path to the given pattern.
     """
-    return [name for (name, _) in collect_blob_objects(blob_service, container, pattern)]
+    return (name for (name, _) in collect_blob_objects(blob_service, container, pattern))
 
 
 def collect_blob_objects(blob_service, container, pattern=None):
@@ -31,7 +35,11 @@ def collect_blob_objects(blob_service, container, pattern=None):
             yield pattern, blob_service.get_blob_properties(container, pattern)
     else:
         container_client = blob_service.get_container_client(container=container)
-        for blob in container_client.list_blobs():
+        # only the blobs under the literal prefix of the pattern can match, let the service filter the others out
+        prefix = get_pattern_prefix(pattern) if pattern else None
+        # list_blobs() is paged lazily, so blobs are yielded as soon as their page arrives
+        for blob in container_client.list_blobs(name_starts_with=prefix or None,
+                                                results_per_page=LIST_BLOBS_PAGE_SIZE):
             try:
                 blob_name = blob.name.encode('utf-8') if isinstance(blob.name, unicode) else blob.name
             except NameError:
@@ -80,9 +88,13 @@ def glob_files_locally(folder_path, pattern):
     """glob files in local folder based on the given pattern"""
 
     pattern = os.path.join(folder_path, pattern.lstrip('/')) if pattern else None
+    # skip walking the folders which are outside of the literal prefix of the pattern
+    walk_root = os.path.normpath(_get_pattern_directory(pattern)) if pattern else folder_path
+    if walk_root != folder_path and not walk_root.startswith(os.path.join(folder_path, '')):
+        walk_root = folder_path
 
     len_folder_path = len(folder_path) + 1
-    for root, _, files in os.walk(folder_path):
+    for root, _, files in os.walk(walk_root):
         for f in files:
             full_path = os.path.join(root, f)
             if not pattern or _match_path(full_path, pattern):
@@ -94,7 +106,12 @@ def glob_files_remotely(cmd, client, share_name, pattern):
     from collections import deque
     t_dir, t_file = cmd.get_models('file.models#Directory', 'file.models#File', resource_type=ResourceType.DATA_STORAGE)
 
-    queue = deque([""])
+    # start from the deepest directory named literally by the pattern instead of the share root
+    start_dir = _get_pattern_directory(pattern) if pattern else ""
+    if start_dir and not client.exists(share_name, directory_name=start_dir):
+        return
+
+    queue = deque([start_dir])
     while queue:
         current_dir = queue.pop()
         for f in client.list_directories_and_files(share_name, current_dir):
@@ -176,9 +193,38 @@ def _pattern_has_wildcards(p):
     return not p or p.find('*') != -1 or p.find('?') != -1 or p.find('[') != -1
 
 
+_WILDCARD_CHARS = ('*', '?', '[')
+
+
+@lru_cache(maxsize=None)
+def _compile_pattern(pattern):
+    """
+    Compile the given fnmatch style pattern once. Return the literal prefix of the pattern, which every matching path
+    starts with, and the compiled regex. Note that as with fnmatch, '*' and '?' match path separators as well.
+    """
+    import re
+    from fnmatch import translate
+    wildcard_positions = [pos for pos in (pattern.find(c) for c in _WILDCARD_CHARS) if pos != -1]
+    prefix = pattern[:min(wildcard_positions)] if wildcard_positions else pattern
+    return prefix, re.compile(translate(os.path.normcase(pattern)))
+
+
+def get_pattern_prefix(pattern):
+    # the paths are matched through os.path.normcase, so case-insensitively on Windows, while listing blobs or
+    # files by prefix is case-sensitive: no prefix is pushed down there
+    if os.name == 'nt':
+        return ''
+    return _compile_pattern(pattern)[0]
+
+
+def _get_pattern_directory(pattern):
+    """Return the deepest directory containing all the paths matching the given pattern."""
+    prefix = get_pattern_prefix(pattern)
+    return prefix[:max(prefix.rfind('/'), prefix.rfind(os.sep), 0)]
+
+
 def _match_path(path, pattern):
-    from fnmatch import fnmatch
-    return fnmatch(path, pattern)
+    return _compile_pattern(pattern)[1].match(os.path.normcase(path)) is not None
 
 
 def guess_content_type(file_path, original, settings_class):
@@ -235,3 +281,129 @@ def check_precondition_success(func):
                 raise
             return False, None
     return wrapper
+
+
+def run_batch_operation(func, items, max_workers=None):
+    """
+    Apply func to each of the given items and yield the results in the order of the items. When max_workers is
+    greater than 1 the items are processed by a bounded thread pool; at most 2 * max_workers items are in flight at
+    any time, so items can be a lazily evaluated iterable of any length.
+    """
+    if not max_workers or max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    from itertools import islice
+
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque(executor.submit(func, item) for item in islice(items, max_workers * 2))
+        try:
+            while pending:
+                result = pending.popleft().result()
+                for item in islice(items, 1):
+                    pending.append(executor.submit(func, item))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def prefetch(items, buffer_size):
+    """
+    Consume the given iterable in a background thread and yield its items through a bounded queue, so that a slow
+    producer (e.g. a paged listing) keeps running while the consumer works. At most buffer_size items are buffered;
+    errors raised by the producer are re-raised in the consumer.
+    """
+    import queue
+
+    buffer = queue.Queue(maxsize=buffer_size)
+    stopped = threading.Event()
+    end_of_items = object()
+
+    def _put(entry):
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce():
+        try:
+            for item in items:
+                if not _put((item, None)):
+                    return
+        except Exception as ex:  # pylint: disable=broad-except
+            _put((end_of_items, ex))
+            return
+        _put((end_of_items, None))
+
+    producer = threading.Thread(target=_produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is end_of_items:
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+class BatchProgressReporter:
+    """
+    Aggregate the progress of all the transfers of a batch operation into a single progress hook, so that concurrent
+    transfers do not overwrite each other's progress message.
+    """
+
+    def __init__(self, hook, total_count, total_size, stream_key, status_codes=(200, 201, 206)):
+        self._hook = hook
+        self._total_count = total_count
+        self._total_size = total_size
+        self._stream_key = stream_key
+        self._status_codes = status_codes
+        self._lock = threading.Lock()
+        self._transferred = {}
+        self._current = 0
+        self._completed = 0
+
+    def discover(self, size):
+        """Add an item found after the reporter was created, e.g. while the listing is still in progress."""
+        with self._lock:
+            self._total_count += 1
+            self._total_size += size or 0
+
+    def callback_for(self, name):
+        """Return a raw response hook which reports the progress of the transfer of the given item."""
+        def _update_progress(response):
+            if response.http_response.status_code not in self._status_codes:
+                return
+            self.update(name, response.context[self._stream_key])
+        return _update_progress
+
+    def update(self, name, current):
+        with self._lock:
+            self._current += current - self._transferred.get(name, 0)
+            self._transferred[name] = current
+            self._report()
+
+    def complete(self, name):
+        with self._lock:
+            self._transferred.pop(name, None)
+            self._completed += 1
+            self._report()
+
+    def end(self):
+        self._hook.end()
+
+    def _report(self):
+        if self._total_size:
+            message = '{}/{} files'.format(self._completed, self._total_count)
+            self._hook.add(message=message, value=min(self._current, self._total_size), total_val=self._total_size)
@@ -672,6 +672,13 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.register_content_settings_argument(t_file_content_settings, update=False, arg_group='Content Settings',
                                              process_md5=True)
         c.extra('no_progress', progress_type)
+        c.argument('max_workers', arg_group='Upload Control', type=int, is_preview=True,
+                   help='The number of files to upload concurrently. The directories are created level by level '
+                   'before any file is uploaded. Default to 1, which uploads files one by one.')
+        c.argument('incremental', action='store_true', is_preview=True,
+                   help='Only upload the files which changed since the last upload to the same destination. The size, '
+                   'modification time and MD5 of the uploaded files are kept in a local manifest and compared '
+                   'against the size and Content-MD5 of the existing files.')
 
     with self.argument_context('storage fs service-properties update', resource_type=CUSTOM_DATA_STORAGE_FILEDATALAKE,
                                min_api='2020-06-12') as c:
@@ -628,6 +628,10 @@ def process_file_upload_batch_parameters(cmd, namespace):
     namespace.source = os.path.realpath(namespace.source)
     namespace.share_name = namespace.destination
 
+    max_workers = getattr(namespace, 'max_workers', None)
+    if max_workers is not None and max_workers < 1:
+        raise ValueError('incorrect usage: --max-workers must be a positive integer')
+
 
 # pylint: disable=too-few-public-methods
 class PermissionScopeAddAction(argparse._AppendAction):
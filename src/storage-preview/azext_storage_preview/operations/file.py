@@ -31,16 +31,27 @@ def storage_file_upload(client, local_file_path, content_settings=None,
 
 def storage_file_upload_batch(cmd, client, destination, source, destination_path=None, pattern=None, dryrun=False,
                               validate_content=False, content_settings=None, max_connections=1, metadata=None,
-                              progress_callback=None):
+                              progress_callback=None, max_workers=None, incremental=False):
     """ Upload local files to Azure Storage File Share in batch """
 
-    from ..util import glob_files_locally, normalize_blob_file_path, guess_content_type
+    from ..util import glob_files_locally, normalize_blob_file_path, guess_content_type, run_batch_operation
     from ..track2_util import make_file_url
 
     source_files = [c for c in glob_files_locally(source, pattern)]
     logger = get_logger(__name__)
     settings_class = cmd.get_models('_models#ContentSettings')
 
+    manifest, local_states = None, {}
+    if incremental:
+        manifest, local_states = _get_changed_files(cmd, client, destination_path, source_files,
+                                                    max_workers=max_workers)
+        num_unchanged = len(source_files) - len(local_states)
+        source_files = [(src, dst) for src, dst in source_files
+                        if normalize_blob_file_path(destination_path, dst) in local_states]
+        if num_unchanged:
+            logger.warning('%s of %s files skipped as unchanged since the last upload', num_unchanged,
+                           num_unchanged + len(source_files))
+
     if dryrun:
         logger.info('upload files to file share')
         logger.info('    account %s', client.account_name)
@@ -50,23 +61,125 @@ def storage_file_upload_batch(cmd, client, destination, source, destination_path
                  'Type': guess_content_type(src, content_settings, settings_class).content_type} for src, dst in
                 source_files]
 
-    # TODO: Performance improvement
-    # 1. Upload files in parallel
-    def _upload_action(src, dst):
-        dst = normalize_blob_file_path(destination_path, dst)
+    source_files = [(src, normalize_blob_file_path(destination_path, dst)) for src, dst in source_files]
+
+    # Create the whole directory tree up front, so that uploading a file never waits for its parent directories
+    _make_directory_tree_in_files_share(client, (os.path.dirname(dst) for _, dst in source_files),
+                                        max_workers=max_workers)
+
+    reporter = None
+    if progress_callback:
+        from ..util import BatchProgressReporter
+        reporter = BatchProgressReporter(progress_callback.hook, len(source_files),
+                                         sum(os.path.getsize(src) for src, _ in source_files),
+                                         'upload_stream_current')
+
+    def _upload_action(source_file):
+        src, dst = source_file
         dir_name = os.path.dirname(dst)
         file_name = os.path.basename(dst)
 
-        _make_directory_in_files_share(client, dir_name)
-
         logger.warning('uploading %s', src)
 
-        storage_file_upload(client.get_file_client(dst), src, content_settings, metadata, validate_content,
-                            progress_callback, max_connections)
+        file_content_settings = content_settings
+        local_state = local_states.get(dst)
+        if local_state and not (content_settings and content_settings.content_md5):
+            # store the MD5 of the content, so the next incremental upload can compare it without the manifest
+            file_content_settings = _with_content_md5(settings_class, content_settings, local_state['md5'])
+
+        response = storage_file_upload(client.get_file_client(dst), src, file_content_settings, metadata,
+                                       validate_content, reporter.callback_for(dst) if reporter else None,
+                                       max_connections)
+        if reporter:
+            reporter.complete(dst)
+        if manifest:
+            manifest.record(dst, local_state, response.get('etag') if response else None)
 
         return make_file_url(client, dir_name, file_name)
 
-    return list(_upload_action(src, dst) for src, dst in source_files)
+    try:
+        results = list(run_batch_operation(_upload_action, source_files, max_workers=max_workers))
+    finally:
+        if manifest:
+            # keep the record of the files uploaded so far even if the batch failed
+            manifest.save()
+    if reporter:
+        reporter.end()
+    return results
+
+
+def _get_changed_files(cmd, client, destination_path, source_files, max_workers=None):
+    """
+    Compare the local files with the sync manifest of the destination and the remote listing. Return the manifest and
+    the local state (size, mtime and MD5) of each file which needs to be uploaded.
+    """
+    from azure.core.exceptions import ResourceNotFoundError
+    from ..sync_util import SyncManifest, encode_content_md5
+    from ..util import normalize_blob_file_path, run_batch_operation
+
+    manifest = SyncManifest.for_destination(cmd.cli_ctx, client.url, destination_path)
+    file_names = [(src, normalize_blob_file_path(destination_path, dst)) for src, dst in source_files]
+
+    # the file listing only returns the size, list every destination directory once
+    remote_sizes = {}
+    for dir_name in set(os.path.dirname(name) for _, name in file_names):
+        try:
+            for item in client.list_directories_and_files(directory_name=dir_name or None):
+                if not item['is_directory']:
+                    remote_sizes['/'.join(filter(None, (dir_name, item['name'])))] = item['size']
+        except ResourceNotFoundError:
+            pass
+
+    def _get_local_state(source_file):
+        src, name = source_file
+        local_state = manifest.local_state(name, src)
+        remote_size = remote_sizes.get(name)
+        if remote_size != local_state['size']:
+            return name, local_state
+        # the listing has neither the ETag nor the Content-MD5, get them from the properties of the same-sized file
+        properties = client.get_file_client(name).get_file_properties()
+        if manifest.is_synced(name, local_state, remote_size, properties.etag,
+                              encode_content_md5(properties.content_settings.content_md5)):
+            manifest.record_synced(name, local_state, properties.etag)
+            return name, None
+        return name, local_state
+
+    # hashing the changed files is IO bound as well, share the workers of the upload
+    changed = {name: local_state for name, local_state in run_batch_operation(
+        _get_local_state, file_names, max_workers=max_workers) if local_state}
+    return manifest, changed
+
+
+def _with_content_md5(settings_class, content_settings, content_md5):
+    import base64
+    return settings_class(
+        content_type=getattr(content_settings, 'content_type', None),
+        content_encoding=getattr(content_settings, 'content_encoding', None),
+        content_disposition=getattr(content_settings, 'content_disposition', None),
+        content_language=getattr(content_settings, 'content_language', None),
+        content_md5=bytearray(base64.b64decode(content_md5)),
+        cache_control=getattr(content_settings, 'cache_control', None))
+
+
+def _make_directory_tree_in_files_share(share_client, directory_paths, max_workers=None):
+    """
+    Create all the given directories and their parents. Every directory is created once: the tree is created level
+    by level, and the directories of the same level are created concurrently.
+    """
+    from ..util import run_batch_operation
+
+    levels = {}
+    for directory_path in set(directory_paths):
+        while directory_path:
+            levels.setdefault(directory_path.count('/'), set()).add(directory_path)
+            directory_path = os.path.dirname(directory_path)
+
+    existing_dirs = set()
+    for depth in sorted(levels):
+        # the parents have been created by the previous levels, so each directory takes a single call
+        list(run_batch_operation(lambda dir_name: _make_directory_in_files_share(share_client, dir_name,
+                                                                                 existing_dirs),
+                                 sorted(levels[depth]), max_workers=max_workers))
 
 
 def _make_directory_in_files_share(share_client, directory_path, existing_dirs=None):
@@ -89,7 +202,7 @@ def _make_directory_in_files_share(share_client, directory_path, existing_dirs=N
         p = os.path.dirname(p)
 
     for dir_name in reversed(parents):
-        if existing_dirs and (dir_name in existing_dirs):
+        if existing_dirs is not None and (dir_name in existing_dirs):
             continue
 
         try:
@@ -100,5 +213,5 @@ def _make_directory_in_files_share(share_client, directory_path, existing_dirs=N
             from knack.util import CLIError
             raise CLIError('Failed to create directory {}'.format(dir_name))
 
-        if existing_dirs:
-            existing_dirs.add(directory_path)
+        if existing_dirs is not None:
+            existing_dirs.add(dir_name)
@@ -0,0 +1,116 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Local manifest used by the incremental mode of the batch upload commands to skip the files which have not changed
+since they were last uploaded.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_DIR_NAME = 'storage_sync_manifests'
+MANIFEST_VERSION = 1
+_HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def compute_file_md5(file_path):
+    """Return the base64 encoded MD5 of the file content, in the same format as the Content-MD5 header."""
+    md5 = hashlib.md5()
+    with open(file_path, 'rb') as stream:
+        for chunk in iter(lambda: stream.read(_HASH_CHUNK_SIZE), b''):
+            md5.update(chunk)
+    return base64.b64encode(md5.digest()).decode('utf-8')
+
+
+def encode_content_md5(content_md5):
+    """Convert a Content-MD5 returned by the service to the format of compute_file_md5."""
+    if not content_md5:
+        return None
+    if isinstance(content_md5, str):
+        return content_md5
+    return base64.b64encode(bytes(content_md5)).decode('utf-8')
+
+
+class SyncManifest:
+    """
+    Record of the files uploaded to one destination: size, mtime, content MD5 and ETag for each uploaded path.
+
+    The MD5 of a local file is only recomputed when its size or mtime changed, so checking an unchanged tree costs one
+    stat per file. A file is considered in sync when the remote object has the same size and either its Content-MD5
+    matches the local content, or the manifest shows the same content was uploaded and the remote ETag is unchanged.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        try:
+            with open(path, 'r') as f:
+                content = json.load(f)
+            if content.get('version') == MANIFEST_VERSION:
+                self._entries = content.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    @classmethod
+    def for_destination(cls, cli_ctx, *destination):
+        """Return the manifest of the destination identified by the given parts, e.g. account url and container."""
+        key = '/'.join(part or '' for part in destination)
+        file_name = hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json'
+        return cls(os.path.join(cli_ctx.config.config_dir, MANIFEST_DIR_NAME, file_name))
+
+    def local_state(self, name, file_path):
+        stat = os.stat(file_path)
+        entry = self._entries.get(name)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            md5 = entry['md5']
+        else:
+            md5 = compute_file_md5(file_path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime, 'md5': md5}
+
+    def is_synced(self, name, local, remote_size=None, remote_etag=None, remote_md5=None):
+        if remote_size is None or remote_size != local['size']:
+            return False
+        if remote_md5:
+            return remote_md5 == local['md5']
+        entry = self._entries.get(name)
+        if not entry or entry['md5'] != local['md5']:
+            return False
+        return remote_etag is None or entry.get('etag') == remote_etag
+
+    def record(self, name, local, etag=None):
+        with self._lock:
+            self._entries[name] = dict(local, etag=etag)
+
+    def record_synced(self, name, local, etag=None):
+        """
+        Record a file found in sync with the remote object when the manifest misses it or has another state for it,
+        e.g. a file touched without being modified, so its MD5 is not computed again on the next run.
+        Without a remote ETag the recorded one is kept, the content being the same.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if etag is None and entry and entry['md5'] == local['md5']:
+                etag = entry.get('etag')
+            if entry != dict(local, etag=etag):
+                self._entries[name] = dict(local, etag=etag)
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        temp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        with self._lock:
+            with open(temp_path, 'w') as f:
+                json.dump({'version': MANIFEST_VERSION, 'files': self._entries}, f)
+            os.replace(temp_path, self.path)
+        logger.debug('Saved the sync manifest of %d files to %s', len(self._entries), self.path)
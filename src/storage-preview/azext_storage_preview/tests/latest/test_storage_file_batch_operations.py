@@ -23,6 +23,19 @@ class StorageFileBatchOperationScenarios(StorageScenarioMixin, LiveScenarioTest)
         self.storage_cmd('storage file download-batch -s {} -d "{}"', storage_account_info, src_share, local_folder)
         self.assertEqual(41, sum(len(f) for r, d, f in os.walk(local_folder)))
 
+        # upload with multiple workers
+        src_share = self.create_share(storage_account_info)
+        local_folder = self.create_temp_dir()
+        self.storage_cmd('storage file upload-batch -s "{}" -d {} --max-workers 4 --incremental',
+                         storage_account_info, test_dir, src_share)
+        self.storage_cmd('storage file download-batch -s {} -d "{}"', storage_account_info, src_share, local_folder)
+        self.assertEqual(41, sum(len(f) for r, d, f in os.walk(local_folder)))
+
+        # upload unchanged files incrementally
+        result = self.storage_cmd('storage file upload-batch -s "{}" -d {} --incremental', storage_account_info,
+                                  test_dir, src_share).get_output_in_json()
+        self.assertEqual(len(result), 0)
+
         # upload with pattern apple/*
         src_share = self.create_share(storage_account_info)
         local_folder = self.create_temp_dir()
@@ -0,0 +1,85 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from ...operations.file import (_get_changed_files, _make_directory_in_files_share,
+                                _make_directory_tree_in_files_share)
+
+
+class TestFileBatchDirectoryTree(unittest.TestCase):
+    def _share_client(self):
+        created = []
+        lock = threading.Lock()
+
+        def _get_directory_client(directory_path):
+            def _create_directory():
+                with lock:
+                    # the parent directory must have been created first
+                    parent = directory_path.rpartition('/')[0]
+                    self.assertTrue(not parent or parent in created)
+                    created.append(directory_path)
+            return mock.MagicMock(create_directory=_create_directory)
+
+        return mock.MagicMock(get_directory_client=_get_directory_client), created
+
+    def test_create_each_directory_once(self):
+        client, created = self._share_client()
+        directories = ['apple', 'apple/sub', 'apple/sub', 'butter/a/b', 'butter/a/c', '', 'apple']
+        _make_directory_tree_in_files_share(client, directories, max_workers=4)
+        self.assertEqual(sorted(created), ['apple', 'apple/sub', 'butter', 'butter/a', 'butter/a/b', 'butter/a/c'])
+
+    def test_create_directories_serially(self):
+        client, created = self._share_client()
+        _make_directory_tree_in_files_share(client, ['a/b/c', 'a/d'])
+        self.assertEqual(created, ['a', 'a/b', 'a/d', 'a/b/c'])
+
+    def test_make_directory_caches_each_parent(self):
+        client, created = self._share_client()
+        # an empty cache is filled with every created directory, not only the leaf
+        existing_dirs = set()
+        _make_directory_in_files_share(client, 'a/b/c', existing_dirs)
+        self.assertEqual(existing_dirs, {'a', 'a/b', 'a/b/c'})
+        # the parents already created are not created again
+        _make_directory_in_files_share(client, 'a/b/d', existing_dirs)
+        self.assertEqual(created, ['a', 'a/b', 'a/b/c', 'a/b/d'])
+
+
+class TestFileBatchIncremental(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.file_path = os.path.join(self.folder, 'file')
+        with open(self.file_path, 'wb') as f:
+            f.write(b'content')
+        self.cmd = mock.MagicMock()
+        self.cmd.cli_ctx.config.config_dir = self.folder
+        self.etag = 'etag'
+        self.client = mock.MagicMock(url='https://account.file.core.windows.net/share')
+        self.client.list_directories_and_files.return_value = [{'name': 'file', 'is_directory': False, 'size': 7}]
+        self.client.get_file_client.return_value.get_file_properties.side_effect = lambda: mock.MagicMock(
+            etag=self.etag, content_settings=mock.MagicMock(content_md5=None))
+
+    def test_changed_files_compare_etag(self):
+        manifest, changed = _get_changed_files(self.cmd, self.client, None, [(self.file_path, 'file')])
+        self.assertEqual(list(changed), ['file'])
+        manifest.record('file', changed['file'], 'etag')
+        manifest.save()
+
+        _, changed = _get_changed_files(self.cmd, self.client, None, [(self.file_path, 'file')])
+        self.assertEqual(changed, {})
+        # the remote file was replaced by another file of the same size
+        self.etag = 'modified-etag'
+        _, changed = _get_changed_files(self.cmd, self.client, None, [(self.file_path, 'file')])
+        self.assertEqual(list(changed), ['file'])
+
+
+if __name__ == '__main__':
+    unittest.main()
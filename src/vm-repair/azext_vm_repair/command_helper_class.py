@@ -15,6 +15,7 @@ from azure.cli.core.commands.client_factory import get_subscription_id
 from .telemetry import _track_command_telemetry, _track_run_command_telemetry
 
 from .repair_utils import _get_function_param_dict
+from .command_runner import get_command_runner, EXECUTION_MODE_SUBPROCESS
 
 STATUS_SUCCESS = 'SUCCESS'
 STATUS_ERROR = 'ERROR'
@@ -35,6 +36,13 @@ class command_helper:
         # Start timer for custom telemetry
         self.start_time = timeit.default_timer()
 
+        # Run the az commands in new processes unless vm_repair.execution_mode is set to in-process
+        runner = get_command_runner()
+        runner.set_execution_mode(cmd.cli_ctx.config.get('vm_repair', 'execution_mode', EXECUTION_MODE_SUBPROCESS))
+
+        # Position of the first az command run by this command in the timing report
+        self.timing_start = len(runner.timings)
+
         # Fetch and store command parameters
         self.command_params = _get_function_param_dict(inspect.getouterframes(inspect.currentframe())[1].frame)
 
@@ -84,6 +92,10 @@ class command_helper:
         # End long running op for process if not verbose
         if not self.is_verbose:
             self.cmd.cli_ctx.get_progress_controller().end()
+        # Report the time taken by each az command
+        runner = get_command_runner()
+        if len(runner.timings) > self.timing_start:
+            self.logger.info('Time taken by the az commands of \'%s\':\n%s', self.command_name, runner.get_timing_report(self.timing_start))
         # Track telemetry data
         elapsed_time = timeit.default_timer() - self.start_time
         if self.command_name == VM_REPAIR_RUN_COMMAND:
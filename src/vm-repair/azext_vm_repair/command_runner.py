@@ -0,0 +1,186 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+# pylint: disable=line-too-long, global-statement
+import copy
+import io
+import os
+import shlex
+import subprocess
+import threading
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+from knack.log import get_logger
+
+from .exceptions import AzCommandError
+
+logger = get_logger(__name__)
+
+MASK = '********'
+MAX_CONCURRENT_STEPS = 4
+
+EXECUTION_MODE_SUBPROCESS = 'subprocess'
+EXECUTION_MODE_IN_PROCESS = 'in-process'
+EXECUTION_MODES = [EXECUTION_MODE_SUBPROCESS, EXECUTION_MODE_IN_PROCESS]
+
+
+def _mask_secure_params(command_string, secure_params):
+    """ Hide sensitive data such as passwords from logs """
+    for param in secure_params or []:
+        if param:
+            command_string = command_string.replace(param, MASK)
+    return command_string
+
+
+def _get_step_name(tokenized_command):
+    """ Name of the command without its parameters, e.g. 'az vm create' """
+    words = []
+    for token in tokenized_command:
+        if token.startswith('-'):
+            break
+        words.append(token)
+    return ' '.join(words)
+
+
+class AzCommandRunner:
+    """
+    Runs the az commands of vm-repair and records the time taken by each step for the timing report.
+    By default each command is run in a new az process. With the in-process execution mode, set with
+    'az config set vm_repair.execution_mode=in-process' or AZURE_VM_REPAIR_EXECUTION_MODE, the commands are run
+    one at a time on a single CLI instance kept across commands, so the command modules and the login context are
+    only loaded once.
+    """
+
+    def __init__(self, execution_mode=EXECUTION_MODE_SUBPROCESS):
+        self._lock = threading.Lock()
+        self._invoke_lock = threading.Lock()
+        self._cli = None
+        self.execution_mode = None
+        self.timings = []
+        self.set_execution_mode(execution_mode)
+
+    def set_execution_mode(self, execution_mode):
+        execution_mode = execution_mode or EXECUTION_MODE_SUBPROCESS
+        if execution_mode not in EXECUTION_MODES:
+            raise AzCommandError('Invalid execution mode: {}, allowed values: {}'.format(execution_mode, ', '.join(EXECUTION_MODES)))
+        self.execution_mode = execution_mode
+
+    def _get_cli(self):
+        if self._cli is None:
+            from azure.cli.core import get_default_cli
+            self._cli = get_default_cli()
+        return self._cli
+
+    @staticmethod
+    def _call_subprocess(tokenized_command):
+        # If run on windows, add 'cmd /c'
+        if os.name == 'nt':
+            tokenized_command = ['cmd', '/c'] + tokenized_command
+        process = subprocess.Popen(tokenized_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        stdout, stderr = process.communicate()
+        if process.returncode != 0:
+            raise AzCommandError(stderr)
+        return stdout
+
+    def _invoke(self, args):
+        """
+        Same as CLI.invoke but raises the errors instead of printing them, the caller decides how to handle them.
+        The command runs nested in the vm-repair command, so the CLI events which set up and tear down the logging
+        are not raised and the telemetry of the vm-repair command is restored once the command is done.
+        A CLI instance runs one command at a time, the commands are serialized.
+        """
+        from azure.cli.core import telemetry
+        with self._invoke_lock:
+            cli = self._get_cli()
+            telemetry_state = {name: copy.copy(value) for name, value in vars(telemetry._session).items()}  # pylint: disable=protected-access
+            try:
+                cli.invocation = cli.invocation_cls(cli_ctx=cli,
+                                                    parser_cls=cli.parser_cls,
+                                                    commands_loader_cls=cli.commands_loader_cls,
+                                                    help_cls=cli.help_cls)
+                result = cli.invocation.execute(args)
+                if result.exit_code:
+                    raise AzCommandError('Command exited with code {}'.format(result.exit_code))
+                out_file = io.StringIO()
+                if result.result is not None:
+                    formatter = cli.output.get_formatter(cli.invocation.data['output'])
+                    cli.output.out(result, formatter=formatter, out_file=out_file)
+                return out_file.getvalue()
+            except AzCommandError:
+                raise
+            except SystemExit as ex:
+                # argument parsing errors are already printed by the parser
+                raise AzCommandError('Command exited with code {}'.format(ex.code))
+            except Exception as ex:  # pylint: disable=broad-except
+                raise AzCommandError(str(ex))
+            finally:
+                vars(telemetry._session).update(telemetry_state)  # pylint: disable=protected-access
+
+    def run(self, command_string, run_async=False, secure_params=None):
+        """
+        Runs a command string. To hide sensitive parameters from logs, add the parameter in secure_params.
+        If run_async is False then function returns the stdout, otherwise the command is started in a new process
+        whatever the execution mode.
+        Raises AzCommandError if command fails.
+        """
+        tokenized_command = shlex.split(command_string)
+
+        # If command does not start with 'az' then raise exception
+        if not tokenized_command or tokenized_command[0] != 'az':
+            raise AzCommandError("The command string is not an 'az' command!")
+
+        logger.debug("Calling: %s", _mask_secure_params(command_string, secure_params))
+        if run_async:
+            # If run on windows, add 'cmd /c'
+            if os.name == 'nt':
+                tokenized_command = ['cmd', '/c'] + tokenized_command
+            subprocess.Popen(tokenized_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+            return None
+
+        start_time = timeit.default_timer()
+        try:
+            if self.execution_mode == EXECUTION_MODE_IN_PROCESS:
+                stdout = self._invoke(tokenized_command[1:])
+            else:
+                stdout = self._call_subprocess(tokenized_command)
+        except AzCommandError as azCommandError:
+            raise AzCommandError(_mask_secure_params(str(azCommandError), secure_params))
+        finally:
+            with self._lock:
+                self.timings.append((_get_step_name(tokenized_command), timeit.default_timer() - start_time))
+        logger.debug('Success.\n')
+        return stdout
+
+    def run_concurrently(self, *steps):
+        """
+        Runs independent steps, given as functions without arguments, at the same time and returns their results in
+        the same order. If steps fail, the error of the first one is raised once all of them are done.
+        The az commands of the steps only overlap with the subprocess execution mode.
+        """
+        if len(steps) == 1:
+            return [steps[0]()]
+        with ThreadPoolExecutor(max_workers=min(len(steps), MAX_CONCURRENT_STEPS)) as executor:
+            futures = [executor.submit(step) for step in steps]
+        return [future.result() for future in futures]
+
+    def get_timing_report(self, start=0):
+        """ Time taken by each command run since the given position, the slowest first """
+        with self._lock:
+            timings = sorted(self.timings[start:], key=lambda timing: timing[1], reverse=True)
+        lines = ['{:>8.2f}s  {}'.format(elapsed, step) for step, elapsed in timings]
+        lines.append('{:>8.2f}s  total of {} commands'.format(sum(elapsed for _, elapsed in timings), len(timings)))
+        return '\n'.join(lines)
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_command_runner():
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = AzCommandRunner()
+        return _runner
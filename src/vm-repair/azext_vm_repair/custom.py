@@ -17,6 +17,7 @@ from msrestazure.tools import parse_resource_id
 from .exceptions import SkuDoesNotSupportHyperV
 
 from .command_helper_class import command_helper
+from .command_runner import get_command_runner
 from .repair_utils import (
     _uses_managed_disk,
     _call_az_command,
@@ -101,18 +102,23 @@ def create(cmd, vm_name, resource_group_name, repair_password=None, repair_usern
             create_repair_vm_command += ' --zone {zone}'.format(zone=zone)
 
         # Create new resource group
-        if not _check_existing_rg(repair_group_name):
-            create_resource_group_command = 'az group create -l {loc} -n {group_name}' \
-                                            .format(loc=source_vm.location, group_name=repair_group_name)
-            logger.info('Creating resource group for repair VM and its resources...')
-            _call_az_command(create_resource_group_command)
+        def create_resource_group():
+            if not _check_existing_rg(repair_group_name):
+                create_resource_group_command = 'az group create -l {loc} -n {group_name}' \
+                                                .format(loc=source_vm.location, group_name=repair_group_name)
+                logger.info('Creating resource group for repair VM and its resources...')
+                _call_az_command(create_resource_group_command)
+
+        # The resource group is created while the source disk is looked up
+        runner = get_command_runner()
 
         # MANAGED DISK
         if is_managed:
             logger.info('Source VM uses managed disks. Creating repair VM with managed disks.\n')
 
             # Copy OS disk command
-            disk_sku, location, os_type, hyperV_generation = _fetch_disk_info(resource_group_name, target_disk_name)
+            _, disk_info = runner.run_concurrently(create_resource_group, lambda: _fetch_disk_info(resource_group_name, target_disk_name))
+            disk_sku, location, os_type, hyperV_generation = disk_info
             copy_disk_command = 'az disk create -g {g} -n {n} --source {s} --sku {sku} --location {loc} --os-type {os_type} --query id -o tsv' \
                                 .format(g=resource_group_name, n=copy_disk_name, s=target_disk_name, sku=disk_sku, loc=location, os_type=os_type)
 
@@ -160,16 +166,17 @@ def create(cmd, vm_name, resource_group_name, repair_password=None, repair_usern
             os_disk_uri = source_vm.storage_profile.os_disk.vhd.uri
             copy_disk_name = copy_disk_name + '.vhd'
             storage_account = StorageResourceIdentifier(cmd.cli_ctx.cloud, os_disk_uri)
-            # Validate create vm create command to validate parameters before runnning copy disk commands
-            validate_create_vm_command = create_repair_vm_command + ' --validate'
-            logger.info('Validating VM template before continuing...')
-            _call_az_command(validate_create_vm_command, secure_params=[repair_password, repair_username])
 
             # get storage account connection string
             get_connection_string_command = 'az storage account show-connection-string -g {g} -n {n} --query connectionString -o tsv' \
                                             .format(g=resource_group_name, n=storage_account.account_name)
             logger.debug('Fetching storage account connection string...')
-            connection_string = _call_az_command(get_connection_string_command).strip('\n')
+            _, connection_string = runner.run_concurrently(create_resource_group, lambda: _call_az_command(get_connection_string_command).strip('\n'))
+
+            # Validate create vm create command to validate parameters before runnning copy disk commands
+            validate_create_vm_command = create_repair_vm_command + ' --validate'
+            logger.info('Validating VM template before continuing...')
+            _call_az_command(validate_create_vm_command, secure_params=[repair_password, repair_username])
 
             # Create Snapshot of Unmanaged Disk
             make_snapshot_command = 'az storage blob snapshot -c {c} -n {n} --connection-string "{con_string}" --query snapshot -o tsv' \
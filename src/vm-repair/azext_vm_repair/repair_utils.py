@@ -4,8 +4,6 @@
 # --------------------------------------------------------------------------------------------
 # pylint: disable=line-too-long, deprecated-method, global-statement
 # from logging import Logger  # , log
-import subprocess
-import shlex
 import os
 import re
 from json import loads
@@ -15,6 +13,7 @@ import requests
 from knack.log import get_logger
 from knack.prompting import prompt_y_n, NoTTYException
 
+from .command_runner import get_command_runner
 from .encryption_types import Encryption
 from .exceptions import (AzCommandError, WindowsOsNotAvailableError, RunScriptNotFoundForIdError, SkuDoesNotSupportHyperV, SuseNotAvailableError)
 
@@ -60,39 +59,12 @@ def _is_gen2(vm):
 
 def _call_az_command(command_string, run_async=False, secure_params=None):
     """
-    Uses subprocess to run a command string. To hide sensitive parameters from logs, add the
-    parameter in secure_params. If run_async is False then function returns the stdout.
+    Runs a command string with the shared command runner, in a new az process unless vm_repair.execution_mode is set
+    to in-process. To hide sensitive parameters from logs, add the parameter in secure_params.
+    If run_async is False then function returns the stdout.
     Raises AzCommandError if command fails.
     """
-
-    tokenized_command = shlex.split(command_string)
-
-    # If command does not start with 'az' then raise exception
-    if not tokenized_command or tokenized_command[0] != 'az':
-        raise AzCommandError("The command string is not an 'az' command!")
-    # If run on windows, add 'cmd /c'
-    windows_os_name = 'nt'
-    if os.name == windows_os_name:
-        tokenized_command = ['cmd', '/c'] + tokenized_command
-
-    # Hide sensitive data such as passwords from logs
-    if secure_params:
-        for param in secure_params:
-            if param:
-                command_string = command_string.replace(param, '********')
-    logger.debug("Calling: %s", command_string)
-    process = subprocess.Popen(tokenized_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-
-    # Wait for process to terminate and fetch stdout and stderror
-    if not run_async:
-        stdout, stderr = process.communicate()
-        if process.returncode != 0:
-            raise AzCommandError(stderr)
-
-        logger.debug('Success.\n')
-
-        return stdout
-    return None
+    return get_command_runner().run(command_string, run_async=run_async, secure_params=secure_params)
 
 
 def _invoke_run_command(script_name, vm_name, rg_name, is_linux, parameters=None, additional_custom_scripts=None):
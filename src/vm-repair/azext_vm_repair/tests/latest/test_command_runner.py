@@ -0,0 +1,152 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+# pylint: disable=line-too-long, protected-access
+import threading
+import time
+import unittest
+from unittest import mock
+
+from knack.util import CommandResultItem
+
+from azext_vm_repair.command_runner import AzCommandRunner, EXECUTION_MODE_IN_PROCESS
+from azext_vm_repair.exceptions import AzCommandError
+
+
+def _get_fake_cli(results):
+    """ CLI instance which returns the result registered for the command """
+    cli = mock.MagicMock()
+
+    def execute(args):
+        command = ' '.join(args[:2])
+        if isinstance(results[command], Exception):
+            raise results[command]
+        time.sleep(0.05)
+        return CommandResultItem(results[command])
+
+    cli.invocation_cls.return_value.execute.side_effect = execute
+    cli.output.out.side_effect = lambda result, formatter, out_file: out_file.write(str(result.result))
+    return cli
+
+
+def _get_fake_process(results):
+    """ az process which prints the result registered for the command """
+    def popen(tokenized_command, **_):
+        command = ' '.join(tokenized_command[1:3])
+        process = mock.MagicMock()
+
+        def communicate():
+            time.sleep(0.05)
+            if isinstance(results[command], Exception):
+                process.returncode = 1
+                return '', 'ERROR: {}'.format(results[command])
+            process.returncode = 0
+            return results[command], ''
+
+        process.communicate.side_effect = communicate
+        return process
+    return popen
+
+
+class AzCommandRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.results = {'group exists': 'false', 'disk show': '["Premium_LRS"]', 'vm create': Exception('The password secret is invalid')}
+        self.created_clis = []
+
+        def get_default_cli():
+            cli = _get_fake_cli(self.results)
+            self.created_clis.append(cli)
+            return cli
+
+        patcher = mock.patch('azure.cli.core.get_default_cli', side_effect=get_default_cli)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_run_reuses_cli(self):
+        runner = AzCommandRunner(EXECUTION_MODE_IN_PROCESS)
+        self.assertEqual(runner.run('az group exists -n rg -o json'), 'false')
+        self.assertEqual(runner.run('az disk show -g rg -n disk -o json'), '["Premium_LRS"]')
+        self.assertEqual(len(self.created_clis), 1)
+        self.assertEqual([step for step, _ in runner.timings], ['az group exists', 'az disk show'])
+
+    def test_run_in_process_keeps_telemetry(self):
+        from azure.cli.core import telemetry
+        self.addCleanup(setattr, telemetry._session, 'command', telemetry._session.command)
+        telemetry._session.command = 'vm repair create'
+
+        def execute(args):
+            telemetry._session.command = ' '.join(args[:2])
+            return CommandResultItem('false')
+
+        runner = AzCommandRunner(EXECUTION_MODE_IN_PROCESS)
+        runner.run('az group exists -n rg')
+        cli = self.created_clis[0]
+        cli.invocation_cls.return_value.execute.side_effect = execute
+        runner.run('az group exists -n rg')
+        self.assertEqual(telemetry._session.command, 'vm repair create')
+        # the events setting up and tearing down the logging of the vm-repair command are not raised
+        cli.raise_event.assert_not_called()
+
+    def test_run_masks_secure_params(self):
+        runner = AzCommandRunner(EXECUTION_MODE_IN_PROCESS)
+        with self.assertRaises(AzCommandError) as context:
+            runner.run('az vm create -g rg -n vm --admin-password secret', secure_params=['secret'])
+        self.assertNotIn('secret', str(context.exception))
+        # the cli is still available after a failure
+        runner.run('az group exists -n rg -o json')
+        self.assertEqual(len(self.created_clis), 1)
+
+    def test_run_rejects_non_az_command(self):
+        with self.assertRaises(AzCommandError):
+            AzCommandRunner().run('ls -l')
+
+    def test_run_rejects_invalid_execution_mode(self):
+        with self.assertRaises(AzCommandError):
+            AzCommandRunner('thread')
+
+    def test_run_subprocess_by_default(self):
+        runner = AzCommandRunner()
+        with mock.patch('subprocess.Popen', side_effect=_get_fake_process(self.results)) as popen_mock:
+            self.assertEqual(runner.run('az group exists -n rg -o json'), 'false')
+            with self.assertRaises(AzCommandError) as context:
+                runner.run('az vm create -g rg -n vm --admin-password secret', secure_params=['secret'])
+        self.assertNotIn('secret', str(context.exception))
+        self.assertEqual(popen_mock.call_count, 2)
+        self.assertEqual(self.created_clis, [])
+
+    def test_run_concurrently(self):
+        runner = AzCommandRunner()
+        thread_ids = []
+
+        def step(command):
+            thread_ids.append(threading.get_ident())
+            return runner.run(command)
+
+        start = time.time()
+        with mock.patch('subprocess.Popen', side_effect=_get_fake_process(self.results)):
+            results = runner.run_concurrently(lambda: step('az group exists -n rg'), lambda: step('az disk show -g rg -n disk'))
+        self.assertEqual(results, ['false', '["Premium_LRS"]'])
+        self.assertLess(time.time() - start, 0.1)
+        self.assertEqual(len(set(thread_ids)), 2)
+        self.assertIn('total of 2 commands', runner.get_timing_report())
+
+    def test_run_concurrently_in_process(self):
+        runner = AzCommandRunner(EXECUTION_MODE_IN_PROCESS)
+        results = runner.run_concurrently(lambda: runner.run('az group exists -n rg'), lambda: runner.run('az disk show -g rg -n disk'))
+        self.assertEqual(results, ['false', '["Premium_LRS"]'])
+        # the commands share a single cli, one at a time
+        self.assertEqual(len(self.created_clis), 1)
+
+    def test_run_concurrently_raises_first_error(self):
+        runner = AzCommandRunner(EXECUTION_MODE_IN_PROCESS)
+        done = []
+        with self.assertRaises(AzCommandError):
+            runner.run_concurrently(lambda: runner.run('az vm create -g rg -n vm'), lambda: done.append(runner.run('az group exists -n rg')))
+        # the other steps still completed
+        self.assertEqual(done, ['false'])
+
+
+if __name__ == '__main__':
+    unittest.main()